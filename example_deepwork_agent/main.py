@@ -13,11 +13,17 @@ src_path = Path(__file__).parent / "src"
 sys.path.insert(0, str(src_path))
 
 from opus_agent_base.cli.cli import create_cli_app
-from src.opus_deepwork_agent.deepwork_agent_runner import run_deepwork_agent
 
 logger = logging.getLogger(__name__)
 
 
+def run_deepwork_agent():
+    """Import the Deepwork agent stack only when the agent is run"""
+    from src.opus_deepwork_agent.deepwork_agent_runner import run_deepwork_agent
+
+    return run_deepwork_agent()
+
+
 def main():
     """Entry point for the Opus Agents CLI."""
     try:
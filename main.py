@@ -6,11 +6,17 @@ import logging
 import traceback
 
 from opus_agent_base.cli.cli import create_cli_app
-from opus_todo_agent.todo_agent_runner import run_todo_agent
 
 logger = logging.getLogger(__name__)
 
 
+def run_todo_agent():
+    """Import the TODO agent stack only when the agent is run"""
+    from opus_todo_agent.todo_agent_runner import run_todo_agent
+
+    return run_todo_agent()
+
+
 def main():
     """Entry point for the Opus Agents CLI."""
     try:
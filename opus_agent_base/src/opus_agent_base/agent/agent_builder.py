@@ -2,6 +2,7 @@ from typing import Any
 
 from pydantic_ai import Agent
 
+from opus_agent_base.background_jobs.background_job import BackgroundJob
 from opus_agent_base.config.config_manager import ConfigManager
 from opus_agent_base.model.model_manager import ModelManager
 from opus_agent_base.prompt.instructions_manager import InstructionsManager
@@ -20,6 +21,7 @@ class AgentBuilder:
         self.custom_tools: list[CustomTool] = []
         self.higher_order_tools: list[HigherOrderTool] = []
         self.meta_tools: list[MetaTool] = []
+        self.background_jobs: list[BackgroundJob] = []
         self.mcp_servers_config: list[FastMCPServerConfig] = []
 
     def name(self, name: str):
@@ -59,6 +61,10 @@ class AgentBuilder:
         self.meta_tools.append(meta_tool)
         return self
 
+    def background_job(self, background_job: BackgroundJob):
+        self.background_jobs.append(background_job)
+        return self
+
     def add_mcp_server_config(self, mcp_server_config: FastMCPServerConfig):
         self.mcp_servers_config.append(mcp_server_config)
         return self
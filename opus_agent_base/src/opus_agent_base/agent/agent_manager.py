@@ -1,17 +1,19 @@
-import json
 import logging
 
 from fastmcp.client.client import ClientSession
 from mcp.types import Tool as MCPTool
 from pydantic_ai import Agent
 from pydantic_ai.tools import Tool
+from pydantic_ai.toolsets import FunctionToolset
 from singleton_decorator import singleton
 
 from opus_agent_base.agent.agent_builder import AgentBuilder
+from opus_agent_base.agent.startup_orchestrator import StartupOrchestrator
 from opus_agent_base.common.logging_config import console_log
 from opus_agent_base.tools.custom_tools_manager import CustomToolsManager
-from opus_agent_base.tools.mcp_manager import MCPManager
 from opus_agent_base.tools.higher_order_tools_manager import HigherOrderToolsManager
+from opus_agent_base.tools.mcp_manager import MCPManager
+from opus_agent_base.tools.mcp_tool_result_cache import get_tool_call_key
 from opus_agent_base.tools.meta_tools_manager import MetaToolsManager
 
 logger = logging.getLogger(__name__)
@@ -37,6 +39,7 @@ class AgentManager:
     async def initialize_agent(self):
         # System prompt
         logger.info("Initializing Agent")
+        self.startup_orchestrator = StartupOrchestrator()
         agent_system_prompt = "\n".join(
             self.instructions_manager.get(key)
             for key in self.system_prompt_keys
@@ -49,31 +52,47 @@ class AgentManager:
         await self.initialize_agent_tools()
 
         # Initialize Agent
+        # Tools of MCP servers disabled after startup are hidden from the agent
+        self.agent_toolset = FunctionToolset(self.agent_tools)
         self.agent = Agent(
             system_prompt=agent_system_prompt,
             model=self.model_manager.get_model(),
-            tools=self.agent_tools,
+            toolsets=[
+                self.agent_toolset.filtered(
+                    lambda ctx, tool_def: self.mcp_manager.is_tool_enabled(
+                        tool_def.name
+                    )
+                )
+            ],
         )
+        self.config_manager.subscribe("model_config", self.on_model_config_changed)
+        self.mcp_manager.add_tools_listener(self.add_mcp_server_tools)
 
         # Add custom tools to Agent
-        self.custom_tools_manager = CustomToolsManager(
-            self.config_manager,
-            self.instructions_manager,
-            self.model_manager,
-            self.agent,
-        )
-        self.custom_tools_manager.initialize_tools(self.custom_tools)
+        with self.startup_orchestrator.measure("custom_tools"):
+            self.custom_tools_manager = CustomToolsManager(
+                self.config_manager,
+                self.instructions_manager,
+                self.model_manager,
+                self.agent,
+            )
+            self.custom_tools_manager.initialize_tools(self.custom_tools)
 
         # Add higher order tools to Agent
-        self.higher_order_tools_manager = HigherOrderToolsManager(
-            self.config_manager, self.agent, self.fastmcp_client_context
-        )
-        await self.higher_order_tools_manager.initialize_tools(self.higher_order_tools)
+        with self.startup_orchestrator.measure("higher_order_tools"):
+            self.higher_order_tools_manager = HigherOrderToolsManager(
+                self.config_manager, self.agent, self.fastmcp_client_context
+            )
+            await self.higher_order_tools_manager.initialize_tools(
+                self.higher_order_tools
+            )
 
         # Add meta tools to Agent
-        self.meta_tools_manager = MetaToolsManager(self.config_manager, self.agent)
-        meta_tools = await self.meta_tools_manager.initialize_tools(self.meta_tools)
+        with self.startup_orchestrator.measure("meta_tools"):
+            self.meta_tools_manager = MetaToolsManager(self.config_manager, self.agent)
+            await self.meta_tools_manager.initialize_tools(self.meta_tools)
 
+        self.startup_orchestrator.report()
         logger.info("Agent initialized")
 
     async def initialize_mcp_servers(self):
@@ -87,42 +106,84 @@ class AgentManager:
         # Initialize Agent tools
         self.agent_tools = []
         self.fastmcp_client_context = await self.mcp_manager.initialize_fastmcp_client_context()
-        await self.mcp_manager.inspect_fastmcp_client_tools()
-
-        async def tools_initializer(session: ClientSession):
-            enabled_tools = {}
-            logger.info("Initializing agent tools")
-            client_tools = await session.list_tools()
-            for tool in client_tools:
-                tool_prefix = tool.name.split("_")[0]
-                if tool_prefix in self.config_manager.get_setting(
-                    "mcp_config.allowed_tool_prefixes", []
-                ):
-                    if tool.name in self.config_manager.get_setting(
-                        "mcp_config.allowed_tools"
-                    ).get(tool_prefix, []):
-                        logger.debug(f"Wrapping FastMCP tool: {tool.name}")
-                        self.agent_tools.append(self._wrap_tool(tool, self.fastmcp_client_context))
-                        self._log_enabled_tools(enabled_tools, tool_prefix, tool.name)
-                else:
-                    self._log_enabled_tools(enabled_tools, tool_prefix, tool.name)
-                    self.agent_tools.append(self._wrap_tool(tool, self.fastmcp_client_context))
-            return enabled_tools
 
+        # Start all MCP servers and load all meta tool specs concurrently
+        startup_steps = {}
+        if self.fastmcp_client_context is not None:
+            for server_name in self.mcp_manager.mcp_sessions:
+                startup_steps[f"mcp:{server_name}"] = (
+                    self.mcp_manager.start_mcp_server(server_name),
+                    self.mcp_manager.get_startup_timeout(server_name),
+                )
+        for meta_tool in self.meta_tools:
+            startup_steps[f"meta_tool:{meta_tool.name}"] = (
+                meta_tool.setup_tool(),
+                self.get_meta_tool_setup_timeout(meta_tool.name),
+            )
+        startup_results = await self.startup_orchestrator.run_steps(startup_steps)
+
+        # Wrap tools of the MCP servers that started in time
         if self.fastmcp_client_context is not None:
-            result = await self.fastmcp_client_context(tools_initializer)
+            mcp_tools = [
+                tool
+                for server_name in self.mcp_manager.mcp_sessions
+                for tool in startup_results.get(f"mcp:{server_name}") or []
+            ]
+            self.mcp_manager.inspect_fastmcp_client_tools(mcp_tools)
+            result = self.initialize_mcp_tools(mcp_tools)
             console_log(f"Enabled tools: {result}")
 
         # Initialize Meta tools
         result = await self.initialize_meta_tools()
         logger.info(f"Enabled Meta tools: {result}")
 
+    def get_meta_tool_setup_timeout(self, meta_tool_name: str) -> float:
+        """
+        Timeout in seconds for loading the spec of a meta tool at startup.
+        Configured per meta tool in meta_tools.<name>.setup_timeout_seconds
+        or for all meta tools in meta_tools.setup_timeout_seconds
+        """
+        default_timeout = self.config_manager.get_setting(
+            "meta_tools.setup_timeout_seconds", 60
+        )
+        return self.config_manager.get_setting(
+            f"meta_tools.{meta_tool_name}.setup_timeout_seconds", default_timeout
+        )
+
+    def initialize_mcp_tools(self, mcp_tools: list[MCPTool]):
+        enabled_tools = {}
+        logger.info("Initializing agent tools")
+        allowed_tool_prefixes = self.config_manager.get_setting(
+            "mcp_config.allowed_tool_prefixes", []
+        )
+        for tool in mcp_tools:
+            tool_prefix = tool.name.split("_")[0]
+            if tool_prefix in allowed_tool_prefixes:
+                if tool.name in self.config_manager.get_setting(
+                    "mcp_config.allowed_tools"
+                ).get(tool_prefix, []):
+                    logger.debug(f"Wrapping FastMCP tool: {tool.name}")
+                    self.agent_tools.append(
+                        self._wrap_tool(tool, self.fastmcp_client_context)
+                    )
+                    self._log_enabled_tools(enabled_tools, tool_prefix, tool.name)
+            else:
+                self._log_enabled_tools(enabled_tools, tool_prefix, tool.name)
+                self.agent_tools.append(
+                    self._wrap_tool(tool, self.fastmcp_client_context)
+                )
+        return enabled_tools
+
     async def initialize_meta_tools(self):
-        # Initialize Meta tools
+        # Initialize Meta tools whose spec was loaded during startup
         result = []
         logger.info("Initializing Meta tools")
         for meta_tool in self.meta_tools:
-            await meta_tool.setup_tool()
+            if not self.startup_orchestrator.is_successful(
+                f"meta_tool:{meta_tool.name}"
+            ):
+                logger.warning(f"Skipping Meta tool {meta_tool.name}: setup failed")
+                continue
             agent_tool = await meta_tool.build_agent_tool()
             self.agent_tools.append(agent_tool)
             result.append(meta_tool.name)
@@ -133,6 +194,33 @@ class AgentManager:
     def get_agent(self):
         return self.agent
 
+    def on_model_config_changed(self, changes):
+        # ModelManager subscribed first, so the model is already reinitialized
+        self.agent.model = self.model_manager.get_model()
+        console_log(f"Agent model updated: {self.model_manager.get_enabled_models()}")
+
+    def add_mcp_server_tools(self, server_name: str, mcp_tools: list[MCPTool]):
+        """
+        Add tools of an MCP server enabled after startup to the agent
+        """
+        new_tools = [
+            tool for tool in mcp_tools if tool.name not in self.agent_toolset.tools
+        ]
+        if self.fastmcp_client_context is None or not new_tools:
+            return
+        first_new_tool = len(self.agent_tools)
+        result = self.initialize_mcp_tools(new_tools)
+        for agent_tool in self.agent_tools[first_new_tool:]:
+            self.agent_toolset.add_tool(agent_tool)
+        console_log(f"Enabled tools of MCP server {server_name}: {result}")
+
+    async def shutdown(self):
+        # Close long-lived MCP sessions
+        logger.info("Shutting down Agent")
+        if getattr(self, "mcp_manager", None) is not None:
+            await self.mcp_manager.close()
+        logger.info("Agent shut down")
+
     def _wrap_tool(self, tool: MCPTool, fastmcp_client_context) -> Tool:
         async def mcp_tool_function(**kwargs):
             """Dynamically created tool function for MCP tool"""
@@ -141,6 +229,13 @@ class AgentManager:
                 result = await client.call_tool(tool.name, kwargs)
                 return result
 
+            singleflight = getattr(fastmcp_client_context, "singleflight", None)
+            if singleflight is not None:
+                # concurrent identical calls share a single MCP call
+                return await singleflight.run(
+                    get_tool_call_key(tool.name, kwargs),
+                    lambda: fastmcp_client_context(execute_tool),
+                )
             result = await fastmcp_client_context(execute_tool)
             return result
 
@@ -1,8 +1,14 @@
+import asyncio
 import logging
 
 from opus_agent_base.agent.agent_builder import AgentBuilder
 from opus_agent_base.agent.agent_manager import AgentManager
+from opus_agent_base.background_jobs.background_jobs_manager import (
+    BackgroundJobsManager,
+)
 from opus_agent_base.common.logging_config import console_log, quick_setup
+from opus_agent_base.common.tokenizer import get_tokenizer
+from opus_agent_base.config.config_watcher import ConfigWatcher
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +21,8 @@ class AgentRunner:
         self.agent_builder = agent_builder
         self.agent_manager = None
         self.agent = None
+        self.config_watcher = None
+        self.background_jobs_manager = None
         self._setup_logging()
 
     def _setup_logging(self):
@@ -25,6 +33,8 @@ class AgentRunner:
         """Run Agent CLI using PydanticAI CLI"""
         try:
             console_log("🚀 Starting Agent...")
+            # config change subscribers run on the agent's event loop
+            self.agent_builder.config_manager.set_event_loop(asyncio.get_running_loop())
             # Initialize Agent
             if self.agent is None:
                 self.agent_manager = AgentManager(
@@ -34,6 +44,23 @@ class AgentRunner:
                 await self.agent_manager.initialize_agent()
                 self.agent = self.agent_manager.get_agent()
 
+            # Apply config changes without restarting the agent
+            if self.agent_builder.config_manager.get_setting(
+                "config_watcher.enabled", True
+            ):
+                self.config_watcher = ConfigWatcher(self.agent_builder.config_manager)
+                self.config_watcher.start()
+
+            # Load tokenizer encoders before the first question needs them
+            if self.agent_builder.config_manager.get_setting("tokenizer.warm_up", True):
+                get_tokenizer().warm_up()
+
+            # Start background jobs, e.g. indexers
+            self.background_jobs_manager = BackgroundJobsManager(
+                self.agent_builder.config_manager
+            )
+            self.background_jobs_manager.start_jobs(self.agent_builder.background_jobs)
+
             console_log("✅ Agent started")
             await self.agent.to_cli()
 
@@ -48,5 +75,11 @@ class AgentRunner:
             console_log("\n🛑 Agent interrupted")
             logger.debug("Agent interrupted by user")
         finally:
+            if self.background_jobs_manager is not None:
+                await self.background_jobs_manager.stop_jobs()
+            if self.config_watcher is not None:
+                await self.config_watcher.stop()
+            if self.agent_manager is not None:
+                await self.agent_manager.shutdown()
             console_log("🏁 Agent session ended")
             logger.debug("Agent session ended")
@@ -0,0 +1,101 @@
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable
+from contextlib import contextmanager
+from typing import Any
+
+from opus_agent_base.common.logging_config import console_log
+
+logger = logging.getLogger(__name__)
+
+
+class StartupOrchestrator:
+    """
+    Orchestrator for Agent startup
+
+    Runs independent startup steps (MCP server startup, meta tool spec loading)
+    concurrently, applies a per-step timeout and records a per-component startup
+    timing breakdown. A step that fails or misses its deadline is reported and skipped
+    instead of failing the Agent startup.
+    """
+
+    def __init__(self):
+        self.timings: dict[str, float] = {}
+        self.failures: dict[str, str] = {}
+
+    async def run_step(
+        self, component: str, step: Awaitable, timeout: float = None
+    ) -> Any:
+        """
+        Run a single startup step and record its timing.
+
+        Args:
+            component: Name of the component, used in the timing breakdown
+            step: Awaitable to run
+            timeout: Timeout in seconds. No timeout if None or 0
+
+        Returns:
+            The result of the step or None if the step failed or timed out
+        """
+        start_time = time.perf_counter()
+        try:
+            if timeout:
+                return await asyncio.wait_for(step, timeout)
+            return await step
+        except TimeoutError:
+            self.failures[component] = f"timed out after {timeout}s"
+            logger.warning(f"Startup of {component} timed out after {timeout}s")
+            return None
+        except Exception as e:
+            self.failures[component] = str(e)
+            logger.error(f"Startup of {component} failed: {e}", exc_info=True)
+            return None
+        finally:
+            self.timings[component] = time.perf_counter() - start_time
+
+    async def run_steps(
+        self, steps: dict[str, tuple[Awaitable, float]]
+    ) -> dict[str, Any]:
+        """
+        Run startup steps concurrently.
+
+        Args:
+            steps: Mapping of component name to (awaitable, timeout)
+
+        Returns:
+            Mapping of component name to the result of its step (None if it failed)
+        """
+        results = await asyncio.gather(
+            *(
+                self.run_step(component, step, timeout)
+                for component, (step, timeout) in steps.items()
+            )
+        )
+        return dict(zip(steps.keys(), results, strict=True))
+
+    @contextmanager
+    def measure(self, component: str):
+        """
+        Record the timing of a sequential startup step. Errors are not handled here.
+        """
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[component] = time.perf_counter() - start_time
+
+    def is_successful(self, component: str) -> bool:
+        return component in self.timings and component not in self.failures
+
+    def report(self):
+        """
+        Log the startup timing breakdown, slowest component first
+        """
+        console_log("Startup timing breakdown:")
+        for component, duration in sorted(
+            self.timings.items(), key=lambda item: item[1], reverse=True
+        ):
+            status = self.failures.get(component, "ok")
+            console_log(f"  {component:<40} {duration:7.2f}s  {status}")
+        logger.info(f"Startup timings: {self.timings}, failures: {self.failures}")
@@ -0,0 +1 @@
+"""Background jobs run alongside the agent."""
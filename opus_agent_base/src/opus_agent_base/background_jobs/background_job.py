@@ -0,0 +1,23 @@
+import logging
+from abc import abstractmethod
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundJob:
+    """
+    Base class for long-running jobs that run in background while the agent is running
+    """
+
+    def __init__(self, name: str, config_key: str, config_manager=None):
+        self.name = name
+        self.config_key = config_key
+        self.config_manager = config_manager
+
+    @abstractmethod
+    async def run(self):
+        """
+        Run the job until it is cancelled when the agent stops.
+        Must be implemented by subclasses.
+        """
+        raise NotImplementedError("Subclasses must implement this method")
@@ -0,0 +1,51 @@
+import asyncio
+import logging
+
+from opus_agent_base.background_jobs.background_job import BackgroundJob
+from opus_agent_base.common.logging_config import console_log
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundJobsManager:
+    """
+    Manager for background jobs
+    """
+
+    def __init__(self, config_manager):
+        self.config_manager = config_manager
+        self.tasks: dict[str, asyncio.Task] = {}
+
+    def start_jobs(self, background_jobs: list[BackgroundJob]):
+        enabled = []
+        for background_job in background_jobs:
+            if self._is_job_enabled(background_job.config_key):
+                task = asyncio.create_task(background_job.run())
+                task.add_done_callback(
+                    lambda task, name=background_job.name: self._on_job_done(name, task)
+                )
+                self.tasks[background_job.name] = task
+                enabled.append(background_job.name)
+            else:
+                logger.info(f"{background_job.name} Background job not enabled")
+        if enabled:
+            console_log(f"Started background job(s) - {enabled}")
+
+    async def stop_jobs(self):
+        for task in self.tasks.values():
+            task.cancel()
+        await asyncio.gather(*self.tasks.values(), return_exceptions=True)
+        self.tasks = {}
+        logger.info("All Background jobs stopped")
+
+    def _on_job_done(self, name: str, task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Background job {name} failed: {task.exception()}")
+
+    def _is_job_enabled(self, config_key: str):
+        """
+        Check if the Background job is enabled in background_jobs.<config_key>.enabled
+        """
+        return self.config_manager.get_setting(
+            f"background_jobs.{config_key}.enabled", False
+        )
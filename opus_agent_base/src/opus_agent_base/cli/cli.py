@@ -5,24 +5,31 @@ import sys
 from pathlib import Path
 
 import typer
-from prompt_toolkit import PromptSession
-from prompt_toolkit.auto_suggest import AutoSuggestFromHistory
-from prompt_toolkit.completion import WordCompleter
-from prompt_toolkit.history import FileHistory
-from prompt_toolkit.styles import Style
 from rich.console import Console
 from rich.table import Table
 
-from opus_agent_base.config.config_command_manager import ConfigCommandManager
-from opus_agent_base.config.config_manager import ConfigManager
 from opus_agent_base.ui.logo import display_logo
 
+# Keep imports at module level light, so that `--version`, admin and config commands
+# start fast. Agent, MCP and vector DB stacks are imported only when an agent is run,
+# and are passed to create_cli_app as an agent_runner that imports them on call.
+
 # Setup rich console for pretty output
 console = Console()
 logger = logging.getLogger(__name__)
 
-config_manager = ConfigManager()
-config_command_manager = ConfigCommandManager(config_manager, console)
+_config_command_manager = None
+
+
+def get_config_command_manager():
+    """Create the config manager on first use, so startup does not read the config"""
+    global _config_command_manager
+    if _config_command_manager is None:
+        from opus_agent_base.config.config_command_manager import ConfigCommandManager
+        from opus_agent_base.config.config_manager import ConfigManager
+
+        _config_command_manager = ConfigCommandManager(ConfigManager(), console)
+    return _config_command_manager
 
 
 def create_cli_app(
@@ -37,6 +44,12 @@ def create_cli_app(
 
     def run_cli_mode(run_agent_on_startup: bool = False):
         """Run the admin mode with slash commands."""
+        from prompt_toolkit import PromptSession
+        from prompt_toolkit.auto_suggest import AutoSuggestFromHistory
+        from prompt_toolkit.completion import WordCompleter
+        from prompt_toolkit.history import FileHistory
+        from prompt_toolkit.styles import Style
+
         display_logo(console)
         # Set up command history file
         history_dir = Path.home() / ".opusai"
@@ -139,7 +152,7 @@ def create_cli_app(
 
                     asyncio.run(run_sde_agent())
                 elif cmd == "config":
-                    config_command_manager.handle_config_command(args)
+                    get_config_command_manager().handle_config_command(args)
                 elif cmd == "status":
                     show_status()
                 elif cmd == "clear":
@@ -231,6 +244,7 @@ def create_cli_app(
             table.add_row(var, status)
 
         # Configuration file status
+        config_manager = get_config_command_manager().config_manager
         config_exists = config_manager.config_file.exists()
         config_status = (
             "[green]Exists[/green]" if config_exists else "[yellow]Not Found[/yellow]"
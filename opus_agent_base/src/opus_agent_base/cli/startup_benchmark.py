@@ -0,0 +1,95 @@
+"""
+CLI startup benchmark.
+
+Runs a CLI entry point with `--version` in fresh interpreters and fails if startup takes
+longer than the budget or imports any of the agent, MCP or vector DB stacks.
+
+Usage:
+    python -m opus_agent_base.cli.startup_benchmark \
+        --entry-point main:main --budget-ms 500
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+# Modules that must not be imported by the CLI before an agent is run
+HEAVY_MODULES = [
+    "pydantic_ai",
+    "fastmcp",
+    "mcp",
+    "chromadb",
+    "tiktoken",
+    "rapidfuzz",
+    "prompt_toolkit",
+    "opus_agent_base.agent.agent_runner",
+]
+
+BENCHMARK_SCRIPT = """
+import importlib, json, sys, time
+start = time.perf_counter()
+module_name, function_name = {entry_point!r}.split(":")
+sys.argv = ["opus", "--version"]
+try:
+    getattr(importlib.import_module(module_name), function_name)()
+except SystemExit:
+    pass
+elapsed_ms = (time.perf_counter() - start) * 1000
+heavy_modules = [name for name in {heavy_modules!r} if name in sys.modules]
+print(json.dumps({{"elapsed_ms": elapsed_ms, "heavy_modules": heavy_modules}}))
+"""
+
+
+def run_once(entry_point: str) -> dict:
+    script = BENCHMARK_SCRIPT.format(
+        entry_point=entry_point, heavy_modules=HEAVY_MODULES
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True
+    )
+    # the entry point prints its version first, the result is the last line
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark CLI startup time")
+    parser.add_argument(
+        "--entry-point", default="main:main", help="module:function of the CLI"
+    )
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=500,
+        help="Budget for the median startup time",
+    )
+    parser.add_argument("--runs", type=int, default=5, help="Number of runs")
+    args = parser.parse_args(argv)
+
+    results = [run_once(args.entry_point) for _ in range(args.runs)]
+    median_ms = statistics.median(result["elapsed_ms"] for result in results)
+    heavy_modules = sorted(
+        {name for result in results for name in result["heavy_modules"]}
+    )
+
+    print(
+        f"{args.entry_point} --version: median {median_ms:.0f}ms over {args.runs} runs"
+        f" (budget {args.budget_ms:.0f}ms)"
+    )
+    failed = False
+    if median_ms > args.budget_ms:
+        print(
+            f"FAIL: startup time exceeds budget by {median_ms - args.budget_ms:.0f}ms"
+        )
+        failed = True
+    if heavy_modules:
+        print(f"FAIL: CLI startup imports heavy modules: {heavy_modules}")
+        failed = True
+    if not failed:
+        print("OK")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
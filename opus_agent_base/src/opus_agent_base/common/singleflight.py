@@ -0,0 +1,35 @@
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """
+    Request coalescing for concurrent identical calls
+
+    The first caller for a key starts the call. Callers with the same key that arrive
+    while the call is in flight wait for the same call and share its result or
+    exception.
+    """
+
+    def __init__(self):
+        self.in_flight: dict[str, asyncio.Task] = {}
+
+    async def run(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        task = self.in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self.in_flight[key] = task
+            task.add_done_callback(lambda done_task: self._on_done(key, done_task))
+        else:
+            logger.debug(f"Sharing in-flight call: {key}")
+        # shield the shared call, so a cancelled caller does not cancel it for the
+        # other callers
+        return await asyncio.shield(task)
+
+    def _on_done(self, key: str, task: asyncio.Task):
+        if self.in_flight.get(key) is task:
+            del self.in_flight[key]
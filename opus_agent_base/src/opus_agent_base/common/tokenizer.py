@@ -0,0 +1,119 @@
+import hashlib
+import logging
+import math
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ENCODING = "cl100k_base"
+# average characters per token of English text with cl100k_base
+CHARS_PER_TOKEN = 4
+
+
+class Tokenizer:
+    """
+    Shared tiktoken encoders and memoized token counts.
+
+    Encoders are loaded once, optionally by a background warm-up at startup, and token
+    counts are memoized by the hash of the text, so asking about the same transcript or
+    notes again doesn't encode it again. tiktoken is imported lazily to keep startup
+    fast.
+    """
+
+    def __init__(self, max_cached_counts: int = 4096):
+        self.max_cached_counts = max_cached_counts
+        self.encodings = {}
+        self.lock = threading.Lock()
+        # (encoding name, text hash) -> token count
+        self.counts: OrderedDict[tuple[str, str], int] = OrderedDict()
+        self.counts_lock = threading.Lock()
+
+    def get_encoding(self, encoding_name: str = DEFAULT_ENCODING):
+        encoding = self.encodings.get(encoding_name)
+        if encoding is None:
+            with self.lock:
+                if encoding_name not in self.encodings:
+                    import tiktoken
+
+                    logger.info(f"Loading tiktoken encoding: {encoding_name}")
+                    self.encodings[encoding_name] = tiktoken.get_encoding(encoding_name)
+                encoding = self.encodings[encoding_name]
+        return encoding
+
+    def warm_up(
+        self, encoding_names: tuple[str, ...] = (DEFAULT_ENCODING,)
+    ) -> threading.Thread:
+        """Load encoders in a background thread"""
+
+        def load():
+            for encoding_name in encoding_names:
+                try:
+                    self.get_encoding(encoding_name)
+                except Exception as e:
+                    logger.warning(
+                        f"Error loading tiktoken encoding {encoding_name}: {e}"
+                    )
+
+        thread = threading.Thread(target=load, name="tokenizer-warm-up", daemon=True)
+        thread.start()
+        return thread
+
+    def encode(self, text: str, encoding_name: str = DEFAULT_ENCODING) -> list[int]:
+        # special tokens like <|endoftext|> in transcripts or notes are encoded as plain
+        # text
+        return self.get_encoding(encoding_name).encode(text, disallowed_special=())
+
+    def decode(self, tokens: list[int], encoding_name: str = DEFAULT_ENCODING) -> str:
+        return self.get_encoding(encoding_name).decode(tokens)
+
+    def count_tokens(self, text: str, encoding_name: str = DEFAULT_ENCODING) -> int:
+        """Exact token count, memoized by the hash of the text"""
+        key = (encoding_name, self._hash(text))
+        with self.counts_lock:
+            count = self.counts.get(key)
+            if count is not None:
+                self.counts.move_to_end(key)
+                return count
+        count = len(self.encode(text, encoding_name))
+        with self.counts_lock:
+            self.counts[key] = count
+            while len(self.counts) > self.max_cached_counts:
+                self.counts.popitem(last=False)
+        return count
+
+    @staticmethod
+    def count_tokens_approx(text: str) -> int:
+        """Approximate token count without encoding, for estimates and logging"""
+        return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+    def fits(
+        self, text: str, max_tokens: int, encoding_name: str = DEFAULT_ENCODING
+    ) -> bool:
+        """
+        Whether text has at most max_tokens tokens. Text is only encoded if its UTF-8
+        size, an upper bound of its token count, exceeds max_tokens.
+        """
+        if len(text) <= max_tokens and len(text.encode()) <= max_tokens:
+            return True
+        return self.count_tokens(text, encoding_name) <= max_tokens
+
+    def truncate(
+        self, text: str, max_tokens: int, encoding_name: str = DEFAULT_ENCODING
+    ) -> str:
+        """First max_tokens tokens of text"""
+        if self.fits(text, max_tokens, encoding_name):
+            return text
+        return self.decode(self.encode(text, encoding_name)[:max_tokens], encoding_name)
+
+    @staticmethod
+    def _hash(text: str) -> str:
+        return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+
+_tokenizer = Tokenizer()
+
+
+def get_tokenizer() -> Tokenizer:
+    """Tokenizer shared by all context builders"""
+    return _tokenizer
@@ -0,0 +1,50 @@
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any
+
+
+class ConfigChangeType(Enum):
+    ADDED = "added"
+    REMOVED = "removed"
+    MODIFIED = "modified"
+
+
+@dataclass(frozen=True)
+class ConfigChangeEvent:
+    """
+    Change of a single config setting, identified by its dotted key
+    (e.g. 'chat.slack.team_to_channels')
+    """
+
+    key: str
+    change_type: ConfigChangeType
+    old_value: Any = None
+    new_value: Any = None
+
+    def matches(self, prefix: str) -> bool:
+        """Check if the changed key is the prefix or below it."""
+        return not prefix or self.key == prefix or self.key.startswith(f"{prefix}.")
+
+
+def get_config_changes(
+    old_settings: dict[str, Any], new_settings: dict[str, Any]
+) -> list[ConfigChangeEvent]:
+    """Diff two flattened configs into change events."""
+    changes = []
+    for key, new_value in new_settings.items():
+        if key not in old_settings:
+            changes.append(
+                ConfigChangeEvent(key, ConfigChangeType.ADDED, None, new_value)
+            )
+        elif old_settings[key] != new_value:
+            changes.append(
+                ConfigChangeEvent(
+                    key, ConfigChangeType.MODIFIED, old_settings[key], new_value
+                )
+            )
+    for key, old_value in old_settings.items():
+        if key not in new_settings:
+            changes.append(
+                ConfigChangeEvent(key, ConfigChangeType.REMOVED, old_value, None)
+            )
+    return changes
@@ -1,14 +1,26 @@
-from pathlib import Path
-import yaml
-from typing import Dict, Any, List, Type, TypeVar
+import asyncio
+import copy
 import logging
+import os
+import threading
+from collections.abc import Callable
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, TypeVar
 
-from pydantic import BaseModel
+import yaml
 
-T = TypeVar("T", bound=BaseModel)
+from opus_agent_base.config.config_change_event import (
+    ConfigChangeEvent,
+    get_config_changes,
+)
+from opus_agent_base.config.config_snapshot import ConfigSnapshot, FileStamp
 from opus_agent_base.config.nested_config_manager import NestedConfigManager
-from opus_agent_base.common.logging_config import console_log
 
+if TYPE_CHECKING:
+    from pydantic import BaseModel
+
+T = TypeVar("T", bound="BaseModel")
 
 logger = logging.getLogger(__name__)
 
@@ -28,7 +40,18 @@ class ConfigManager:
             self.config_dir = Path(config_dir)
             self.config_file = self.config_dir / config_file
         self.nested_config_manager = NestedConfigManager()
-        self.cached_config = None
+        # snapshot of the config file, rebuilt only when the file changes
+        self.cached_config: ConfigSnapshot = None
+        self._lock = threading.RLock()
+        self._lock_depth = 0
+        # changes detected under the lock, published once the outermost lock is released
+        self._pending_changes: list[ConfigChangeEvent] = []
+        # (key prefix, callback) called with the change events below the prefix
+        self.subscribers: list[
+            tuple[str, Callable[[list[ConfigChangeEvent]], None]]
+        ] = []
+        # event loop the subscribers are called on
+        self.loop: asyncio.AbstractEventLoop = None
         self._ensure_config_dir()
         self._ensure_config_file()
 
@@ -41,42 +64,78 @@ class ConfigManager:
         if not self.config_file.exists():
             raise FileNotFoundError(f"Config file not found: {self.config_file}")
 
-    def load_config(self) -> Dict[str, Any]:
-        """Load configuration from file."""
-        # cache config file
-        if self.cached_config is not None:
-            return self.cached_config
+    def load_config(self) -> dict[str, Any]:
+        """Load configuration from file.
 
-        if not self.config_file.exists():
-            return {}
+        Returns a copy of the config snapshot, the file is parsed only when it changed.
+        """
+        return self.get_snapshot().get_config()
 
-        try:
-            with open(self.config_file, "r") as f:
-                config = yaml.safe_load(f)
-                return config if config is not None else {}
-        except (yaml.YAMLError, IOError) as e:
-            logger.warning(f"Failed to load config: {e}")
-            return {}
+    def get_snapshot(self) -> ConfigSnapshot:
+        """Get the config snapshot, reloading it if the config file changed."""
+        file_stamp = self._get_file_stamp()
+        snapshot = self.cached_config
+        if snapshot is not None and snapshot.file_stamp == file_stamp:
+            return snapshot
 
-    def save_config(self, config: Dict[str, Any]) -> bool:
+        with self._locked():
+            # another thread may have reloaded the snapshot meanwhile
+            snapshot = self.cached_config
+            if snapshot is not None and snapshot.file_stamp == file_stamp:
+                return snapshot
+            logger.debug(f"Loading config: {self.config_file}")
+            try:
+                config = self._read_config_file()
+            except (yaml.YAMLError, OSError, ValueError) as e:
+                if snapshot is None:
+                    logger.warning(f"Failed to load config: {e}")
+                    config = {}
+                else:
+                    # e.g. a half-written editor save, the config is reloaded when
+                    # the file changes again
+                    logger.warning(
+                        f"Failed to reload config, keeping the last loaded config: {e}"
+                    )
+                    self.cached_config = snapshot.with_file_stamp(file_stamp)
+                    return self.cached_config
+            snapshot = ConfigSnapshot(config, file_stamp)
+            self._swap_snapshot(snapshot)
+            return snapshot
+
+    def subscribe(
+        self, prefix: str, callback: Callable[[list[ConfigChangeEvent]], None]
+    ):
+        """Subscribe to changes of settings below a key prefix (e.g., 'chat.slack').
+
+        The callback is called with the list of changed settings every time the
+        config changes, on the event loop set with set_event_loop, or in the thread
+        that detected the change if there is none. Use ConfigWatcher to detect
+        changes of the config file as soon as they happen.
+        """
+        self.subscribers.append((prefix, callback))
+
+    def set_event_loop(self, loop: asyncio.AbstractEventLoop):
+        """Call subscribers on the given event loop, whatever thread detects changes."""
+        self.loop = loop
+
+    def unsubscribe(
+        self, prefix: str, callback: Callable[[list[ConfigChangeEvent]], None]
+    ):
+        """Unsubscribe a callback registered with subscribe."""
+        if (prefix, callback) in self.subscribers:
+            self.subscribers.remove((prefix, callback))
+
+    def save_config(self, config: dict[str, Any]) -> bool:
         """Save configuration to file."""
-        try:
-            with open(self.config_file, "w") as f:
-                yaml.safe_dump(config, f, default_flow_style=False, sort_keys=False)
-            self.cached_config = None
-            return True
-        except IOError as e:
-            logger.error(f"Failed to save config: {e}")
-            return False
+        with self._locked():
+            return self._save_config(config)
 
     def get_setting(self, key: str, default: Any = None) -> Any:
         """Get a configuration setting.
 
         Supports dot notation for nested values (e.g., 'todoist.api_key').
         """
-        config = self.load_config()
-        keys = key.split(".")
-        return self.nested_config_manager.get_nested_value(config, keys, default)
+        return self.get_snapshot().get(key, default)
 
     def set_setting(self, key: str, value: Any) -> bool:
         """Set a configuration setting.
@@ -84,28 +143,112 @@ class ConfigManager:
         Supports dot notation for nested values (e.g., 'todoist.api_key').
         Creates intermediate dictionaries as needed.
         """
-        config = self.load_config()
-        keys = key.split(".")
-        self.nested_config_manager.set_nested_value(config, keys, value)
-        return self.save_config(config)
+        with self._locked():
+            config = self.load_config()
+            keys = key.split(".")
+            self.nested_config_manager.set_nested_value(config, keys, value)
+            return self._save_config(config)
 
     def delete_setting(self, key: str) -> bool:
         """Delete a configuration setting.
 
         Supports dot notation for nested values (e.g., 'todoist.api_key').
         """
-        config = self.load_config()
-        keys = key.split(".")
-        if self.nested_config_manager.delete_nested_key(config, keys):
-            return self.save_config(config)
-        return False
+        with self._locked():
+            config = self.load_config()
+            keys = key.split(".")
+            if self.nested_config_manager.delete_nested_key(config, keys):
+                return self._save_config(config)
+            return False
 
-    def get_all_settings_flat(self) -> Dict[str, Any]:
+    def get_all_settings_flat(self) -> dict[str, Any]:
         """Get all configuration settings as a flattened dictionary with dot notation keys."""
-        config = self.load_config()
-        return self.nested_config_manager.get_flattened_values(config)
+        return dict(self.get_snapshot().flattened_settings)
+
+    @contextmanager
+    def _locked(self):
+        """
+        Hold the config lock. Changes detected meanwhile are published after the
+        outermost lock is released, so subscribers never run under the lock.
+        """
+        changes = []
+        try:
+            with self._lock:
+                self._lock_depth += 1
+                try:
+                    yield
+                finally:
+                    self._lock_depth -= 1
+                    if self._lock_depth == 0:
+                        changes, self._pending_changes = self._pending_changes, []
+        finally:
+            if changes:
+                self._publish(changes)
+
+    def _get_file_stamp(self) -> FileStamp:
+        try:
+            stat = os.stat(self.config_file)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_ino, stat.st_size
+
+    def _read_config_file(self) -> dict[str, Any]:
+        """Read the config file. Raises an error if it is missing or invalid."""
+        with open(self.config_file) as f:
+            config = yaml.safe_load(f)
+        if config is None:
+            return {}
+        if not isinstance(config, dict):
+            raise ValueError(f"Config must be a mapping, not {type(config).__name__}")
+        return config
+
+    def _save_config(self, config: dict[str, Any]) -> bool:
+        # write to a temp file and rename it, so readers never see a partial config
+        tmp_file = self.config_file.with_suffix(".tmp")
+        try:
+            with open(tmp_file, "w") as f:
+                yaml.safe_dump(config, f, default_flow_style=False, sort_keys=False)
+            os.replace(tmp_file, self.config_file)
+        except OSError as e:
+            logger.error(f"Failed to save config: {e}")
+            return False
+        self._swap_snapshot(
+            ConfigSnapshot(copy.deepcopy(config), self._get_file_stamp())
+        )
+        return True
+
+    def _swap_snapshot(self, snapshot: ConfigSnapshot):
+        old_snapshot, self.cached_config = self.cached_config, snapshot
+        if old_snapshot is None:
+            return
+        changes = get_config_changes(
+            old_snapshot.flattened_settings, snapshot.flattened_settings
+        )
+        if changes:
+            logger.info(f"Config changed: {[change.key for change in changes]}")
+            self._pending_changes.extend(changes)
+
+    def _publish(self, changes: list[ConfigChangeEvent]):
+        loop = self.loop
+        if loop is not None and not loop.is_closed():
+            # subscribers like the agent's model must not be changed from worker threads
+            loop.call_soon_threadsafe(self._notify_subscribers, changes)
+        else:
+            self._notify_subscribers(changes)
+
+    def _notify_subscribers(self, changes: list[ConfigChangeEvent]):
+        for prefix, callback in list(self.subscribers):
+            matching_changes = [change for change in changes if change.matches(prefix)]
+            if not matching_changes:
+                continue
+            try:
+                callback(matching_changes)
+            except Exception as e:
+                logger.error(f"Config change subscriber for '{prefix}' failed: {e}")
 
-    def get_setting_as_model(self, key: str, model_class: Type[T], default: T = None) -> T:
+    def get_setting_as_model(
+        self, key: str, model_class: type[T], default: T = None
+    ) -> T:
         """Get a configuration setting as a Pydantic BaseModel.
 
         Args:
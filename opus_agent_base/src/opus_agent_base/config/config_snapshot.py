@@ -0,0 +1,48 @@
+import copy
+from typing import Any
+
+from opus_agent_base.config.nested_config_manager import NestedConfigManager
+
+# (st_mtime_ns, st_ino, st_size) of the config file the snapshot was loaded from
+FileStamp = tuple[int, int, int]
+
+
+class ConfigSnapshot:
+    """
+    Pre-flattened snapshot of the config file
+
+    Every dotted key path, both leaves (e.g. 'todoist.api_key') and subtrees
+    (e.g. 'todoist'), is indexed once when the snapshot is built, so lookups are a
+    single dict access.
+    A snapshot is never modified after it is built; changes build a new snapshot.
+    """
+
+    def __init__(self, config: dict[str, Any], file_stamp: FileStamp = None):
+        self.config = config
+        self.file_stamp = file_stamp
+        self.settings: dict[str, Any] = {}
+        self._index(config, "")
+        self.flattened_settings = NestedConfigManager().get_flattened_values(config)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = self.settings.get(key, default)
+        # hand out copies of subtrees, so callers can't modify the snapshot
+        if isinstance(value, (dict, list)):
+            return copy.deepcopy(value)
+        return value
+
+    def get_config(self) -> dict[str, Any]:
+        return copy.deepcopy(self.config)
+
+    def with_file_stamp(self, file_stamp: FileStamp) -> "ConfigSnapshot":
+        """Same settings for another version of the config file, without re-indexing"""
+        snapshot = copy.copy(self)
+        snapshot.file_stamp = file_stamp
+        return snapshot
+
+    def _index(self, data: dict[str, Any], parent_key: str):
+        for key, value in data.items():
+            dotted_key = f"{parent_key}.{key}" if parent_key else str(key)
+            self.settings[dotted_key] = value
+            if isinstance(value, dict):
+                self._index(value, dotted_key)
@@ -0,0 +1,77 @@
+import asyncio
+import logging
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+class ConfigWatcher:
+    """
+    Watches the config file and reloads the config when it changes, so that
+    ConfigManager subscribers react to config changes without restarting the agent.
+
+    Uses file system notifications (inotify etc.) if watchfiles is installed
+    and polls the config file otherwise.
+
+    Example config:
+        config_watcher:
+          enabled: true
+          poll_interval_seconds: 1
+    """
+
+    def __init__(self, config_manager):
+        self.config_manager = config_manager
+        self.poll_interval = config_manager.get_setting(
+            "config_watcher.poll_interval_seconds", 1
+        )
+        self.task = None
+        self._stop_event = None
+
+    def start(self):
+        if self.task is not None:
+            return
+        self._stop_event = asyncio.Event()
+        self.task = asyncio.create_task(self.watch())
+        logger.info(f"Watching config file: {self.config_manager.config_file}")
+
+    async def stop(self):
+        if self.task is None:
+            return
+        self._stop_event.set()
+        self.task.cancel()
+        try:
+            await self.task
+        except asyncio.CancelledError:
+            pass
+        self.task = None
+        logger.info("Stopped watching config file")
+
+    async def watch(self):
+        try:
+            from watchfiles import awatch
+        except ImportError:
+            await self.poll()
+            return
+
+        config_file = self.config_manager.config_file.resolve()
+        # watch the directory, config saves replace the file
+        async for changes in awatch(
+            self.config_manager.config_dir, stop_event=self._stop_event, recursive=False
+        ):
+            if any(self._is_config_file(path, config_file) for _, path in changes):
+                self.reload()
+
+    async def poll(self):
+        while not self._stop_event.is_set():
+            await asyncio.sleep(self.poll_interval)
+            self.reload()
+
+    def reload(self):
+        try:
+            # reloads the snapshot and notifies subscribers if the file changed
+            self.config_manager.get_snapshot()
+        except Exception as e:
+            logger.error(f"Failed to reload config: {e}")
+
+    def _is_config_file(self, path: str, config_file: Path) -> bool:
+        return Path(path).resolve() == config_file
@@ -18,8 +18,11 @@ class ModelManager:
 
     def __init__(self, config_manager):
         self.config_manager = config_manager
+        self.model = None
+        self.local_model = None
         self.initialize_config()
         self.initialize_model()
+        self.config_manager.subscribe("model_config", self.on_model_config_changed)
 
     def initialize_config(self):
         self.models_config = self.config_manager.get_setting("model_config")
@@ -32,6 +35,62 @@ class ModelManager:
         self.initialize_ollama_model()
         logger.info("Model initialized")
 
+    def on_model_config_changed(self, changes):
+        """
+        Reinitialize models when model_config changes, keeping the current models if
+        it is invalid
+        """
+        error = self.validate_models_config(
+            self.config_manager.get_setting("model_config")
+        )
+        if error:
+            logger.warning(f"Invalid model config, keeping the current model: {error}")
+            return
+        logger.info("Model config changed, reinitializing models")
+        current_models = (self.models_config, self.model, self.local_model)
+        try:
+            self.initialize_config()
+            self.model = None
+            self.initialize_model()
+        except Exception as e:
+            logger.warning(
+                f"Failed to initialize models, keeping the current model: {e}"
+            )
+            self.models_config, self.model, self.local_model = current_models
+            return
+        if self.model is None:
+            logger.warning("No enabled model initialized, keeping the current model")
+            self.models_config, self.model, self.local_model = current_models
+
+    @staticmethod
+    def validate_models_config(models_config) -> str | None:
+        """
+        Error message if models_config can't be used to initialize the models, None if
+        it is valid
+        """
+        if not isinstance(models_config, list):
+            return "model_config must be a list of models"
+        for model_config in models_config:
+            if not isinstance(model_config, dict) or not all(
+                key in model_config for key in ("provider", "model", "enabled")
+            ):
+                return f"Model config needs provider, model and enabled: {model_config}"
+            if (
+                model_config["provider"] == "ollama"
+                and model_config["enabled"]
+                and not all(key in model_config for key in ("is_local", "base_url"))
+            ):
+                return (
+                    f"Ollama model config needs is_local and base_url: {model_config}"
+                )
+        if not any(
+            model_config["enabled"]
+            and model_config["provider"] in ("openai", "anthropic")
+            for model_config in models_config
+        ):
+            return "No enabled openai or anthropic model"
+        return None
+
     def get_enabled_models(self):
         return [model_config["model"] for model_config in self.models_config if model_config["enabled"]]
 
@@ -0,0 +1,22 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class FastMCPClientContext:
+    """
+    FastMCP client context passed to agent tools and higher order tools
+
+    Calling the context with an async function calls the function with the MCP client
+    router. The context also carries the shared state for MCP tool calls, like the tool
+    result cache and the singleflight that coalesces concurrent identical tool calls.
+    """
+
+    def __init__(self, mcp_client_router, result_cache=None, singleflight=None):
+        self.mcp_client_router = mcp_client_router
+        self.result_cache = result_cache
+        self.singleflight = singleflight
+
+    async def __call__(self, func):
+        logger.debug("Calling function with FastMCP client context")
+        return await func(self.mcp_client_router)
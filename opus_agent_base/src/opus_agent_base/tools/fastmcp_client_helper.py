@@ -4,6 +4,8 @@ import logging
 from mcp.client.session import ClientSession
 from mcp.types import TextContent
 
+from opus_agent_base.tools.mcp_tool_result_cache import get_tool_call_key
+
 logger = logging.getLogger(__name__)
 
 
@@ -21,39 +23,79 @@ class FastMCPClientHelper:
         mcp_tool_name: str,
         kwargs: dict,
         parse_json: bool = True,
+        use_cache: bool = True,
     ):
+        """
+        Call an MCP tool and parse its result.
+
+        Results of read-only tools are served from the tool result cache of the
+        FastMCP client context, if it is enabled. Pass use_cache=False to bypass the
+        cache and refresh the cached result.
+        """
+        result_cache = getattr(fastmcp_client_context, "result_cache", None)
+        if result_cache is not None and not result_cache.is_cacheable(mcp_tool_name):
+            result_cache = None
+
+        if use_cache and result_cache is not None:
+            cached_content = result_cache.get(mcp_tool_name, kwargs)
+            if cached_content is not None:
+                logger.info(f"Using cached result of {mcp_tool_name}")
+                return self.parse_content(cached_content, parse_json)
+
         async def execute_with_session(session: ClientSession):
-            result = await session.call_tool(mcp_tool_name, kwargs)
+            return await session.call_tool(mcp_tool_name, kwargs)
+
+        singleflight = getattr(fastmcp_client_context, "singleflight", None)
+        if singleflight is not None:
+            # concurrent identical calls share a single MCP call
+            result = await singleflight.run(
+                get_tool_call_key(mcp_tool_name, kwargs),
+                lambda: fastmcp_client_context(execute_with_session),
+            )
+        else:
+            result = await fastmcp_client_context(execute_with_session)
+        if not hasattr(result, "content"):
             return self.parse_result(result, parse_json)
+        content = self.extract_content(result)
+        if result_cache is not None:
+            result_cache.put(mcp_tool_name, kwargs, content)
+        return self.parse_content(content, parse_json)
 
-        return await fastmcp_client_context(execute_with_session)
+    def invalidate_cached_results(
+        self, fastmcp_client_context, mcp_tool_name: str = None
+    ):
+        """
+        Invalidate cached results of an MCP tool, or of all tools without mcp_tool_name
+        """
+        result_cache = getattr(fastmcp_client_context, "result_cache", None)
+        if result_cache is not None:
+            result_cache.invalidate(mcp_tool_name)
 
     def parse_result(self, result, parse_json):
         if hasattr(result, "content"):
-            if parse_json:
-                if isinstance(result.content, list):
-                    json_result = {
-                        "data": [
-                            json.loads(self._extract_content_text(contentItem))
-                            for contentItem in result.content
-                        ]
-                    }
-                else:
-                    json_result = {"data": json.loads(str(result.content))}
-                return json_result
-            else:
-                if isinstance(result.content, list):
-                    text_result = {
-                        "data": [
-                            self._extract_content_text(contentItem) for contentItem in result.content
-                        ]
-                    }
-                else:
-                    text_result = {"data": str(result.content)}
-                return text_result
+            return self.parse_content(self.extract_content(result), parse_json)
         else:
             return {"data": str(result)}
 
+    def extract_content(self, result):
+        """
+        Extract the content of an MCP tool result as text.
+        Returns a list of texts for list content, otherwise the content as a string.
+        """
+        if isinstance(result.content, list):
+            return [
+                self._extract_content_text(contentItem)
+                for contentItem in result.content
+            ]
+        return str(result.content)
+
+    def parse_content(self, content, parse_json):
+        if parse_json:
+            if isinstance(content, list):
+                return {"data": [json.loads(text) for text in content]}
+            return {"data": json.loads(content)}
+        return {"data": content}
+
     def _extract_content_text(self, content_item):
         """Extract text from different MCP content types."""
         if isinstance(content_item, TextContent):
@@ -0,0 +1,71 @@
+import asyncio
+import logging
+
+from fastmcp.exceptions import ToolError
+from mcp.types import Tool as MCPTool
+
+from opus_agent_base.tools.mcp_session import MCPSession
+
+logger = logging.getLogger(__name__)
+
+
+class MCPClientRouter:
+    """
+    Routes MCP calls to per-server sessions (lanes)
+
+    Each MCP server has its own session, so a slow server does not hold up calls to
+    other servers and calls to different servers run concurrently.
+    Tools are exposed with the server name as prefix ({server_name}_{tool_name}),
+    and tool calls are routed to the lane matching the tool prefix.
+    """
+
+    def __init__(self, mcp_sessions: dict[str, MCPSession]):
+        self.mcp_sessions = mcp_sessions
+
+    def get_session_for_tool(self, tool_name: str) -> tuple[MCPSession, str]:
+        """
+        Find the lane for a prefixed tool name.
+
+        Returns:
+            A tuple of (MCP session, tool name without the server prefix)
+        """
+        # longest server name first, so that "google_calendar" wins over "google"
+        for server_name in sorted(self.mcp_sessions, key=len, reverse=True):
+            prefix = f"{server_name}_"
+            if tool_name.startswith(prefix):
+                return self.mcp_sessions[server_name], tool_name[len(prefix):]
+        raise ToolError(f"No MCP server found for tool: {tool_name}")
+
+    async def call_tool(self, tool_name: str, arguments: dict = None):
+        mcp_session, server_tool_name = self.get_session_for_tool(tool_name)
+        logger.debug(f"Routing tool call {tool_name} to MCP server {mcp_session.name}")
+        return await mcp_session.run(
+            lambda client: client.call_tool(server_tool_name, arguments or {})
+        )
+
+    async def list_tools(self) -> list[MCPTool]:
+        results = await asyncio.gather(
+            *(
+                self.list_server_tools(server_name)
+                for server_name in self.mcp_sessions
+            )
+        )
+        return [tool for server_tools in results for tool in server_tools]
+
+    async def list_server_tools(self, server_name: str) -> list[MCPTool]:
+        tools = await self.mcp_sessions[server_name].run(
+            lambda client: client.list_tools()
+        )
+        return [
+            tool.model_copy(update={"name": f"{server_name}_{tool.name}"})
+            for tool in tools
+        ]
+
+    async def ping(self) -> bool:
+        results = await asyncio.gather(
+            *(
+                mcp_session.run(lambda client: client.ping())
+                for mcp_session in self.mcp_sessions.values()
+            )
+        )
+        return all(results)
@@ -1,9 +1,18 @@
+import asyncio
+import json
 import logging
 
-from fastmcp import Client
+from mcp.types import Tool as MCPTool
 from singleton_decorator import singleton
+
 from opus_agent_base.common.logging_config import console_log
+from opus_agent_base.common.singleflight import SingleFlight
+from opus_agent_base.tools.fastmcp_client_context import FastMCPClientContext
 from opus_agent_base.tools.fastmcp_server_config import FastMCPServerConfig
+from opus_agent_base.tools.mcp_client_router import MCPClientRouter
+from opus_agent_base.tools.mcp_session import MCPSession
+from opus_agent_base.tools.mcp_tool_catalog_cache import MCPToolCatalogCache
+from opus_agent_base.tools.mcp_tool_result_cache import MCPToolResultCache
 
 logger = logging.getLogger(__name__)
 
@@ -19,14 +28,29 @@ class MCPManager:
         self.config["mcpServers"] = {}
         self.config_manager = config_manager
         self.fastmcp_client_context = None
-        self.fastmcp_client_instance = None
-        self.fastmcp_client_instance_initialized = False
+        self.mcp_server_configs: dict[str, FastMCPServerConfig] = {}
+        self.mcp_sessions: dict[str, MCPSession] = {}
+        self.mcp_client_router = None
+        self.tool_catalog_cache = MCPToolCatalogCache(
+            self.config_manager.config_dir / "cache" / "mcp_tools"
+        )
+        self.result_cache = None
+        self.background_tasks: set[asyncio.Task] = set()
         self.enabled_servers = []
+        # all registered MCP servers, enabled or not, so they can be enabled when the
+        # config changes
+        self.registered_mcp_server_configs: dict[str, FastMCPServerConfig] = {}
+        # callbacks called with the tools of MCP servers enabled after startup
+        self.tools_listeners = []
+        self.loop = None
+        self.config_manager.subscribe("mcp_config", self.on_mcp_config_changed)
 
     def add_mcp_server(self, mcp_server_config: FastMCPServerConfig) -> bool:
-        if self._is_mcp_enabled(mcp_server_config.config_key) or self._is_higher_order_tools_enabled(mcp_server_config.config_key):
+        self.registered_mcp_server_configs[mcp_server_config.name] = mcp_server_config
+        if self._is_server_enabled(mcp_server_config):
             logger.info(f"Adding MCP server: {mcp_server_config.name}")
             self.config["mcpServers"][mcp_server_config.name] = mcp_server_config.mcp_server_config
+            self.mcp_server_configs[mcp_server_config.name] = mcp_server_config
             return True
         else:
             logger.info(f"MCP server {mcp_server_config.name} not enabled")
@@ -45,46 +69,304 @@ class MCPManager:
             console_log("No MCP servers configured")
             return None
 
-        async def fastmcp_client_context(func):
-            if self.fastmcp_client_instance is None:
-                self.fastmcp_client_instance = Client(self.config)
+        self.loop = asyncio.get_running_loop()
+
+        # Independent long-lived session (lane) per MCP server
+        self.mcp_sessions = {
+            server_name: MCPSession(
+                server_name, {"mcpServers": {server_name: server_config}}
+            )
+            for server_name, server_config in self.config["mcpServers"].items()
+        }
+        self.mcp_client_router = MCPClientRouter(self.mcp_sessions)
+
+        # Stop MCP servers that are idle for longer than their idle timeout
+        self._run_in_background(self.reap_idle_mcp_servers())
+
+        # Cache for results of read-only MCP tool calls
+        if self.config_manager.get_setting("mcp_config.result_cache.enabled", False):
+            self.result_cache = MCPToolResultCache(self.config_manager)
 
-            async with self.fastmcp_client_instance as client:
-                if not self.fastmcp_client_instance_initialized:
-                    await client.ping()
-                    self.fastmcp_client_instance_initialized = True
-                logger.debug("Calling function with FastMCP client context")
-                return await func(client)
+        # Coalesce concurrent identical MCP tool calls
+        singleflight = None
+        if self.config_manager.get_setting("mcp_config.singleflight.enabled", True):
+            singleflight = SingleFlight()
 
-        self.fastmcp_client_context = fastmcp_client_context
+        self.fastmcp_client_context = FastMCPClientContext(
+            self.mcp_client_router, self.result_cache, singleflight
+        )
         logger.info("FastMCP Client initialized")
         return self.fastmcp_client_context
 
-    async def inspect_fastmcp_client_tools(self):
-        if self.fastmcp_client_context is None:
+    async def start_mcp_server(self, server_name: str) -> list[MCPTool]:
+        """
+        Start an MCP server and discover its tools.
+        If the tools of the server are cached, the cached tools are returned right away
+        and the server is started and its tools revalidated in background.
+        Lazy servers (mcp_config.<config_key>.lazy) are not started here. They are
+        started on the first call to one of their tools, directly or from a higher
+        order tool, and their tools are revalidated then. A lazy server without cached
+        tools is started once to discover its tools and stopped again.
+
+        Returns:
+            List of tools of the MCP server, prefixed with the server name
+        """
+        mcp_server_config = self.mcp_server_configs[server_name]
+        if self._is_tool_catalog_cache_enabled():
+            cached_tools = self.tool_catalog_cache.load(mcp_server_config)
+            if cached_tools is not None:
+                logger.info(
+                    f"Using {len(cached_tools)} cached tools of MCP server "
+                    f"{server_name}"
+                )
+                if self.is_lazy(server_name):
+                    self._revalidate_tool_catalog_on_first_connect(
+                        server_name, cached_tools
+                    )
+                else:
+                    self._run_in_background(
+                        self.revalidate_tool_catalog(server_name, cached_tools)
+                    )
+                return cached_tools
+
+        # shield discovery from the startup timeout, so a slow server still gets its
+        # tools cached
+        discover_tools_task = self._run_in_background(self.discover_tools(server_name))
+        return await asyncio.shield(discover_tools_task)
+
+    async def discover_tools(self, server_name: str) -> list[MCPTool]:
+        await self.mcp_sessions[server_name].connect()
+        tools = await self.mcp_client_router.list_server_tools(server_name)
+        if self._is_tool_catalog_cache_enabled():
+            self.tool_catalog_cache.save(self.mcp_server_configs[server_name], tools)
+        if self.is_lazy(server_name):
+            await self.mcp_sessions[server_name].close()
+            logger.info(
+                f"Stopped lazy MCP server {server_name} until its first tool call"
+            )
+        return tools
+
+    async def revalidate_tool_catalog(
+        self, server_name: str, cached_tools: list[MCPTool]
+    ):
+        """
+        Start an MCP server, refresh its cached tools and warn if they changed
+        """
+        try:
+            await self.mcp_sessions[server_name].connect()
+            tools = await self.mcp_client_router.list_server_tools(server_name)
+        except Exception as e:
+            logger.warning(
+                f"Failed to revalidate tools of MCP server {server_name}: {e}"
+            )
+            return
+        mcp_server_config = self.mcp_server_configs[server_name]
+        cached_tools_dump = self.tool_catalog_cache.dump_tools(cached_tools)
+        if self.tool_catalog_cache.dump_tools(tools) != cached_tools_dump:
+            self.tool_catalog_cache.save(mcp_server_config, tools)
+            console_log(
+                f"Tools of MCP server {server_name} changed. "
+                "Restart the agent to use the updated tools"
+            )
+        else:
+            logger.info(f"Cached tools of MCP server {server_name} are up-to-date")
+
+    async def reap_idle_mcp_servers(self):
+        """
+        Periodically stop MCP servers that are idle for longer than
+        mcp_config.<config_key>.idle_timeout_seconds. A stopped server is started
+        again on its next tool call.
+        Idle timeouts are read on every check, so config changes apply without a
+        restart.
+        """
+        while True:
+            idle_timeouts = {
+                server_name: self.get_idle_timeout(server_name)
+                for server_name in list(self.mcp_sessions)
+                if self.get_idle_timeout(server_name)
+            }
+            check_interval = min(
+                60, max(1, min(idle_timeouts.values(), default=60) / 2)
+            )
+            await asyncio.sleep(check_interval)
+            for server_name, idle_timeout in idle_timeouts.items():
+                mcp_session = self.mcp_sessions.get(server_name)
+                if mcp_session is not None and await mcp_session.close_if_idle(
+                    idle_timeout
+                ):
+                    logger.info(
+                        f"Stopped MCP server {server_name} after {idle_timeout}s idle"
+                    )
+
+    def on_mcp_config_changed(self, changes):
+        """
+        Enable or disable MCP servers when their enabled flags change.
+        Called by ConfigManager, possibly from another thread, so the work is scheduled
+        on the event loop.
+        """
+        if self.loop is None or self.loop.is_closed() or self.mcp_client_router is None:
             return
+        self.loop.call_soon_threadsafe(self.update_enabled_servers)
+
+    def update_enabled_servers(self):
+        for (
+            server_name,
+            mcp_server_config,
+        ) in self.registered_mcp_server_configs.items():
+            enabled = self._is_server_enabled(mcp_server_config)
+            if enabled and server_name not in self.mcp_sessions:
+                self.enable_mcp_server(server_name)
+            elif not enabled and server_name in self.mcp_sessions:
+                self.disable_mcp_server(server_name)
+
+    def enable_mcp_server(self, server_name: str):
+        """
+        Add a lane for an MCP server enabled after startup and start it in background.
+        Its tools are passed to the tools listeners once they are discovered.
+        """
+        mcp_server_config = self.registered_mcp_server_configs[server_name]
+        self.config["mcpServers"][server_name] = mcp_server_config.mcp_server_config
+        self.mcp_server_configs[server_name] = mcp_server_config
+        self.mcp_sessions[server_name] = MCPSession(
+            server_name,
+            {"mcpServers": {server_name: mcp_server_config.mcp_server_config}},
+        )
+        self.enabled_servers.append(server_name)
+        console_log(f"Enabling MCP server {server_name}")
+
+        async def start_and_notify():
+            tools = await self.start_mcp_server(server_name)
+            for tools_listener in self.tools_listeners:
+                tools_listener(server_name, tools)
+
+        self._run_in_background(start_and_notify())
 
+    def disable_mcp_server(self, server_name: str):
+        """
+        Remove the lane of an MCP server disabled after startup and stop the server.
+        Calls to its tools fail from now on.
+        """
+        mcp_session = self.mcp_sessions.pop(server_name)
+        self.config["mcpServers"].pop(server_name, None)
+        if server_name in self.enabled_servers:
+            self.enabled_servers.remove(server_name)
+        console_log(f"Disabling MCP server {server_name}")
+        self._run_in_background(mcp_session.close())
+
+    def add_tools_listener(self, tools_listener):
+        """
+        Register a callback called with (server_name, tools) when an MCP server is
+        enabled after startup
+        """
+        self.tools_listeners.append(tools_listener)
+
+    def is_tool_enabled(self, tool_name: str) -> bool:
+        """
+        Check if a prefixed MCP tool belongs to an enabled MCP server.
+        Tools that don't belong to a registered MCP server are always enabled.
+        """
+        # longest server name first, so that "google_calendar" wins over "google"
+        for server_name in sorted(
+            self.registered_mcp_server_configs, key=len, reverse=True
+        ):
+            if tool_name.startswith(f"{server_name}_"):
+                return server_name in self.mcp_sessions
+        return True
+
+    def is_lazy(self, server_name: str) -> bool:
+        config_key = self.mcp_server_configs[server_name].config_key
+        return self.config_manager.get_setting(f"mcp_config.{config_key}.lazy", False)
+
+    def get_idle_timeout(self, server_name: str) -> float:
+        """
+        Idle timeout in seconds after which an MCP server is stopped. 0 means never.
+        """
+        config_key = self.mcp_server_configs[server_name].config_key
+        return self.config_manager.get_setting(
+            f"mcp_config.{config_key}.idle_timeout_seconds", 0
+        )
+
+    def get_startup_timeout(self, server_name: str) -> float:
+        """
+        Startup timeout in seconds for an MCP server.
+        Configured per server in mcp_config.<config_key>.startup_timeout_seconds
+        or for all servers in mcp_config.startup_timeout_seconds
+        """
+        default_timeout = self.config_manager.get_setting(
+            "mcp_config.startup_timeout_seconds", 60
+        )
+        config_key = self.mcp_server_configs[server_name].config_key
+        return self.config_manager.get_setting(
+            f"mcp_config.{config_key}.startup_timeout_seconds", default_timeout
+        )
+
+    async def close(self):
+        """
+        Close the MCP sessions and stop the MCP servers started by them
+        """
+        for task in list(self.background_tasks):
+            task.cancel()
+        await asyncio.gather(
+            *(mcp_session.close() for mcp_session in self.mcp_sessions.values())
+        )
+        if self.result_cache is not None:
+            self.result_cache.close()
+        logger.info("MCP servers closed")
+
+    def inspect_fastmcp_client_tools(self, tools: list[MCPTool]):
         inspect_tools_enabled = self.config_manager.get_setting("debug.inspect_tools", False)
         inspect_tool_schema_enabled = self.config_manager.get_setting("debug.inspect_tool_schema", False)
         if inspect_tools_enabled:
-            async def inspect_tools(client):
-                await client.ping()
-                self.fastmcp_client = client
-                tools = await client.list_tools()
-                logger.info("FastMCP Client - Available tools:")
-                for tool in tools:
-                    logger.debug(f"Tool attributes: {list(tool.__dict__.keys())}")
-                    logger.info(f"Name - {tool.name}")
-                    logger.debug(f"Title - {tool.title}")
-                    logger.debug(f"Description - {tool.description}")
-                    import json
-                    if inspect_tool_schema_enabled:
-                        logger.info(f"inputSchema - {json.dumps(tool.inputSchema, indent=2)}")
-                    else:
-                        logger.debug(f"inputSchema - {json.dumps(tool.inputSchema, indent=2)}")
-                    logger.debug(f"outputSchema - {tool.outputSchema}")
-                    logger.debug(f"annotations - {tool.annotations}")
-            await self.fastmcp_client_context(inspect_tools)
+            logger.info("FastMCP Client - Available tools:")
+            for tool in tools:
+                logger.debug(f"Tool attributes: {list(tool.__dict__.keys())}")
+                logger.info(f"Name - {tool.name}")
+                logger.debug(f"Title - {tool.title}")
+                logger.debug(f"Description - {tool.description}")
+                if inspect_tool_schema_enabled:
+                    logger.info(
+                        f"inputSchema - {json.dumps(tool.inputSchema, indent=2)}"
+                    )
+                else:
+                    logger.debug(
+                        f"inputSchema - {json.dumps(tool.inputSchema, indent=2)}"
+                    )
+                logger.debug(f"outputSchema - {tool.outputSchema}")
+                logger.debug(f"annotations - {tool.annotations}")
+
+    def _revalidate_tool_catalog_on_first_connect(
+        self, server_name: str, cached_tools: list[MCPTool]
+    ):
+        def on_connect(mcp_session: MCPSession):
+            mcp_session.on_connect = None
+            self._run_in_background(
+                self.revalidate_tool_catalog(server_name, cached_tools)
+            )
+
+        self.mcp_sessions[server_name].on_connect = on_connect
+
+    def _run_in_background(self, coro) -> asyncio.Task:
+        task = asyncio.create_task(coro)
+        # keep a reference so that the task is not garbage collected before it is done
+        self.background_tasks.add(task)
+        task.add_done_callback(self._on_background_task_done)
+        return task
+
+    def _on_background_task_done(self, task: asyncio.Task):
+        self.background_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"MCP background task failed: {task.exception()}")
+
+    def _is_server_enabled(self, mcp_server_config: FastMCPServerConfig) -> bool:
+        return bool(
+            self._is_mcp_enabled(mcp_server_config.config_key)
+            or self._is_higher_order_tools_enabled(mcp_server_config.config_key)
+        )
+
+    def _is_tool_catalog_cache_enabled(self):
+        return self.config_manager.get_setting(
+            "mcp_config.tool_catalog_cache.enabled", True
+        )
 
     def _is_mcp_enabled(self, config_key):
         """
@@ -0,0 +1,112 @@
+import asyncio
+import logging
+import time
+
+from fastmcp import Client
+from fastmcp.exceptions import ToolError
+
+logger = logging.getLogger(__name__)
+
+
+class MCPSession:
+    """
+    Long-lived FastMCP client session
+
+    The session is opened once and kept alive until close() is called, so tool calls
+    reuse the running MCP server processes and the MCP handshake instead of reconnecting
+    on every call. A session that dropped or was closed is (re)opened on the next call.
+    """
+
+    def __init__(self, name: str, config: dict, on_connect=None):
+        self.name = name
+        self.config = config
+        self.client = None
+        # optional callback called with the session every time it is opened
+        self.on_connect = on_connect
+        self.in_flight = 0
+        self.last_used = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def is_connected(self) -> bool:
+        return self.client is not None and self.client.is_connected()
+
+    async def connect(self) -> Client:
+        """
+        Open the session if it is not already open and return the connected client
+        """
+        async with self._lock:
+            if self.is_connected():
+                return self.client
+            # drop a stale client before reconnecting
+            await self._close_client()
+            logger.info(f"Opening MCP session: {self.name}")
+            # keep the client even if connecting is cancelled (startup timeout),
+            # so that the server can finish starting in background and close() stops it
+            self.client = Client(self.config)
+            try:
+                await self.client.__aenter__()
+                await self.client.ping()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                await self._close_client()
+                raise
+            logger.info(f"MCP session opened: {self.name}")
+            if self.on_connect is not None:
+                self.on_connect(self)
+            return self.client
+
+    async def run(self, func):
+        """
+        Call func with the connected client.
+        If the session dropped during the call, reconnect and retry once.
+        """
+        self.in_flight += 1
+        try:
+            client = await self.connect()
+            try:
+                return await func(client)
+            except ToolError:
+                raise
+            except Exception as e:
+                if self.is_connected():
+                    raise
+                logger.warning(f"MCP session {self.name} dropped: {e}. Reconnecting")
+                client = await self.connect()
+                return await func(client)
+        finally:
+            self.in_flight -= 1
+            self.last_used = time.monotonic()
+
+    async def close_if_idle(self, idle_timeout: float) -> bool:
+        """
+        Close the session if it has not been used for idle_timeout seconds.
+
+        Returns:
+            True if the session was closed
+        """
+        async with self._lock:
+            if (
+                not self.is_connected()
+                or self.in_flight > 0
+                or time.monotonic() - self.last_used < idle_timeout
+            ):
+                return False
+            await self._close_client()
+            return True
+
+    async def close(self):
+        async with self._lock:
+            await self._close_client()
+        # the lock is bound to the event loop of the run, reset it for the next run
+        self._lock = asyncio.Lock()
+
+    async def _close_client(self):
+        client, self.client = self.client, None
+        if client is None:
+            return
+        try:
+            await client.close()
+            logger.info(f"MCP session closed: {self.name}")
+        except Exception as e:
+            logger.warning(f"Error closing MCP session {self.name}: {e}")
@@ -0,0 +1,81 @@
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+
+import fastmcp
+from mcp.types import Tool as MCPTool
+
+from opus_agent_base import __version__
+from opus_agent_base.tools.fastmcp_server_config import FastMCPServerConfig
+
+logger = logging.getLogger(__name__)
+
+
+class MCPToolCatalogCache:
+    """
+    On-disk cache of MCP tool schemas
+
+    Tools of each MCP server are stored in a json file keyed by a hash of the server's
+    mcp_server_config and the package versions, so any change to the server config
+    or an upgrade invalidates the cached tools.
+    """
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = Path(cache_dir)
+
+    def get_cache_key(self, mcp_server_config: FastMCPServerConfig) -> str:
+        key_data = {
+            "name": mcp_server_config.name,
+            "mcp_server_config": mcp_server_config.mcp_server_config,
+            "opus_agent_base_version": __version__,
+            "fastmcp_version": fastmcp.__version__,
+        }
+        key_json = json.dumps(key_data, sort_keys=True, default=str)
+        return hashlib.sha256(key_json.encode()).hexdigest()[:16]
+
+    def get_cache_file(self, mcp_server_config: FastMCPServerConfig) -> Path:
+        cache_key = self.get_cache_key(mcp_server_config)
+        return self.cache_dir / f"{mcp_server_config.name}-{cache_key}.json"
+
+    def load(self, mcp_server_config: FastMCPServerConfig) -> list[MCPTool] | None:
+        """
+        Load cached tools of an MCP server.
+
+        Returns:
+            List of cached tools or None if there is no valid cache entry
+        """
+        cache_file = self.get_cache_file(mcp_server_config)
+        if not cache_file.exists():
+            return None
+        try:
+            with open(cache_file, encoding="utf-8") as f:
+                tools_data = json.load(f)
+            return [MCPTool.model_validate(tool_data) for tool_data in tools_data]
+        except Exception as e:
+            logger.warning(f"Ignoring invalid tool catalog cache {cache_file}: {e}")
+            return None
+
+    def save(self, mcp_server_config: FastMCPServerConfig, tools: list[MCPTool]):
+        """
+        Save tools of an MCP server and remove stale cache entries of the same server
+        """
+        cache_file = self.get_cache_file(mcp_server_config)
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            for stale_file in self.cache_dir.glob(f"{mcp_server_config.name}-*.json"):
+                if stale_file != cache_file:
+                    stale_file.unlink(missing_ok=True)
+            tmp_file = cache_file.with_suffix(".tmp")
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(self.dump_tools(tools), f)
+            os.replace(tmp_file, cache_file)
+            logger.info(
+                f"Saved {len(tools)} tools of {mcp_server_config.name} to {cache_file}"
+            )
+        except OSError as e:
+            logger.warning(f"Failed to save tool catalog cache {cache_file}: {e}")
+
+    def dump_tools(self, tools: list[MCPTool]) -> list[dict]:
+        return [tool.model_dump(mode="json", exclude_none=True) for tool in tools]
@@ -0,0 +1,191 @@
+import hashlib
+import json
+import logging
+import sqlite3
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+def get_tool_call_key(tool_name: str, kwargs: dict) -> str:
+    """
+    Canonical key of a tool call. Independent of the order of kwargs.
+    """
+    tool_call_json = json.dumps(
+        [tool_name, kwargs or {}], sort_keys=True, separators=(",", ":"), default=str
+    )
+    return hashlib.sha256(tool_call_json.encode()).hexdigest()
+
+
+class SQLiteToolResultStore:
+    """
+    Persistent tier of the MCP tool result cache
+    """
+
+    def __init__(self, db_path: Path):
+        db_path = Path(db_path).expanduser()
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(db_path, check_same_thread=False)
+        self.connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS tool_results (
+                cache_key TEXT PRIMARY KEY,
+                tool_name TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                value TEXT NOT NULL
+            )
+            """
+        )
+        self.connection.execute(
+            "DELETE FROM tool_results WHERE expires_at < ?", (time.time(),)
+        )
+        self.connection.commit()
+
+    def get(self, cache_key: str) -> tuple[float, str, Any] | None:
+        row = self.connection.execute(
+            "SELECT expires_at, tool_name, value FROM tool_results WHERE cache_key = ?",
+            (cache_key,),
+        ).fetchone()
+        if row is None:
+            return None
+        expires_at, tool_name, value = row
+        return expires_at, tool_name, json.loads(value)
+
+    def put(self, cache_key: str, tool_name: str, expires_at: float, value: Any):
+        try:
+            value_json = json.dumps(value)
+        except (TypeError, ValueError):
+            logger.debug(f"Not persisting non-JSON result of {tool_name}")
+            return
+        self.connection.execute(
+            "INSERT OR REPLACE INTO tool_results VALUES (?, ?, ?, ?)",
+            (cache_key, tool_name, expires_at, value_json),
+        )
+        self.connection.commit()
+
+    def delete(self, cache_key: str = None, tool_name: str = None):
+        if cache_key is not None:
+            self.connection.execute(
+                "DELETE FROM tool_results WHERE cache_key = ?", (cache_key,)
+            )
+        elif tool_name is not None:
+            self.connection.execute(
+                "DELETE FROM tool_results WHERE tool_name = ?", (tool_name,)
+            )
+        else:
+            self.connection.execute("DELETE FROM tool_results")
+        self.connection.commit()
+
+    def close(self):
+        self.connection.close()
+
+
+class MCPToolResultCache:
+    """
+    Cache for results of read-only MCP tool calls
+
+    Results are cached in an in-memory LRU tier bounded by max_entries and,
+    optionally, in a persistent SQLite tier. Only tools with a TTL in
+    mcp_config.result_cache.ttl_seconds are cached, so tools with side effects are
+    never cached by default.
+
+    Example config:
+        mcp_config:
+          result_cache:
+            enabled: true
+            max_entries: 256
+            persistent: true
+            ttl_seconds:
+              google_calendar_get_events: 300
+    """
+
+    def __init__(self, config_manager):
+        self.config_manager = config_manager
+        self.ttl_seconds: dict[str, float] = config_manager.get_setting(
+            "mcp_config.result_cache.ttl_seconds", {}
+        ) or {}
+        self.max_entries = config_manager.get_setting(
+            "mcp_config.result_cache.max_entries", 256
+        )
+        # cache key -> (expires_at, tool_name, value)
+        self.entries: OrderedDict[str, tuple[float, str, Any]] = OrderedDict()
+        self.persistent_store = None
+        if config_manager.get_setting("mcp_config.result_cache.persistent", False):
+            db_path = config_manager.get_setting(
+                "mcp_config.result_cache.db_path",
+                str(config_manager.config_dir / "cache" / "mcp_tool_results.db"),
+            )
+            self.persistent_store = SQLiteToolResultStore(db_path)
+
+    def is_cacheable(self, tool_name: str) -> bool:
+        return bool(self.ttl_seconds.get(tool_name))
+
+    def get(self, tool_name: str, kwargs: dict) -> Any:
+        """
+        Get the cached result of a tool call.
+
+        Returns:
+            The cached result or None if not cached or expired
+        """
+        cache_key = get_tool_call_key(tool_name, kwargs)
+        entry = self.entries.get(cache_key)
+        if entry is None and self.persistent_store is not None:
+            entry = self.persistent_store.get(cache_key)
+            if entry is not None:
+                self._put_entry(cache_key, entry)
+        if entry is None:
+            return None
+        expires_at, _, value = entry
+        if expires_at < time.time():
+            self.invalidate(tool_name, kwargs)
+            return None
+        self.entries.move_to_end(cache_key)
+        return value
+
+    def put(self, tool_name: str, kwargs: dict, value: Any):
+        if not self.is_cacheable(tool_name):
+            return
+        cache_key = get_tool_call_key(tool_name, kwargs)
+        expires_at = time.time() + self.ttl_seconds[tool_name]
+        self._put_entry(cache_key, (expires_at, tool_name, value))
+        if self.persistent_store is not None:
+            self.persistent_store.put(cache_key, tool_name, expires_at, value)
+
+    def invalidate(self, tool_name: str = None, kwargs: dict = None):
+        """
+        Invalidate cached results.
+
+        Args:
+            tool_name: Invalidate results of this tool only. All results if None
+            kwargs: Invalidate the result of this tool call only
+        """
+        if tool_name is not None and kwargs is not None:
+            cache_key = get_tool_call_key(tool_name, kwargs)
+            self.entries.pop(cache_key, None)
+            if self.persistent_store is not None:
+                self.persistent_store.delete(cache_key=cache_key)
+        elif tool_name is not None:
+            for cache_key in [
+                key for key, entry in self.entries.items() if entry[1] == tool_name
+            ]:
+                del self.entries[cache_key]
+            if self.persistent_store is not None:
+                self.persistent_store.delete(tool_name=tool_name)
+        else:
+            self.entries.clear()
+            if self.persistent_store is not None:
+                self.persistent_store.delete()
+        logger.info(f"Invalidated cached results of {tool_name or 'all tools'}")
+
+    def close(self):
+        if self.persistent_store is not None:
+            self.persistent_store.close()
+
+    def _put_entry(self, cache_key: str, entry: tuple[float, str, Any]):
+        self.entries[cache_key] = entry
+        self.entries.move_to_end(cache_key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
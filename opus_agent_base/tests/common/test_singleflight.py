@@ -0,0 +1,103 @@
+import asyncio
+
+import pytest
+from opus_agent_base.common.singleflight import SingleFlight
+
+
+class TestSingleFlight:
+    def test_concurrent_identical_calls_share_one_call(self):
+        calls = []
+
+        async def fetch():
+            calls.append("fetch")
+            await asyncio.sleep(0.01)
+            return {"events": 3}
+
+        async def main():
+            singleflight = SingleFlight()
+            results = await asyncio.gather(
+                *(singleflight.run("key", fetch) for _ in range(5))
+            )
+            return singleflight, results
+
+        singleflight, results = asyncio.run(main())
+
+        assert calls == ["fetch"]
+        assert results == [{"events": 3}] * 5
+        assert singleflight.in_flight == {}
+
+    def test_different_keys_are_not_coalesced(self):
+        calls = []
+
+        def fetch(key):
+            async def call():
+                calls.append(key)
+                await asyncio.sleep(0.01)
+                return key
+
+            return call
+
+        async def main():
+            singleflight = SingleFlight()
+            return await asyncio.gather(
+                singleflight.run("a", fetch("a")), singleflight.run("b", fetch("b"))
+            )
+
+        assert asyncio.run(main()) == ["a", "b"]
+        assert sorted(calls) == ["a", "b"]
+
+    def test_sequential_calls_are_not_cached(self):
+        calls = []
+
+        async def fetch():
+            calls.append("fetch")
+            return len(calls)
+
+        async def main():
+            singleflight = SingleFlight()
+            return [
+                await singleflight.run("key", fetch),
+                await singleflight.run("key", fetch),
+            ]
+
+        assert asyncio.run(main()) == [1, 2]
+
+    def test_exception_is_shared_and_key_is_released(self):
+        calls = []
+
+        async def fail():
+            calls.append("fail")
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        async def main():
+            singleflight = SingleFlight()
+            results = await asyncio.gather(
+                singleflight.run("key", fail),
+                singleflight.run("key", fail),
+                return_exceptions=True,
+            )
+            return singleflight, results
+
+        singleflight, results = asyncio.run(main())
+
+        assert calls == ["fail"]
+        assert all(isinstance(result, ValueError) for result in results)
+        assert singleflight.in_flight == {}
+
+    def test_cancelled_caller_does_not_cancel_shared_call(self):
+        async def fetch():
+            await asyncio.sleep(0.02)
+            return "result"
+
+        async def main():
+            singleflight = SingleFlight()
+            first = asyncio.ensure_future(singleflight.run("key", fetch))
+            second = asyncio.ensure_future(singleflight.run("key", fetch))
+            await asyncio.sleep(0)
+            first.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await first
+            return await second
+
+        assert asyncio.run(main()) == "result"
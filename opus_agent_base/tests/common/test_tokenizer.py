@@ -0,0 +1,72 @@
+import pytest
+from opus_agent_base.common.tokenizer import DEFAULT_ENCODING, Tokenizer
+
+
+class WordEncoding:
+    """Encoding with one token per word, so tests don't need to download encodings"""
+
+    def __init__(self):
+        self.encoded_texts = []
+
+    def encode(self, text, **kwargs):
+        assert kwargs == {"disallowed_special": ()}
+        self.encoded_texts.append(text)
+        return text.split()
+
+    def decode(self, tokens):
+        return " ".join(tokens)
+
+
+@pytest.fixture
+def encoding():
+    return WordEncoding()
+
+
+@pytest.fixture
+def tokenizer(encoding):
+    tokenizer = Tokenizer(max_cached_counts=2)
+    tokenizer.encodings[DEFAULT_ENCODING] = encoding
+    return tokenizer
+
+
+class TestTokenizer:
+    def test_count_tokens_is_memoized(self, tokenizer, encoding):
+        assert tokenizer.count_tokens("one two three") == 3
+        assert tokenizer.count_tokens("one two three") == 3
+        assert encoding.encoded_texts == ["one two three"]
+
+    def test_memoized_counts_are_bounded(self, tokenizer, encoding):
+        for text in ("a", "a b", "a b c", "a"):
+            tokenizer.count_tokens(text)
+        # "a" was evicted by "a b c" and encoded again
+        assert encoding.encoded_texts == ["a", "a b", "a b c", "a"]
+        assert len(tokenizer.counts) == 2
+
+    def test_fits_short_text_without_encoding(self, tokenizer, encoding):
+        assert tokenizer.fits("short text", 10)
+        assert encoding.encoded_texts == []
+
+    def test_fits_long_text_by_token_count(self, tokenizer, encoding):
+        text = "word " * 10
+        assert tokenizer.fits(text, 10)
+        assert not tokenizer.fits(text, 9)
+        assert encoding.encoded_texts == [text]
+
+    def test_fits_counts_utf8_bytes_in_fast_path(self, tokenizer, encoding):
+        # 3 characters, but 9 UTF-8 bytes, so the fast path can't tell
+        assert tokenizer.fits("äöü", 3)
+        assert encoding.encoded_texts == ["äöü"]
+
+    def test_truncate_keeps_text_that_fits(self, tokenizer, encoding):
+        text = "one two three"
+        assert tokenizer.truncate(text, 20) is text
+        assert encoding.encoded_texts == []
+
+    def test_truncate_to_max_tokens(self, tokenizer):
+        truncated_text = tokenizer.truncate("one two three four five six", 4)
+
+        assert truncated_text == "one two three four"
+
+    def test_count_tokens_approx(self):
+        assert Tokenizer.count_tokens_approx("") == 0
+        assert Tokenizer.count_tokens_approx("abcde") == 2
@@ -0,0 +1,54 @@
+from opus_agent_base.config.config_change_event import (
+    ConfigChangeEvent,
+    ConfigChangeType,
+    get_config_changes,
+)
+
+
+class TestGetConfigChanges:
+    def test_unchanged_settings(self):
+        settings = {"chat.slack.enabled": True, "model_config.provider": "openai"}
+        assert get_config_changes(settings, dict(settings)) == []
+
+    def test_added_modified_and_removed_settings(self):
+        old_settings = {"a.kept": 1, "a.modified": "old", "a.removed": [1]}
+        new_settings = {"a.kept": 1, "a.modified": "new", "a.added": {"x": 1}}
+
+        changes = {
+            change.key: change
+            for change in get_config_changes(old_settings, new_settings)
+        }
+
+        assert changes == {
+            "a.modified": ConfigChangeEvent(
+                "a.modified", ConfigChangeType.MODIFIED, "old", "new"
+            ),
+            "a.added": ConfigChangeEvent(
+                "a.added", ConfigChangeType.ADDED, None, {"x": 1}
+            ),
+            "a.removed": ConfigChangeEvent(
+                "a.removed", ConfigChangeType.REMOVED, [1], None
+            ),
+        }
+
+    def test_changed_list_value(self):
+        changes = get_config_changes({"a.items": [1, 2]}, {"a.items": [1, 2, 3]})
+        assert changes == [
+            ConfigChangeEvent("a.items", ConfigChangeType.MODIFIED, [1, 2], [1, 2, 3])
+        ]
+
+
+class TestConfigChangeEventMatches:
+    def test_matches_key_and_keys_below_prefix(self):
+        change = ConfigChangeEvent(
+            "chat.slack.team_to_channels", ConfigChangeType.MODIFIED
+        )
+        assert change.matches("chat.slack.team_to_channels")
+        assert change.matches("chat.slack")
+        assert change.matches("chat")
+        assert change.matches("")
+
+    def test_does_not_match_sibling_with_same_prefix(self):
+        change = ConfigChangeEvent("chat.slackbot.enabled", ConfigChangeType.ADDED)
+        assert not change.matches("chat.slack")
+        assert not change.matches("chat.slackbot.enabled.extra")
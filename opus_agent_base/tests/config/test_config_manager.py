@@ -0,0 +1,104 @@
+import os
+
+import pytest
+from opus_agent_base.config.config_change_event import ConfigChangeType
+from opus_agent_base.config.config_manager import ConfigManager
+
+
+@pytest.fixture
+def config_manager(tmp_path):
+    (tmp_path / "opus-config.yml").write_text(
+        "mcp_config:\n  general:\n    filesystem:\n      enabled: true\n"
+        "chat:\n  slack:\n    enabled: false\n"
+    )
+    config_manager = ConfigManager(str(tmp_path), "opus-config.yml")
+    config_manager.get_snapshot()
+    return config_manager
+
+
+@pytest.fixture
+def changes(config_manager):
+    changes = []
+    config_manager.subscribe("", changes.extend)
+    return changes
+
+
+def write_config(config_manager: ConfigManager, text: str):
+    config_manager.config_file.write_text(text)
+    # mtime resolution of some file systems is too coarse to notice a quick rewrite
+    stat = os.stat(config_manager.config_file)
+    os.utime(
+        config_manager.config_file,
+        ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000),
+    )
+
+
+class TestConfigManagerReload:
+    def test_reload_publishes_changes(self, config_manager, changes):
+        write_config(
+            config_manager,
+            "mcp_config:\n  general:\n    filesystem:\n      enabled: true\n"
+            "chat:\n  slack:\n    enabled: true\n",
+        )
+
+        config_manager.get_snapshot()
+
+        assert [(change.key, change.change_type) for change in changes] == [
+            ("chat.slack.enabled", ConfigChangeType.MODIFIED)
+        ]
+        assert config_manager.get_setting("chat.slack.enabled") is True
+
+    @pytest.mark.parametrize(
+        "invalid_config",
+        [
+            "mcp_config:\n  general: [\n",
+            "mcp_config: {general: ",
+            "- not\n- a mapping\n",
+        ],
+    )
+    def test_invalid_config_keeps_last_loaded_config(
+        self, config_manager, changes, invalid_config
+    ):
+        write_config(config_manager, invalid_config)
+
+        config_manager.get_snapshot()
+
+        assert changes == []
+        assert (
+            config_manager.get_setting("mcp_config.general.filesystem.enabled") is True
+        )
+
+    def test_invalid_config_is_not_parsed_again_until_it_changes(
+        self, config_manager, changes, monkeypatch
+    ):
+        write_config(config_manager, "mcp_config: [\n")
+        config_manager.get_snapshot()
+        reads = []
+        read_config_file = config_manager._read_config_file
+        monkeypatch.setattr(
+            config_manager,
+            "_read_config_file",
+            lambda: reads.append(1) or read_config_file(),
+        )
+
+        config_manager.get_snapshot()
+        assert reads == []
+
+        write_config(config_manager, "chat:\n  slack:\n    enabled: true\n")
+        config_manager.get_snapshot()
+
+        assert reads == [1]
+        assert sorted((change.key, change.change_type) for change in changes) == [
+            ("chat.slack.enabled", ConfigChangeType.MODIFIED),
+            ("mcp_config.general.filesystem.enabled", ConfigChangeType.REMOVED),
+        ]
+
+    def test_deleted_config_file_keeps_last_loaded_config(
+        self, config_manager, changes
+    ):
+        config_manager.config_file.unlink()
+
+        config_manager.get_snapshot()
+
+        assert changes == []
+        assert config_manager.get_setting("chat.slack.enabled") is False
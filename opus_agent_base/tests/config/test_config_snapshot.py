@@ -0,0 +1,99 @@
+import pytest
+from opus_agent_base.config.config_manager import ConfigManager
+from opus_agent_base.config.config_snapshot import ConfigSnapshot
+
+CONFIG = {
+    "todoist": {"api_key": "key", "projects": ["Inbox", "Work"]},
+    "chat": {"slack": {"enabled": False, "channel": None}},
+}
+
+
+@pytest.fixture
+def snapshot():
+    return ConfigSnapshot(CONFIG, (1, 2, 3))
+
+
+class TestConfigSnapshot:
+    @pytest.mark.parametrize(
+        "key, value",
+        [
+            ("todoist.api_key", "key"),
+            ("chat.slack.enabled", False),
+            ("todoist.projects", ["Inbox", "Work"]),
+            ("chat.slack", {"enabled": False, "channel": None}),
+        ],
+    )
+    def test_leaves_and_subtrees_are_looked_up_by_dotted_key(
+        self, snapshot, key, value
+    ):
+        assert snapshot.get(key) == value
+
+    @pytest.mark.parametrize(
+        "key", ["todoist.missing", "missing.api_key", "todoist.api_key.x", ""]
+    )
+    def test_missing_key_returns_default(self, snapshot, key):
+        assert snapshot.get(key, "default") == "default"
+
+    def test_null_value_is_returned_instead_of_default(self, snapshot):
+        assert snapshot.get("chat.slack.channel", "default") is None
+
+    def test_subtrees_are_copies(self, snapshot):
+        snapshot.get("chat.slack")["enabled"] = True
+        snapshot.get("todoist.projects").append("Home")
+        snapshot.get_config()["todoist"]["api_key"] = "other"
+
+        assert snapshot.get("chat.slack.enabled") is False
+        assert snapshot.get("todoist.projects") == ["Inbox", "Work"]
+        assert snapshot.get("todoist.api_key") == "key"
+
+    def test_flattened_settings_contain_leaves_only(self, snapshot):
+        assert snapshot.flattened_settings == {
+            "todoist.api_key": "key",
+            "todoist.projects": ["Inbox", "Work"],
+            "chat.slack.enabled": False,
+            "chat.slack.channel": None,
+        }
+
+    def test_with_file_stamp_keeps_settings(self, snapshot):
+        restamped_snapshot = snapshot.with_file_stamp((4, 5, 6))
+
+        assert restamped_snapshot.file_stamp == (4, 5, 6)
+        assert snapshot.file_stamp == (1, 2, 3)
+        assert restamped_snapshot.get("todoist.api_key") == "key"
+
+
+class TestConfigManagerLookups:
+    @pytest.fixture
+    def config_manager(self, tmp_path):
+        (tmp_path / "opus-config.yml").write_text(
+            "todoist:\n  api_key: key\nchat:\n  slack:\n    enabled: false\n"
+        )
+        return ConfigManager(str(tmp_path), "opus-config.yml")
+
+    def test_unchanged_file_is_parsed_once(self, config_manager, monkeypatch):
+        reads = []
+        read_config_file = config_manager._read_config_file
+        monkeypatch.setattr(
+            config_manager,
+            "_read_config_file",
+            lambda: reads.append(1) or read_config_file(),
+        )
+
+        for _ in range(3):
+            assert config_manager.get_setting("todoist.api_key") == "key"
+            assert config_manager.get_setting("chat.slack") == {"enabled": False}
+
+        assert reads == [1]
+
+    def test_set_setting_is_visible_without_reloading(self, config_manager):
+        config_manager.set_setting("chat.slack.enabled", True)
+        config_manager.set_setting("notes.obsidian.enabled", True)
+
+        assert config_manager.get_setting("chat.slack.enabled") is True
+        assert config_manager.get_setting("notes.obsidian") == {"enabled": True}
+
+    def test_delete_setting_removes_subtree(self, config_manager):
+        assert config_manager.delete_setting("chat.slack")
+
+        assert config_manager.get_setting("chat.slack.enabled", "default") == "default"
+        assert config_manager.get_setting("chat") == {}
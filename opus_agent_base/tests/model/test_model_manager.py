@@ -0,0 +1,77 @@
+import pytest
+from opus_agent_base.model.model_manager import ModelManager
+
+MODELS_CONFIG = [
+    {"provider": "openai", "model": "gpt-4o", "enabled": False},
+    {"provider": "openai", "model": "gpt-5", "enabled": True},
+]
+
+
+class FakeConfigManager:
+    def __init__(self, settings: dict):
+        self.settings = settings
+        self.subscribers = []
+
+    def get_setting(self, key, default=None):
+        return self.settings.get(key, default)
+
+    def subscribe(self, prefix, callback):
+        self.subscribers.append((prefix, callback))
+
+
+@pytest.fixture
+def config_manager(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    return FakeConfigManager({"model_config": MODELS_CONFIG})
+
+
+@pytest.fixture
+def model_manager(config_manager):
+    return ModelManager(config_manager)
+
+
+class TestModelManagerConfigChanges:
+    def test_switches_to_new_enabled_model(self, model_manager, config_manager):
+        config_manager.settings["model_config"] = [
+            {"provider": "openai", "model": "gpt-4o", "enabled": True},
+        ]
+
+        model_manager.on_model_config_changed([])
+
+        assert model_manager.get_model().model_name == "gpt-4o"
+        assert model_manager.get_enabled_models() == ["gpt-4o"]
+
+    @pytest.mark.parametrize(
+        "models_config",
+        [
+            None,
+            {"provider": "openai"},
+            [{"provider": "openai", "model": "gpt-4o"}],
+            [{"provider": "openai", "model": "gpt-5", "enabled": False}],
+            [{"provider": "ollama", "model": "qwen3", "enabled": True}],
+        ],
+    )
+    def test_invalid_config_keeps_current_model(
+        self, model_manager, config_manager, models_config
+    ):
+        model = model_manager.get_model()
+        config_manager.settings["model_config"] = models_config
+
+        model_manager.on_model_config_changed([])
+
+        assert model_manager.get_model() is model
+        assert model_manager.get_enabled_models() == ["gpt-5"]
+
+    def test_failing_model_initialization_keeps_current_model(
+        self, model_manager, config_manager, monkeypatch
+    ):
+        model = model_manager.get_model()
+        config_manager.settings["model_config"] = [
+            {"provider": "anthropic", "model": "claude-sonnet-4-5", "enabled": True},
+        ]
+        monkeypatch.delenv("ANTHROPIC_API_KEY", raising=False)
+
+        model_manager.on_model_config_changed([])
+
+        assert model_manager.get_model() is model
+        assert model_manager.get_enabled_models() == ["gpt-5"]
@@ -0,0 +1,106 @@
+import asyncio
+
+import pytest
+from fastmcp.exceptions import ToolError
+from mcp.types import Tool as MCPTool
+from opus_agent_base.tools.mcp_client_router import MCPClientRouter
+
+
+class FakeClient:
+    def __init__(
+        self, server_name: str, tool_names: list[str], release: asyncio.Event = None
+    ):
+        self.server_name = server_name
+        self.tool_names = tool_names
+        # calls wait for the event to be set, to simulate a slow server
+        self.release = release
+
+    async def call_tool(self, tool_name, arguments):
+        if self.release is not None:
+            await self.release.wait()
+        return (self.server_name, tool_name, arguments)
+
+    async def list_tools(self):
+        return [
+            MCPTool(name=tool_name, inputSchema={"type": "object"})
+            for tool_name in self.tool_names
+        ]
+
+
+class FakeSession:
+    def __init__(self, name: str, client: FakeClient):
+        self.name = name
+        self.client = client
+
+    async def run(self, func):
+        return await func(self.client)
+
+
+def create_router(release: asyncio.Event = None) -> MCPClientRouter:
+    return MCPClientRouter(
+        {
+            "google": FakeSession("google", FakeClient("google", ["search"])),
+            "google_calendar": FakeSession(
+                "google_calendar",
+                FakeClient("google_calendar", ["get_events"], release),
+            ),
+            "todoist": FakeSession("todoist", FakeClient("todoist", ["add_task"])),
+        }
+    )
+
+
+class TestMCPClientRouter:
+    @pytest.mark.parametrize(
+        "tool_name, server_name, server_tool_name",
+        [
+            ("google_search", "google", "search"),
+            ("google_calendar_get_events", "google_calendar", "get_events"),
+            ("todoist_add_task", "todoist", "add_task"),
+        ],
+    )
+    def test_routes_by_longest_server_prefix(
+        self, tool_name, server_name, server_tool_name
+    ):
+        mcp_session, routed_tool_name = create_router().get_session_for_tool(tool_name)
+
+        assert mcp_session.name == server_name
+        assert routed_tool_name == server_tool_name
+
+    def test_unknown_prefix_raises_tool_error(self):
+        with pytest.raises(ToolError):
+            create_router().get_session_for_tool("notion_search")
+
+    def test_call_tool_strips_prefix(self):
+        result = asyncio.run(
+            create_router().call_tool("todoist_add_task", {"content": "x"})
+        )
+
+        assert result == ("todoist", "add_task", {"content": "x"})
+
+    def test_list_tools_prefixes_tool_names(self):
+        tools = asyncio.run(create_router().list_tools())
+
+        assert sorted(tool.name for tool in tools) == [
+            "google_calendar_get_events",
+            "google_search",
+            "todoist_add_task",
+        ]
+
+    def test_slow_server_does_not_block_other_servers(self):
+        async def main():
+            release = asyncio.Event()
+            router = create_router(release)
+            slow_call = asyncio.create_task(
+                router.call_tool("google_calendar_get_events")
+            )
+
+            result = await asyncio.wait_for(
+                router.call_tool("todoist_add_task"), timeout=1
+            )
+
+            assert result == ("todoist", "add_task", {})
+            assert not slow_call.done()
+            release.set()
+            assert await slow_call == ("google_calendar", "get_events", {})
+
+        asyncio.run(main())
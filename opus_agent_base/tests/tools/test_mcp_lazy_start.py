@@ -0,0 +1,183 @@
+import asyncio
+
+import pytest
+from mcp.types import Tool as MCPTool
+from opus_agent_base.tools import mcp_session
+from opus_agent_base.tools.fastmcp_server_config import FastMCPServerConfig
+from opus_agent_base.tools.mcp_manager import MCPManager
+from opus_agent_base.tools.mcp_session import MCPSession
+
+
+class FakeConfigManager:
+    def __init__(self, config_dir, settings: dict):
+        self.config_dir = config_dir
+        self.settings = settings
+
+    def get_setting(self, key, default=None):
+        return self.settings.get(key, default)
+
+    def subscribe(self, prefix, callback):
+        pass
+
+
+class FakeClient:
+    """FastMCP client of a server with a single tool, records the started servers"""
+
+    started = []
+
+    def __init__(self, config: dict):
+        self.server_name = next(iter(config["mcpServers"]))
+        self.connected = False
+
+    async def __aenter__(self):
+        FakeClient.started.append(self.server_name)
+        self.connected = True
+        return self
+
+    def is_connected(self):
+        return self.connected
+
+    async def ping(self):
+        return True
+
+    async def close(self):
+        self.connected = False
+
+    async def list_tools(self):
+        return [MCPTool(name="get_events", inputSchema={"type": "object"})]
+
+    async def call_tool(self, tool_name, arguments):
+        return f"{self.server_name}:{tool_name}"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def fake_client(monkeypatch):
+    FakeClient.started = []
+    monkeypatch.setattr(mcp_session, "Client", FakeClient)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(mcp_session.time, "monotonic", clock.monotonic)
+    return clock
+
+
+def create_mcp_manager(tmp_path) -> MCPManager:
+    config_manager = FakeConfigManager(
+        tmp_path,
+        {
+            "mcp_config.productivity.calendar.enabled": True,
+            "mcp_config.productivity.calendar.lazy": True,
+        },
+    )
+    mcp_manager = MCPManager.__wrapped__(config_manager)
+    mcp_manager.add_mcp_servers(
+        [
+            FastMCPServerConfig(
+                "calendar", "productivity.calendar", {"command": "calendar-mcp"}
+            )
+        ]
+    )
+    return mcp_manager
+
+
+class TestLazyStart:
+    def test_lazy_server_without_cached_tools_is_stopped_after_discovery(
+        self, tmp_path
+    ):
+        mcp_manager = create_mcp_manager(tmp_path)
+
+        async def main():
+            await mcp_manager.initialize_fastmcp_client_context()
+            tools = await mcp_manager.start_mcp_server("calendar")
+            assert [tool.name for tool in tools] == ["calendar_get_events"]
+            assert not mcp_manager.mcp_sessions["calendar"].is_connected()
+            await mcp_manager.close()
+
+        asyncio.run(main())
+
+        assert FakeClient.started == ["calendar"]
+
+    def test_lazy_server_with_cached_tools_starts_on_first_tool_call(self, tmp_path):
+        asyncio.run(self._discover_tools(tmp_path))
+        FakeClient.started = []
+        mcp_manager = create_mcp_manager(tmp_path)
+
+        async def main():
+            fastmcp_client_context = (
+                await mcp_manager.initialize_fastmcp_client_context()
+            )
+            tools = await mcp_manager.start_mcp_server("calendar")
+            assert [tool.name for tool in tools] == ["calendar_get_events"]
+            await asyncio.sleep(0)
+            assert FakeClient.started == []
+
+            result = await fastmcp_client_context.mcp_client_router.call_tool(
+                "calendar_get_events"
+            )
+
+            assert result == "calendar:get_events"
+            assert FakeClient.started == ["calendar"]
+            await mcp_manager.close()
+
+        asyncio.run(main())
+
+    async def _discover_tools(self, tmp_path):
+        mcp_manager = create_mcp_manager(tmp_path)
+        await mcp_manager.initialize_fastmcp_client_context()
+        await mcp_manager.start_mcp_server("calendar")
+        await mcp_manager.close()
+
+
+class TestIdleStop:
+    def test_idle_session_is_closed_and_reopened_on_next_call(self, clock):
+        session = MCPSession("calendar", {"mcpServers": {"calendar": {}}})
+
+        async def main():
+            await session.run(lambda client: client.call_tool("get_events", {}))
+            clock.now += 599
+            assert not await session.close_if_idle(600)
+            assert session.is_connected()
+
+            clock.now += 1
+            assert await session.close_if_idle(600)
+            assert not session.is_connected()
+
+            assert (
+                await session.run(lambda client: client.call_tool("get_events", {}))
+                == "calendar:get_events"
+            )
+
+        asyncio.run(main())
+
+        assert FakeClient.started == ["calendar", "calendar"]
+
+    def test_session_with_call_in_flight_is_not_closed(self, clock):
+        session = MCPSession("calendar", {"mcpServers": {"calendar": {}}})
+
+        async def main():
+            release = asyncio.Event()
+
+            async def slow_call(client):
+                await release.wait()
+                return await client.call_tool("get_events", {})
+
+            call = asyncio.create_task(session.run(slow_call))
+            await asyncio.sleep(0)
+            clock.now += 3600
+
+            assert not await session.close_if_idle(600)
+            release.set()
+            await call
+            assert session.is_connected()
+
+        asyncio.run(main())
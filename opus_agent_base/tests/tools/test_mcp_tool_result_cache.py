@@ -0,0 +1,121 @@
+from pathlib import Path
+
+import pytest
+from opus_agent_base.tools import mcp_tool_result_cache
+from opus_agent_base.tools.mcp_tool_result_cache import (
+    MCPToolResultCache,
+    get_tool_call_key,
+)
+
+
+class FakeConfigManager:
+    def __init__(self, config_dir: Path, settings: dict):
+        self.config_dir = config_dir
+        self.settings = settings
+
+    def get_setting(self, key, default=None):
+        return self.settings.get(key, default)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(mcp_tool_result_cache.time, "time", clock.time)
+    return clock
+
+
+def create_cache(tmp_path, **settings) -> MCPToolResultCache:
+    settings = {
+        "mcp_config.result_cache.ttl_seconds": {
+            "calendar_get_events": 300,
+            "notion_search": 60,
+        },
+        **settings,
+    }
+    return MCPToolResultCache(FakeConfigManager(tmp_path, settings))
+
+
+class TestGetToolCallKey:
+    def test_key_is_independent_of_kwargs_order(self):
+        key = get_tool_call_key("tool", {"a": 1, "b": {"c": 2, "d": 3}})
+        assert key == get_tool_call_key("tool", {"b": {"d": 3, "c": 2}, "a": 1})
+
+    def test_key_depends_on_tool_and_kwargs(self):
+        key = get_tool_call_key("tool", {"a": 1})
+        assert key != get_tool_call_key("other_tool", {"a": 1})
+        assert key != get_tool_call_key("tool", {"a": 2})
+
+    def test_no_kwargs(self):
+        assert get_tool_call_key("tool", None) == get_tool_call_key("tool", {})
+
+
+class TestMCPToolResultCache:
+    def test_caches_only_tools_with_ttl(self, tmp_path, clock):
+        cache = create_cache(tmp_path)
+        cache.put("calendar_get_events", {"day": "today"}, ["standup"])
+        cache.put("todoist_add_task", {"content": "x"}, "added")
+
+        assert cache.get("calendar_get_events", {"day": "today"}) == ["standup"]
+        assert cache.get("calendar_get_events", {"day": "tomorrow"}) is None
+        assert cache.get("todoist_add_task", {"content": "x"}) is None
+
+    def test_entries_expire_after_ttl(self, tmp_path, clock):
+        cache = create_cache(tmp_path)
+        cache.put("notion_search", {"query": "roadmap"}, "page")
+
+        clock.now += 60
+        assert cache.get("notion_search", {"query": "roadmap"}) == "page"
+        clock.now += 1
+        assert cache.get("notion_search", {"query": "roadmap"}) is None
+        assert cache.entries == {}
+
+    def test_least_recently_used_entry_is_evicted(self, tmp_path, clock):
+        cache = create_cache(tmp_path, **{"mcp_config.result_cache.max_entries": 2})
+        cache.put("notion_search", {"query": "a"}, "a")
+        cache.put("notion_search", {"query": "b"}, "b")
+        # "a" becomes the most recently used entry
+        assert cache.get("notion_search", {"query": "a"}) == "a"
+        cache.put("notion_search", {"query": "c"}, "c")
+
+        assert cache.get("notion_search", {"query": "a"}) == "a"
+        assert cache.get("notion_search", {"query": "b"}) is None
+        assert cache.get("notion_search", {"query": "c"}) == "c"
+
+    def test_invalidate(self, tmp_path, clock):
+        cache = create_cache(tmp_path)
+        cache.put("notion_search", {"query": "a"}, "a")
+        cache.put("notion_search", {"query": "b"}, "b")
+        cache.put("calendar_get_events", {}, [])
+
+        cache.invalidate("notion_search", {"query": "a"})
+        assert cache.get("notion_search", {"query": "a"}) is None
+        assert cache.get("notion_search", {"query": "b"}) == "b"
+
+        cache.invalidate("notion_search")
+        assert cache.get("notion_search", {"query": "b"}) is None
+        assert cache.get("calendar_get_events", {}) == []
+
+        cache.invalidate()
+        assert cache.entries == {}
+
+    def test_persistent_entries_survive_restart(self, tmp_path, clock):
+        settings = {"mcp_config.result_cache.persistent": True}
+        cache = create_cache(tmp_path, **settings)
+        cache.put("calendar_get_events", {"day": "today"}, ["standup"])
+        cache.close()
+
+        cache = create_cache(tmp_path, **settings)
+        assert cache.get("calendar_get_events", {"day": "today"}) == ["standup"]
+        clock.now += 301
+        assert cache.get("calendar_get_events", {"day": "today"}) is None
+        cache.close()
+
+        assert (tmp_path / "cache" / "mcp_tool_results.db").exists()
@@ -2,15 +2,22 @@
 Opus TODO Agent - Productivity and TODO management agent.
 """
 
-import asyncio
-from opus_agent_base.cli.cli import create_cli_app
-from opus_todo_agent.todo_agent_runner import run_todo_agent
-
 __version__ = "0.1.0"
 
 
+def __getattr__(name):
+    # Lazy import, so that importing the package does not load the agent stack
+    if name == "run_todo_agent":
+        from opus_todo_agent.todo_agent_runner import run_todo_agent
+
+        return run_todo_agent
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 def main() -> None:
     """Entry point for opus-todo-agent CLI."""
+    from opus_agent_base.cli.cli import create_cli_app
+
     app = create_cli_app(
         agent_name="Opus TODO Agent",
         agent_description="Productivity and TODO Agent for Opus AI",
@@ -1,11 +1,22 @@
-import hashlib
-import chromadb
-import uuid
-import os
 import logging
+import os
 import sys
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from dataclasses import replace
+
 from opus_agent_base.config.config_manager import ConfigManager
-import re
+from opus_todo_agent.helper.notes.chroma_clients import get_chroma_client
+from opus_todo_agent.helper.notes.embedding_providers import (
+    get_collection_embedding_model,
+    get_embedding_provider,
+)
+from opus_todo_agent.helper.notes.markdown_chunker import MarkdownChunker
+from opus_todo_agent.helper.notes.note_file_matcher import NoteFileMatcher
+from opus_todo_agent.helper.notes.note_ingest_pipeline import NoteIngestPipeline
+from opus_todo_agent.helper.notes.obsidian_index_manifest import ObsidianIndexManifest
+from opus_todo_agent.helper.notes.obsidian_lexical_index import ObsidianLexicalIndex
+from opus_todo_agent.models.notes.obsidian_models import NoteChunk, NoteManifestEntry
 
 logger = logging.getLogger(__name__)
 
@@ -14,6 +25,15 @@ class ObsidianIndexer:
     """
     Index your obsidian notes into a vector database.
     Input: vault name and vault config. Vault config includes path to the vault and settings.
+
+    Notes are streamed from the vault, split into heading-aware chunks and upserted in
+    batches, with the embeddings of each batch computed by the vault's embedding
+    provider.
+    A local manifest of indexed notes (mtime, size, content hash, chunk ids) is kept
+    next to the vector db, so a reindex only reads changed notes and removes chunks of
+    deleted notes.
+    Notes are read, hashed and chunked in parallel by a pool of ingest workers.
+    Chunks are also kept in a local BM25 lexical index for hybrid retrieval.
     """
 
     def __init__(self, config_manager, obsidian_vault_name):
@@ -33,122 +53,351 @@ class ObsidianIndexer:
         assert (
             self.vault_config is not None
         ), f"Vault config not found for {self.obsidian_vault_name}"
-        logging.info(f"Vault config: {self.vault_config}")
-        print(f"Vault config: {self.vault_config}")
+        logger.debug(f"Vault config: {self.vault_config}")
+        self.chunker = MarkdownChunker(
+            self.vault_config.get("chunk_size", 1000),
+            self.vault_config.get("chunk_overlap", 100),
+        )
+        self.note_file_matcher = NoteFileMatcher(
+            self.vault_config.get("exclude_dirs", []),
+            self.vault_config.get("exclude_files", []),
+        )
+        self.ingest_pipeline = NoteIngestPipeline(
+            self.chunker.chunk_size,
+            self.chunker.chunk_overlap,
+            workers=self.vault_config.get("ingest_workers"),
+            executor_type=self.vault_config.get("ingest_executor", "process"),
+            queue_size=self.vault_config.get("ingest_queue_size", 256),
+        )
         self._init_vector_db()
 
     def _init_vector_db(self):
         vector_db_path = self.vault_config.get("vector_db_path")
         vector_db_collection = self.vault_config.get("vector_db_collection")
         # init chroma client
-        self.client = chromadb.PersistentClient(path=vector_db_path)
+        self.client = get_chroma_client(vector_db_path)
         # init collection
         self.collection = self.client.get_or_create_collection(vector_db_collection)
+        # shared with the RAG of the vault, which embeds queries with the same model
+        self.embedding_function = get_embedding_provider(
+            self.vault_config.get("embedding")
+        )
+        self._check_embedding_model()
+        self.batch_size = min(
+            self.vault_config.get("index_batch_size", 256),
+            self.client.get_max_batch_size(),
+        )
+        manifest_path = self.vault_config.get(
+            "manifest_path",
+            ObsidianIndexManifest.get_default_path(
+                vector_db_path, vector_db_collection
+            ),
+        )
+        self.manifest = ObsidianIndexManifest(manifest_path)
+        lexical_index_path = self.vault_config.get(
+            "lexical_index_path",
+            ObsidianLexicalIndex.get_default_path(vector_db_path, vector_db_collection),
+        )
+        self.lexical_index = ObsidianLexicalIndex(lexical_index_path)
+
+    def _check_embedding_model(self) -> bool:
+        """
+        Check that the collection is embedded with the configured model.
+        Returns False if the collection has to be recreated by a full reindex.
+        """
+        model_id = get_collection_embedding_model(self.collection)
+        if self.collection.count() == 0 or model_id is None:
+            self.collection.modify(
+                metadata={"embedding_model": self.embedding_function.model_id}
+            )
+            return True
+        if model_id != self.embedding_function.model_id:
+            logger.warning(
+                f"Collection {self.collection.name} is embedded with {model_id}, "
+                f"not {self.embedding_function.model_id}. "
+                "The vault is reindexed on the next update"
+            )
+            return False
+        return True
 
     def create_index(self):
-        obsidian_vault_path = self.vault_config.get("vault_path")
-        exclude_dirs = [
-            re.compile(pattern) for pattern in self.vault_config.get("exclude_dirs", [])
+        """
+        Index all notes of the vault
+        """
+        if not self._check_embedding_model():
+            # vectors of another model can't be updated in place
+            name = self.collection.name
+            self.client.delete_collection(name)
+            self.collection = self.client.create_collection(
+                name, metadata={"embedding_model": self.embedding_function.model_id}
+            )
+        self.index_notes(force=True)
+
+    def update_index(self):
+        """
+        Index new and changed notes of the vault and remove deleted notes
+        """
+        if not self._check_embedding_model():
+            self.create_index()
+            return
+        self.index_notes(force=False)
+
+    def index_files(self, file_paths: list[str]):
+        """
+        Index the given notes only, e.g. notes reported changed, created or deleted by a
+        file watcher
+        """
+        note_file_paths = [
+            file_path for file_path in file_paths if self.is_note_file(file_path)
         ]
-        # find all md files in the obsidian vault recursively
-        md_files = []
-        for root, dirs, files in os.walk(obsidian_vault_path):
-            for file in files:
-                if file.endswith(".md"):
-                    file_path = os.path.join(root, file)
-                    if any(
-                        re.search(exclude_dir, file_path) != None
-                        for exclude_dir in exclude_dirs
-                    ):
-                        continue
-                    md_files.append(file_path)
-        # read md files
-        count = 0
-        max_count = 1000
-        for md_file_path in md_files:
-            with open(md_file_path, "r", encoding="utf-8") as f:
-                if count < max_count:
-                    # add document to collection
-                    logger.info(f"Adding note to vector_db collection: {md_file_path}")
-                    print(f"Adding note to vector_db collection: {md_file_path}")
-                    doc_id = str(uuid.uuid4())
-                    content = f.read()
-                    metadata = {
-                        "file_path": md_file_path,
-                        "md5_hash": hashlib.md5(content.encode()).hexdigest(),
-                    }
-                    count += 1
-                    self.collection.add(
-                        ids=[doc_id],
-                        documents=[content],
-                        metadatas=[metadata],
+        self.index_notes(
+            file_paths=[
+                file_path for file_path in note_file_paths if os.path.exists(file_path)
+            ],
+            deleted_file_paths=[
+                file_path
+                for file_path in note_file_paths
+                if not os.path.exists(file_path)
+            ],
+        )
+
+    def index_notes(
+        self,
+        force: bool = False,
+        file_paths: list[str] = None,
+        deleted_file_paths: list[str] = None,
+    ):
+        """
+        Index notes of the vault, or only the given notes if file_paths is set.
+        Unless force is set, notes whose mtime and size match the manifest are skipped
+        without reading them, and notes whose content hash matches the manifest are not
+        reindexed.
+        """
+        if file_paths is None:
+            manifest_entries = self.manifest.load_all()
+        else:
+            manifest_entries = self.manifest.get_many(
+                file_paths + (deleted_file_paths or [])
+            )
+        # notes indexed before the manifest existed are only known to the vector db
+        unmanifested_chunk_ids = {}
+        if self.manifest.count() == 0 and self.collection.count() > 0:
+            unmanifested_chunk_ids = self._get_indexed_chunk_ids(file_paths)
+        if (
+            not force
+            and self.lexical_index.count() == 0
+            and self.collection.count() > 0
+        ):
+            self.backfill_lexical_index()
+        seen_file_paths = set()
+        stale_chunk_ids = []
+        updated_entries = []
+
+        def iter_notes_to_read() -> Iterator[tuple[str, str | None]]:
+            # runs in the ingest pipeline's producer thread
+            for md_file_path in (
+                self.find_note_files() if file_paths is None else file_paths
+            ):
+                seen_file_paths.add(md_file_path)
+                entry = manifest_entries.get(md_file_path)
+                if force or entry is None:
+                    yield md_file_path, None
+                    continue
+                try:
+                    stat = os.stat(md_file_path)
+                except OSError:
+                    continue
+                if (entry.mtime_ns, entry.size) != (stat.st_mtime_ns, stat.st_size):
+                    yield md_file_path, entry.content_hash
+
+        def iter_changed_chunks() -> Iterator[NoteChunk]:
+            prepared_notes = self.ingest_pipeline.run(
+                iter_notes_to_read(),
+                # starting worker processes is not worth it for a few notes
+                parallel=file_paths is None or len(file_paths) > 32,
+            )
+            for prepared_note in prepared_notes:
+                md_file_path = prepared_note.file_path
+                entry = manifest_entries.get(md_file_path)
+                if prepared_note.chunks is None:
+                    # touched but unchanged
+                    updated_entries.append(
+                        replace(
+                            entry,
+                            mtime_ns=prepared_note.mtime_ns,
+                            size=prepared_note.size,
+                        )
+                    )
+                    continue
+                if entry is not None:
+                    logger.info(f"Updating changed note: {md_file_path}")
+                    old_chunk_ids = entry.chunk_ids
+                else:
+                    old_chunk_ids = unmanifested_chunk_ids.get(md_file_path, [])
+                    if not old_chunk_ids:
+                        logger.info(f"Adding new note: {md_file_path}")
+                chunk_ids = [chunk.id for chunk in prepared_note.chunks]
+                # chunks beyond the new chunk count are not overwritten by the upsert
+                stale_chunk_ids.extend(set(old_chunk_ids) - set(chunk_ids))
+                updated_entries.append(
+                    NoteManifestEntry(
+                        md_file_path,
+                        prepared_note.mtime_ns,
+                        prepared_note.size,
+                        prepared_note.content_hash,
+                        chunk_ids,
                     )
+                )
+                yield from prepared_note.chunks
 
-    def update_index(self):
+        count = self.upsert_chunks(iter_changed_chunks())
+
+        # Remove chunks of deleted and renamed notes
+        if file_paths is None:
+            removed_file_paths = [
+                file_path
+                for file_path in manifest_entries
+                if file_path not in seen_file_paths
+            ]
+        else:
+            removed_file_paths = [
+                file_path
+                for file_path in deleted_file_paths or []
+                if file_path in manifest_entries
+            ]
+        for file_path in removed_file_paths:
+            logger.info(f"Removing deleted note: {file_path}")
+            stale_chunk_ids.extend(manifest_entries[file_path].chunk_ids)
+        self.delete_chunks(stale_chunk_ids)
+
+        self.manifest.put_many(updated_entries)
+        self.manifest.delete_many(removed_file_paths)
+        logger.info(
+            f"Indexed {count} chunks, removed {len(stale_chunk_ids)} stale chunks "
+            f"and {len(removed_file_paths)} deleted notes"
+        )
+
+    def find_note_files(self) -> Iterator[str]:
         obsidian_vault_path = self.vault_config.get("vault_path")
-        exclude_dirs = [
-            re.compile(pattern) for pattern in self.vault_config.get("exclude_dirs", [])
-        ]
         # find all md files in the obsidian vault recursively
-        md_files = []
         for root, dirs, files in os.walk(obsidian_vault_path):
+            # don't descend into excluded directories
+            dirs[:] = [
+                dir_name
+                for dir_name in dirs
+                if not self.note_file_matcher.is_excluded_dir(
+                    os.path.join(root, dir_name)
+                )
+            ]
             for file in files:
-                if file.endswith(".md"):
-                    file_path = os.path.join(root, file)
-                    if any(
-                        re.search(exclude_dir, file_path) != None
-                        for exclude_dir in exclude_dirs
-                    ):
-                        continue
-                    md_files.append(file_path)
-        # read md files
+                file_path = os.path.join(root, file)
+                if self.note_file_matcher.is_note_file(file_path):
+                    yield file_path
+
+    def is_note_file(self, file_path: str) -> bool:
+        return self.note_file_matcher.is_note_file(file_path)
+
+    def upsert_chunks(self, chunks: Iterable[NoteChunk]) -> int:
+        """
+        Upsert chunks in batches of index_batch_size
+
+        Returns:
+            Number of upserted chunks
+        """
         count = 0
-        max_count = 1000
-        for md_file_path in md_files:
-            with open(md_file_path, "r", encoding="utf-8") as f:
-                if count < max_count:
-                    # add or update document to collection
-                    logger.info(f"Indexing create/update/nop: {md_file_path}")
-                    print(f"Indexing create/update/nop: {md_file_path}")
-                    doc_id = str(uuid.uuid4())
-                    content = f.read()
-                    metadata = {
-                        "file_path": md_file_path,
-                        "md5_hash": hashlib.md5(content.encode()).hexdigest(),
-                    }
-                    count += 1
-                    # Check if document already exists by file_path
-                    existing_docs = self.collection.get(
-                        where={"file_path": md_file_path}
+        batch = []
+        for chunk in chunks:
+            batch.append(chunk)
+            if len(batch) >= self.batch_size:
+                count += self._upsert_batch(batch)
+                batch = []
+        if batch:
+            count += self._upsert_batch(batch)
+        return count
+
+    def _upsert_batch(self, batch: list[NoteChunk]) -> int:
+        logger.info(f"Upserting {len(batch)} chunks to vector_db collection")
+        embeddings = self.embedding_function([chunk.text for chunk in batch])
+        self.collection.upsert(
+            ids=[chunk.id for chunk in batch],
+            documents=[chunk.text for chunk in batch],
+            embeddings=embeddings,
+            metadatas=[chunk.metadata for chunk in batch],
+        )
+        self.lexical_index.upsert_chunks(batch)
+        logger.info(f"Upserted {len(batch)} chunks")
+        return len(batch)
+
+    def delete_chunks(self, chunk_ids: list[str]):
+        for start in range(0, len(chunk_ids), self.batch_size):
+            self.collection.delete(ids=chunk_ids[start : start + self.batch_size])
+        self.lexical_index.delete_chunks(chunk_ids)
+
+    def backfill_lexical_index(self):
+        """
+        Copy the chunks of the vector db collection into the lexical index,
+        for collections indexed before the lexical index existed
+        """
+        logger.info("Backfilling lexical index from the vector db collection")
+        count = 0
+        while True:
+            results = self.collection.get(
+                include=["documents", "metadatas"], offset=count, limit=self.batch_size
+            )
+            if not results["ids"]:
+                break
+            self.lexical_index.upsert(
+                [
+                    (
+                        chunk_id,
+                        (metadata or {}).get("file_path", ""),
+                        (metadata or {}).get("heading", ""),
+                        document,
                     )
-                    if existing_docs["ids"]:
-                        # Document exists, check if content has changed
-                        existing_metadata = existing_docs["metadatas"][0]
-                        existing_hash = existing_metadata.get("md5_hash")
-
-                        if existing_hash == metadata["md5_hash"]:
-                            # Content unchanged, skip
-                            logger.info(f"Skipping unchanged note: {md_file_path}")
-                            print(f"Skipping unchanged note: {md_file_path}")
-                        else:
-                            # Content changed, update existing document
-                            logger.info(f"Updating changed note: {md_file_path}")
-                            print(f"Updating changed note: {md_file_path}")
-                            existing_id = existing_docs["ids"][0]
-                            self.collection.upsert(
-                                ids=[existing_id],
-                                documents=[content],
-                                metadatas=[metadata],
-                            )
-                    else:
-                        # Document does not exist, add new document
-                        logger.info(f"Adding new note: {md_file_path}")
-                        print(f"Adding new note: {md_file_path}")
-                        self.collection.add(
-                            ids=[doc_id],
-                            documents=[content],
-                            metadatas=[metadata],
-                        )
+                    for chunk_id, document, metadata in zip(
+                        results["ids"],
+                        results["documents"],
+                        results["metadatas"],
+                        strict=True,
+                    )
+                ]
+            )
+            count += len(results["ids"])
+        logger.info(f"Backfilled {count} chunks into the lexical index")
+
+    def _get_indexed_chunk_ids(
+        self, file_paths: list[str] = None
+    ) -> dict[str, list[str]]:
+        """
+        Chunk ids of the given notes in the vector db, or of all notes if file_paths is
+        None, fetched in batches of index_batch_size
+        """
+        chunk_ids = defaultdict(list)
+
+        def add(results):
+            for chunk_id, metadata in zip(
+                results["ids"], results["metadatas"], strict=True
+            ):
+                chunk_ids[(metadata or {}).get("file_path", "")].append(chunk_id)
+
+        if file_paths is not None:
+            for start in range(0, len(file_paths), self.batch_size):
+                batch = file_paths[start : start + self.batch_size]
+                add(
+                    self.collection.get(
+                        where={"file_path": {"$in": batch}}, include=["metadatas"]
+                    )
+                )
+            return chunk_ids
+        offset = 0
+        while True:
+            results = self.collection.get(
+                include=["metadatas"], offset=offset, limit=self.batch_size
+            )
+            if not results["ids"]:
+                return chunk_ids
+            add(results)
+            offset += len(results["ids"])
 
 
 if __name__ == "__main__":
@@ -158,6 +407,8 @@ if __name__ == "__main__":
         sys.exit(1)
 
     vault_name = sys.argv[1]
+    # show indexing progress when run from the command line
+    logging.basicConfig(level=logging.INFO)
     config_manager = ConfigManager()
 
     indexer = ObsidianIndexer(config_manager, vault_name)
@@ -0,0 +1,135 @@
+import asyncio
+import logging
+import time
+from dataclasses import asdict
+
+from opus_agent_base.background_jobs.background_job import BackgroundJob
+from opus_todo_agent.background_jobs.notes.obsidian_indexer import ObsidianIndexer
+from opus_todo_agent.models.notes.obsidian_models import VaultWatcherMetrics
+
+logger = logging.getLogger(__name__)
+
+# queued instead of a file path when the whole vault has to be rescanned
+FULL_SCAN = ""
+
+
+class ObsidianVaultWatcher(BackgroundJob):
+    """
+    Background job keeping the vector db of all configured Obsidian vaults up-to-date.
+
+    Changes are watched with file system notifications (inotify etc.) if watchfiles is
+    installed, otherwise the vault is rescanned every poll_interval_seconds. Bursts of
+    changes are coalesced until the vault is quiet for debounce_seconds and then indexed
+    incrementally in one batch.
+
+    Example config:
+        background_jobs:
+          notes:
+            obsidian_vault_watcher:
+              enabled: true
+              debounce_seconds: 2
+              poll_interval_seconds: 60
+    """
+
+    def __init__(self, config_manager=None):
+        super().__init__(
+            "obsidian_vault_watcher", "notes.obsidian_vault_watcher", config_manager
+        )
+
+    async def run(self):
+        vault_configs = self.config_manager.get_setting(
+            "notes.obsidian.vault_configurations", []
+        )
+        vault_names = [
+            vault_config.get("vault_name") for vault_config in vault_configs or []
+        ]
+        await asyncio.gather(
+            *(self.watch_vault(vault_name) for vault_name in vault_names)
+        )
+
+    async def watch_vault(self, vault_name: str):
+        """Watch a vault until cancelled. Errors only stop watching this vault"""
+        try:
+            indexer = await asyncio.to_thread(
+                ObsidianIndexer, self.config_manager, vault_name
+            )
+        except Exception as e:
+            logger.error(f"Not watching vault {vault_name}: {e}", exc_info=True)
+            return
+        # queue depth and indexing lag, logged after every batch
+        metrics = VaultWatcherMetrics(vault_name)
+        changes: asyncio.Queue[tuple[str, float]] = asyncio.Queue()
+        # catch up on changes made while the agent was not running
+        changes.put_nowait((FULL_SCAN, time.monotonic()))
+        watch_task = asyncio.create_task(self._watch_changes(indexer, changes))
+        try:
+            await self._index_changes(indexer, changes, metrics)
+        except Exception as e:
+            logger.error(f"Stopped watching vault {vault_name}: {e}", exc_info=True)
+        finally:
+            watch_task.cancel()
+
+    async def _watch_changes(self, indexer: ObsidianIndexer, changes: asyncio.Queue):
+        vault_path = indexer.vault_config.get("vault_path")
+        try:
+            from watchfiles import awatch
+        except ImportError:
+            awatch = None
+        if awatch is not None:
+            try:
+                async for file_changes in awatch(vault_path, recursive=True):
+                    for _, file_path in file_changes:
+                        if file_path.endswith(".md"):
+                            changes.put_nowait((file_path, time.monotonic()))
+            except Exception as e:
+                logger.warning(
+                    f"Watching vault {vault_path} failed, polling instead: {e}"
+                )
+        poll_interval = self._get_setting("poll_interval_seconds", 60)
+        while True:
+            await asyncio.sleep(poll_interval)
+            changes.put_nowait((FULL_SCAN, time.monotonic()))
+
+    async def _index_changes(
+        self,
+        indexer: ObsidianIndexer,
+        changes: asyncio.Queue,
+        metrics: VaultWatcherMetrics,
+    ):
+        debounce_seconds = self._get_setting("debounce_seconds", 2)
+        while True:
+            # file path -> time of its first change in this batch
+            pending = dict([await changes.get()])
+            # coalesce changes until the vault is quiet for debounce_seconds
+            while True:
+                metrics.queue_depth = len(pending) + changes.qsize()
+                try:
+                    file_path, changed_at = await asyncio.wait_for(
+                        changes.get(), debounce_seconds
+                    )
+                except TimeoutError:
+                    break
+                pending.setdefault(file_path, changed_at)
+
+            try:
+                if FULL_SCAN in pending:
+                    await asyncio.to_thread(indexer.update_index)
+                else:
+                    await asyncio.to_thread(indexer.index_files, list(pending))
+            except Exception as e:
+                logger.error(f"Indexing vault {metrics.vault_name} failed: {e}")
+                continue
+
+            lag_seconds = time.monotonic() - min(pending.values())
+            metrics.queue_depth = changes.qsize()
+            metrics.last_lag_seconds = lag_seconds
+            metrics.max_lag_seconds = max(metrics.max_lag_seconds, lag_seconds)
+            metrics.batches_indexed += 1
+            metrics.files_indexed += len(pending) - (FULL_SCAN in pending)
+            metrics.last_indexed_at = time.time()
+            logger.info(f"Indexed vault changes: {asdict(metrics)}")
+
+    def _get_setting(self, key: str, default):
+        return self.config_manager.get_setting(
+            f"background_jobs.{self.config_key}.{key}", default
+        )
@@ -1,11 +1,13 @@
+import asyncio
 import logging
 import os
 
-from pydantic_ai import Agent
-
 from opus_todo_agent.helper.meeting_transcript.meeting_assistant_helper import (
     MeetingAssistantHelper,
 )
+from opus_todo_agent.helper.meeting_transcript.transcript_parser import TranscriptParser
+from opus_todo_agent.helper.notes.embedding_providers import get_embedding_provider
+from pydantic_ai import Agent
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +27,23 @@ class LoomMeetingAssistant:
         self.instructions_manager = instructions_manager
         self.model_manager = model_manager
         self.meeting_assistant_helper = MeetingAssistantHelper()
+        self.transcript_parser = TranscriptParser(
+            config_manager.get_setting(
+                "meeting_transcript.loom.timestamp_granularity_seconds", 60
+            ),
+            config_manager.get_setting(
+                "meeting_transcript.loom.max_segment_seconds", 120
+            ),
+            detect_speaker_prefix=False,
+        )
+        self.segment_index_enabled = config_manager.get_setting(
+            "meeting_transcript.loom.segment_index_enabled", True
+        )
+        self.embedding_provider = None
+        if self.segment_index_enabled:
+            self.embedding_provider = get_embedding_provider(
+                config_manager.get_setting("meeting_transcript.loom.embedding", {})
+            )
         self._init_agent()
 
     def _init_agent(self):
@@ -39,7 +58,7 @@ class LoomMeetingAssistant:
             model=model,
         )
 
-    def ask_loom_transcript(self, meeting_id: str, query: str) -> str:
+    async def ask_loom_transcript(self, meeting_id: str, query: str) -> str:
         logger.info(
             f"Calling SubAgent to Ask question about meeting transcript: {query} for meeting id: {meeting_id}"
         )
@@ -47,8 +66,32 @@ class LoomMeetingAssistant:
             self.loom_storage_dir,
             f"{meeting_id}.{LoomMeetingAssistant.LOOM_TRANSCRIPT_FILE_EXTENSION}",
         )
-        transcript = self.meeting_assistant_helper.read_transcript_from_file(
-            transcript_file
+        prompt_template = self.instructions_manager.get(
+            "loom_meeting_assistant_prompt_template"
+        )
+        # follow-up questions are answered from the most relevant segments only
+        if self.segment_index_enabled:
+            context = await asyncio.to_thread(
+                self.meeting_assistant_helper.retrieve_transcript_context,
+                transcript_file,
+                query,
+                self.transcript_parser,
+                self.embedding_provider,
+                self.config_manager.get_setting(
+                    "meeting_transcript.loom.max_context_tokens", 3000
+                ),
+                self.config_manager.get_setting(
+                    "meeting_transcript.loom.retrieval_candidates", 30
+                ),
+            )
+            if context:
+                return await self.meeting_assistant_helper.ask_transcript(
+                    self.agent, prompt_template, context, query
+                )
+        transcript = await asyncio.to_thread(
+            self.meeting_assistant_helper.read_compact_transcript_from_file,
+            transcript_file,
+            self.transcript_parser,
         )
         # check if transcript is empty
         if not transcript:
@@ -58,12 +101,39 @@ class LoomMeetingAssistant:
         max_size = self.config_manager.get_setting(
             "meeting_transcript.loom.max_transcript_size", 0
         )
-        transcript = self.meeting_assistant_helper.preprocess_transcript(
-            transcript, max_size
+        # map-reduce long transcripts instead of truncating them
+        if (
+            self.config_manager.get_setting(
+                "meeting_transcript.loom.long_transcript_mode", "map_reduce"
+            )
+            == "map_reduce"
+            and max_size > 0
+            and await asyncio.to_thread(
+                self.meeting_assistant_helper.count_tokens, transcript
+            )
+            > max_size
+        ):
+            return await self.meeting_assistant_helper.ask_transcript_map_reduce(
+                self.agent,
+                self.instructions_manager.get("meeting_transcript_map_prompt_template"),
+                self.instructions_manager.get("meeting_transcript_reduce_prompt_template"),
+                transcript,
+                query,
+                min(
+                    self.config_manager.get_setting(
+                        "meeting_transcript.loom.map_reduce_window_tokens", 8000
+                    ),
+                    max_size,
+                ),
+                self.config_manager.get_setting(
+                    "meeting_transcript.loom.map_reduce_max_concurrency", 2
+                ),
+            )
+        transcript = await asyncio.to_thread(
+            self.meeting_assistant_helper.preprocess_transcript, transcript, max_size
         )
         # generate context for the agent
-        prompt_template = self.instructions_manager.get("loom_meeting_assistant_prompt_template")
-        response = self.meeting_assistant_helper.ask_transcript(
+        response = await self.meeting_assistant_helper.ask_transcript(
             self.agent, prompt_template, transcript, query
         )
         return response
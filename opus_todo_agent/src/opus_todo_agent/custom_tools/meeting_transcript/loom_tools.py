@@ -20,7 +20,7 @@ class LoomTools(CustomTool):
 
     def initialize_tools(self, agent):
         @agent.tool
-        def ask_loom_meeting_transcript(
+        async def ask_loom_meeting_transcript(
             ctx: RunContext[str], meeting_id: str, query: str
         ) -> str:
             """
@@ -30,7 +30,7 @@ class LoomTools(CustomTool):
             If the user prefixes the question with "Ask loom meeting transcript" or "Ask loom meeting", then use this tool.
             """
             logger.info(f"[CustomToolCall] Ask follow-up questions to loom meeting transcript: {query} for meeting id: {meeting_id}")
-            response = self.loom_assistant.ask_loom_transcript(meeting_id, query)
+            response = await self.loom_assistant.ask_loom_transcript(meeting_id, query)
             logger.info(f"[CustomToolCall] Received response from model: {len(response)} chars")
             return response
 
@@ -23,7 +23,7 @@ class ZoomTools(CustomTool):
 
     def initialize_tools(self, agent):
         @agent.tool
-        def ask_zoom_meeting_transcript(
+        async def ask_zoom_meeting_transcript(
             ctx: RunContext[str], meeting_id: str, query: str
         ) -> str:
             """
@@ -33,6 +33,6 @@ class ZoomTools(CustomTool):
             If the user prefixes the question with "Ask zoom meeting transcript" or "Ask zoom meeting", then use this tool.
             """
             logger.info(f"[CustomToolCall] Ask follow-up questions to zoom meeting transcript: {query} for meeting id: {meeting_id}")
-            response = self.zoom_assistant.ask_zoom_transcript(meeting_id, query)
+            response = await self.zoom_assistant.ask_zoom_transcript(meeting_id, query)
             logger.info(f"[CustomToolCall] Received response from model: {len(response)} chars")
             return response
@@ -0,0 +1,284 @@
+import asyncio
+import logging
+from itertools import chain
+from math import inf
+
+from opus_todo_agent.custom_tools.notes.obsidian_rag import ObsidianRAG
+from opus_todo_agent.helper.notes.hybrid_retriever import fuse_rankings
+from opus_todo_agent.helper.notes.note_answer_cache import NoteAnswerCache
+from opus_todo_agent.helper.notes.note_context_builder import NoteContextBuilder
+from opus_todo_agent.models.notes.obsidian_models import (
+    CachedNoteAnswer,
+    NoteContext,
+    RetrievedChunk,
+)
+from pydantic_ai import Agent
+
+logger = logging.getLogger(__name__)
+
+ALL_VAULTS = "all"
+
+
+class ObsidianMultiVaultRAG:
+    """
+    RAG across all configured obsidian vaults
+
+    A question to one vault is answered by the RAG of that vault. A question to all
+    vaults retrieves the hybrid rankings of every vault concurrently, merges them with
+    reciprocal rank fusion, and answers from the best chunks of all vaults. Chunks of
+    the same rank in different vaults are ordered by vector similarity if all vaults are
+    embedded with the same model. Answers to all vaults are cached like the answers of
+    a vault. The vaults share Chroma clients and embedding providers.
+    """
+
+    def __init__(self, config_manager, instructions_manager, model_manager):
+        self.config_manager = config_manager
+        self.instructions_manager = instructions_manager
+        self.model_manager = model_manager
+        vault_config_list = self.config_manager.get_setting(
+            "notes.obsidian.vault_configurations", []
+        )
+        self.rags: dict[str, ObsidianRAG] = {
+            vault_config.get("vault_name"): ObsidianRAG(
+                config_manager,
+                vault_config.get("vault_name"),
+                instructions_manager,
+                model_manager,
+            )
+            for vault_config in vault_config_list
+        }
+        # vault of questions that don't name one
+        self.default_vault_name = self.config_manager.get_setting(
+            "notes.obsidian.default_vault_name", ALL_VAULTS
+        )
+        if (
+            self.default_vault_name != ALL_VAULTS
+            and self.default_vault_name not in self.rags
+        ):
+            logger.warning(
+                f"Default vault {self.default_vault_name} is not configured, "
+                "searching all vaults"
+            )
+            self.default_vault_name = ALL_VAULTS
+        self.context_num_results = self.config_manager.get_setting(
+            "notes.obsidian.context_num_results", 10
+        )
+        self.context_builder = NoteContextBuilder(
+            self.config_manager.get_setting("notes.obsidian.max_context_tokens", 3000),
+        )
+        self._init_answer_cache()
+        self.agent = Agent(
+            instructions=self.instructions_manager.get("obsidian_notes_instructions"),
+            model=self.model_manager.get_model(),
+        )
+
+    def _init_answer_cache(self):
+        self.answer_cache = None
+        if len(self.rags) < 2 or not self.config_manager.get_setting(
+            "notes.obsidian.answer_cache_enabled", True
+        ):
+            return
+        # cached answers are looked up by the query embedding of the first vault
+        self.cache_rag = next(iter(self.rags.values()))
+        self.answer_cache = NoteAnswerCache(
+            self.config_manager.get_setting(
+                "notes.obsidian.answer_cache_path",
+                str(
+                    self.config_manager.config_dir
+                    / "cache"
+                    / "obsidian_all_vaults.answer_cache.db"
+                ),
+            ),
+            self.cache_rag.embedding_function.model_id,
+            self.config_manager.get_setting(
+                "notes.obsidian.answer_cache_similarity_threshold", 0.95
+            ),
+            self.config_manager.get_setting(
+                "notes.obsidian.answer_cache_max_entries", 500
+            ),
+        )
+
+    def get_vault_names(self) -> list[str]:
+        return list(self.rags)
+
+    async def ask_notes(self, query: str, vault_name: str = None) -> str:
+        vault_name = vault_name or self.default_vault_name
+        if vault_name != ALL_VAULTS:
+            if vault_name not in self.rags:
+                vault_names = ", ".join(self.rags)
+                return f"Unknown vault: {vault_name}. Available vaults: {vault_names}"
+            return await self.rags[vault_name].ask_notes(query)
+        if len(self.rags) == 1:
+            return await next(iter(self.rags.values())).ask_notes(query)
+
+        logger.info(
+            f"Calling SubAgent to Ask question about notes in {len(self.rags)} vaults:"
+            f" {query}"
+        )
+        query_embeddings = await self.embed_query(query)
+        cache_embedding = None
+        if self.answer_cache is not None:
+            cache_embedding = query_embeddings[id(self.cache_rag.embedding_function)]
+            if not isinstance(cache_embedding, Exception):
+                cached_answer = await asyncio.to_thread(
+                    self.answer_cache.get, cache_embedding, self.is_cached_answer_valid
+                )
+                if cached_answer is not None:
+                    return cached_answer.answer
+        chunks = await self.retrieve_chunks(query, query_embeddings)
+        if not chunks:
+            logger.error("No notes found for the query")
+            return ""
+        context = await asyncio.to_thread(self.context_builder.build, chunks)
+        logger.info(
+            f"Retrieved notes: {len(context.citations)} chunks,"
+            f" {context.token_count} tokens"
+        )
+        prompt_template = self.instructions_manager.get(
+            "obsidian_notes_prompt_template"
+        )
+        prompt = prompt_template.format(context=context.text, question=query)
+        response = await self.agent.run(prompt)
+        citations = self.context_builder.format_citations(context)
+        answer = f"{response.output}\n\nSources:\n{citations}"
+        if self.answer_cache is not None and not isinstance(cache_embedding, Exception):
+            await asyncio.to_thread(
+                self.cache_answer, query, cache_embedding, context, answer
+            )
+        return answer
+
+    async def embed_query(self, query: str) -> dict[int, list[float] | Exception]:
+        """
+        Embed the query once per embedding provider, keyed by the id of the provider.
+        A provider that fails is mapped to its exception, so the other vaults are still
+        searched.
+        """
+        rags = {id(rag.embedding_function): rag for rag in self.rags.values()}
+        embeddings = await asyncio.gather(
+            *(asyncio.to_thread(rag.embed_query, query) for rag in rags.values()),
+            return_exceptions=True,
+        )
+        return dict(zip(rags, embeddings, strict=True))
+
+    async def retrieve_chunks(
+        self, query: str, query_embeddings: dict[int, list[float] | Exception] = None
+    ) -> list[RetrievedChunk]:
+        """
+        Retrieve chunks from all vaults concurrently, merged by their ranks in the
+        vaults, best first
+        """
+        if query_embeddings is None:
+            query_embeddings = await self.embed_query(query)
+
+        def retrieve_from_vault(
+            vault_name: str, rag: ObsidianRAG
+        ) -> list[RetrievedChunk]:
+            query_embedding = query_embeddings[id(rag.embedding_function)]
+            if isinstance(query_embedding, Exception):
+                raise query_embedding
+            chunks = rag.retrieve_chunks(
+                query, self.context_num_results, query_embedding
+            )
+            for chunk in chunks:
+                chunk.vault_name = vault_name
+            return chunks
+
+        async def retrieve(vault_name: str, rag: ObsidianRAG) -> list[RetrievedChunk]:
+            try:
+                return await asyncio.to_thread(retrieve_from_vault, vault_name, rag)
+            except Exception as e:
+                logger.error(
+                    f"Error retrieving notes from vault {vault_name}: {e}",
+                    exc_info=True,
+                )
+                return []
+
+        results = await asyncio.gather(
+            *(retrieve(vault_name, rag) for vault_name, rag in self.rags.items())
+        )
+        # fused scores only depend on ranks within a vault, so vault rankings are fused
+        # again
+        vault_scores = {
+            (chunk.vault_name, chunk.chunk_id): chunk.score
+            for chunk in chain.from_iterable(results)
+        }
+        # vector distances are only comparable across vaults embedded with one model
+        compare_similarity = self.has_shared_embedding_model()
+
+        def merge_order(chunk: RetrievedChunk) -> tuple[float, float, float]:
+            # same rank in different vaults: by similarity, then by vault score
+            similarity = -inf
+            if compare_similarity and chunk.vector_score is not None:
+                similarity = chunk.vector_score
+            return (
+                chunk.score,
+                similarity,
+                vault_scores[(chunk.vault_name, chunk.chunk_id)],
+            )
+
+        chunks = fuse_rankings(
+            [vault_chunks for vault_chunks in results if vault_chunks]
+        )
+        return sorted(chunks, key=merge_order, reverse=True)[: self.context_num_results]
+
+    def has_shared_embedding_model(self) -> bool:
+        """Whether the vector distances of all vaults are comparable"""
+        return len({rag.embedding_function.model_id for rag in self.rags.values()}) == 1
+
+    def get_index_version(self) -> int:
+        """Changes whenever chunks of any vault change, vault versions only increase"""
+        return sum(rag.lexical_index.get_version() for rag in self.rags.values())
+
+    def is_cached_answer_valid(self, cached_answer: CachedNoteAnswer) -> bool:
+        """
+        A cached answer is valid while the chunks it is based on are unchanged in all
+        vaults
+        """
+        index_version = self.get_index_version()
+        if cached_answer.index_version == index_version:
+            return True
+        chunk_hashes = {}
+        for vault_name, rag in self.rags.items():
+            prefix = f"{vault_name}:"
+            chunk_ids = [
+                chunk_key[len(prefix) :]
+                for chunk_key in cached_answer.chunk_hashes
+                if chunk_key.startswith(prefix)
+            ]
+            if chunk_ids:
+                vault_chunk_hashes = rag.lexical_index.get_chunk_hashes(chunk_ids)
+                chunk_hashes.update(
+                    {
+                        f"{prefix}{chunk_id}": chunk_hash
+                        for chunk_id, chunk_hash in vault_chunk_hashes.items()
+                    }
+                )
+        # chunks of removed vaults are missing
+        if chunk_hashes != cached_answer.chunk_hashes:
+            return False
+        cached_answer.index_version = index_version
+        return True
+
+    def cache_answer(
+        self, query: str, query_embedding, context: NoteContext, answer: str
+    ):
+        index_version = self.get_index_version()
+        # chunks are keyed by "<vault name>:<chunk id>"
+        chunk_hashes = {}
+        for vault_name, rag in self.rags.items():
+            chunk_ids = [
+                citation.chunk_id
+                for citation in context.citations
+                if citation.vault_name == vault_name
+            ]
+            if chunk_ids:
+                vault_chunk_hashes = rag.lexical_index.get_chunk_hashes(chunk_ids)
+                chunk_hashes.update(
+                    {
+                        f"{vault_name}:{chunk_id}": chunk_hash
+                        for chunk_id, chunk_hash in vault_chunk_hashes.items()
+                    }
+                )
+        self.answer_cache.put(
+            query, query_embedding, chunk_hashes, index_version, answer
+        )
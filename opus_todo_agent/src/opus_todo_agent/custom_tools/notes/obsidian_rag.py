@@ -1,7 +1,23 @@
-import chromadb
-from pydantic_ai import Agent
+import asyncio
 import logging
 
+from chromadb.errors import NotFoundError
+from opus_todo_agent.helper.notes.chroma_clients import get_chroma_client
+from opus_todo_agent.helper.notes.embedding_providers import (
+    get_collection_embedding_model,
+    get_embedding_provider,
+)
+from opus_todo_agent.helper.notes.hybrid_retriever import HybridRetriever
+from opus_todo_agent.helper.notes.note_answer_cache import NoteAnswerCache
+from opus_todo_agent.helper.notes.note_context_builder import NoteContextBuilder
+from opus_todo_agent.helper.notes.obsidian_lexical_index import ObsidianLexicalIndex
+from opus_todo_agent.models.notes.obsidian_models import (
+    CachedNoteAnswer,
+    NoteContext,
+    RetrievedChunk,
+)
+from pydantic_ai import Agent
+
 logger = logging.getLogger(__name__)
 
 import os
@@ -13,6 +29,13 @@ os.environ["TOKENIZERS_PARALLELISM"] = "false"
 class ObsidianRAG:
     """
     RAG for obsidian notes
+
+    Notes are retrieved with hybrid search: vector search and BM25 over the same chunks,
+    fused with reciprocal rank fusion. The retrieved chunks are packed into a context
+    of at most max_context_tokens, and the answer cites the notes it is based on.
+    Retrieval runs in a worker thread, so asking notes doesn't block the event loop.
+    Answers are cached by query embedding, a similar question is answered from the cache
+    as long as the notes chunks the answer is based on are unchanged.
     """
 
     def __init__(
@@ -36,7 +59,10 @@ class ObsidianRAG:
         assert (
             self.vault_config is not None
         ), f"Vault config not found for {self.obsidian_vault_name}"
-        logger.info(f"Vault config: {self.vault_config}")
+        logger.debug(f"Vault config: {self.vault_config}")
+        self.context_builder = NoteContextBuilder(
+            self.vault_config.get("max_context_tokens", 3000),
+        )
         self._init_vector_db()
         self._init_agent()
 
@@ -44,9 +70,60 @@ class ObsidianRAG:
         vector_db_path = self.vault_config.get("vector_db_path")
         vector_db_collection = self.vault_config.get("vector_db_collection")
         # init chroma client
-        self.client = chromadb.PersistentClient(path=vector_db_path)
+        self.client = get_chroma_client(vector_db_path)
         # init collection
         self.collection = self.client.get_or_create_collection(vector_db_collection)
+        lexical_index_path = self.vault_config.get(
+            "lexical_index_path",
+            ObsidianLexicalIndex.get_default_path(vector_db_path, vector_db_collection),
+        )
+        self.lexical_index = ObsidianLexicalIndex(lexical_index_path)
+        # shared with the indexer of the vault
+        self.embedding_function = get_embedding_provider(
+            self.vault_config.get("embedding")
+        )
+        model_id = get_collection_embedding_model(self.collection)
+        if model_id is not None and model_id != self.embedding_function.model_id:
+            logger.error(
+                f"Collection {vector_db_collection} is embedded with {model_id}, not "
+                f"{self.embedding_function.model_id}. Reindex the vault to search it"
+            )
+        self.retriever = HybridRetriever(
+            self.collection,
+            self.lexical_index,
+            candidates=self.vault_config.get("retrieval_candidates", 20),
+            rrf_k=self.vault_config.get("rrf_k", 60),
+            lexical_prefilter=self.vault_config.get("lexical_prefilter", False),
+            lexical_prefilter_min_chunks=self.vault_config.get(
+                "lexical_prefilter_min_chunks", 50000
+            ),
+            lexical_prefilter_candidates=self.vault_config.get(
+                "lexical_prefilter_candidates", 500
+            ),
+        )
+        self.answer_cache = None
+        if self.vault_config.get("answer_cache_enabled", True):
+            self.answer_cache = NoteAnswerCache(
+                self.vault_config.get(
+                    "answer_cache_path",
+                    NoteAnswerCache.get_default_path(
+                        vector_db_path, vector_db_collection
+                    ),
+                ),
+                self.embedding_function.model_id,
+                self.vault_config.get("answer_cache_similarity_threshold", 0.95),
+                self.vault_config.get("answer_cache_max_entries", 500),
+            )
+
+    def refresh_collection(self):
+        """Fetch the collection again after it was deleted and recreated"""
+        logger.info(
+            f"Reloading collection {self.vault_config.get('vector_db_collection')}"
+        )
+        self.collection = self.client.get_or_create_collection(
+            self.vault_config.get("vector_db_collection")
+        )
+        self.retriever.collection = self.collection
 
     def _init_agent(self):
         self.agent = Agent(
@@ -54,49 +131,113 @@ class ObsidianRAG:
             model=self.model_manager.get_model(),
         )
 
+    def retrieve_chunks(
+        self, query: str, num_results: int = None, query_embedding=None
+    ) -> list[RetrievedChunk]:
+        """
+        Retrieve the num_results most relevant chunks, best first
+        """
+        num_results = num_results or self.vault_config.get("num_results", 3)
+        if query_embedding is None:
+            query_embedding = self.embed_query(query)
+        try:
+            chunks = self.retriever.retrieve(query, num_results, query_embedding)
+        except NotFoundError:
+            # the indexer recreates the collection when the embedding model changes
+            self.refresh_collection()
+            chunks = self.retriever.retrieve(query, num_results, query_embedding)
+        for chunk in chunks:
+            logger.debug(
+                f"Retrieved {chunk.file_path} [{chunk.heading}] score={chunk.score:.4f}"
+            )
+        return chunks
+
     def retrieve_notes(self, query: str) -> str:
         """
-        Retrieve relevant notes from the vector database based on the query.
+        Retrieve notes relevant to the query from the vector db and lexical index.
 
         Returns:
             A string containing all retrieved notes separated by '----------'
         """
-        results = self.collection.query(
-            query_texts=[query],
-            n_results=self.vault_config.get("num_results", 3),
-        )
-
-        if not results:
+        chunks = self.retrieve_chunks(query)
+        if not chunks:
             logger.error(f"No notes found for the query: {query}")
-            return "No notes found for the query"
-
-        # ChromaDB returns documents as a list of lists: [[doc1, doc2, doc3]]
-        # The outer list represents queries (we only have 1 query)
-        # The inner list contains the matching documents
-        documents_list = results["documents"]
-
-        # Log search results for debugging
-        for i, docs in enumerate(documents_list):
-            logger.debug(f"\nQuery {i+1}")
-            logger.debug(docs)
-
-        # Extract documents from the nested list structure
-        # Since we only pass one query, we get documents_list[0]
-        retrieved_documents = documents_list[0] if documents_list else []
+            return ""
 
         # Join all documents with a separator
-        return "\n----------\n".join(retrieved_documents)
+        return "\n----------\n".join(chunk.text for chunk in chunks)
+
+    def retrieve_context(self, query: str, query_embedding=None) -> NoteContext | None:
+        """
+        Retrieve chunks for a question and pack them into the context, None if no notes
+        are found
+        """
+        # retrieve more chunks than num_results, the context builder packs them up to
+        # the token budget
+        chunks = self.retrieve_chunks(
+            query, self.vault_config.get("context_num_results", 10), query_embedding
+        )
+        if not chunks:
+            return None
+        return self.context_builder.build(chunks)
+
+    def embed_query(self, query: str):
+        return self.embedding_function([query])[0]
+
+    def get_cached_answer(self, query_embedding) -> CachedNoteAnswer | None:
+        return self.answer_cache.get(query_embedding, self.is_cached_answer_valid)
+
+    def is_cached_answer_valid(self, cached_answer: CachedNoteAnswer) -> bool:
+        """A cached answer is valid while the chunks it is based on are unchanged"""
+        index_version = self.lexical_index.get_version()
+        if cached_answer.index_version == index_version:
+            return True
+        if (
+            self.lexical_index.get_chunk_hashes(cached_answer.chunk_ids)
+            != cached_answer.chunk_hashes
+        ):
+            return False
+        cached_answer.index_version = index_version
+        return True
+
+    def cache_answer(
+        self, query: str, query_embedding, context: NoteContext, answer: str
+    ):
+        index_version = self.lexical_index.get_version()
+        chunk_hashes = self.lexical_index.get_chunk_hashes(
+            [citation.chunk_id for citation in context.citations]
+        )
+        self.answer_cache.put(
+            query, query_embedding, chunk_hashes, index_version, answer
+        )
 
-    def ask_notes(self, query: str) -> str:
+    async def ask_notes(self, query: str) -> str:
         logger.info(f"Calling SubAgent to Ask question about notes: {query}")
-        notes = self.retrieve_notes(query)
-        logger.info(f"Retrieved notes: {len(notes)} chars")
-        if not notes:
+        # embedding, vector and lexical search are blocking
+        query_embedding = await asyncio.to_thread(self.embed_query, query)
+        if self.answer_cache is not None:
+            cached_answer = await asyncio.to_thread(
+                self.get_cached_answer, query_embedding
+            )
+            if cached_answer is not None:
+                return cached_answer.answer
+        context = await asyncio.to_thread(self.retrieve_context, query, query_embedding)
+        if context is None:
             logger.error("No notes found for the query")
             return ""
+        logger.info(
+            f"Retrieved notes: {len(context.citations)} chunks,"
+            f" {context.token_count} tokens"
+        )
         prompt_template = self.instructions_manager.get(
             "obsidian_notes_prompt_template"
         )
-        prompt = prompt_template.format(context=notes, question=query)
-        response = self.agent.run_sync(prompt)
-        return response.output
+        prompt = prompt_template.format(context=context.text, question=query)
+        response = await self.agent.run(prompt)
+        citations = self.context_builder.format_citations(context)
+        answer = f"{response.output}\n\nSources:\n{citations}"
+        if self.answer_cache is not None:
+            await asyncio.to_thread(
+                self.cache_answer, query, query_embedding, context, answer
+            )
+        return answer
@@ -1,10 +1,11 @@
 import logging
 
-from pydantic_ai import RunContext
-
-from opus_agent_base.tools.custom_tool import CustomTool
-from opus_todo_agent.custom_tools.notes.obsidian_rag import ObsidianRAG
 from opus_agent_base.common.logging_config import console_log
+from opus_agent_base.tools.custom_tool import CustomTool
+from opus_todo_agent.custom_tools.notes.obsidian_multi_vault_rag import (
+    ObsidianMultiVaultRAG,
+)
+from pydantic_ai import RunContext
 
 logger = logging.getLogger(__name__)
 
@@ -15,24 +16,35 @@ class ObsidianTools(CustomTool):
 
     def __init__(self, config_manager=None, instructions_manager=None, model_manager=None):
         super().__init__("obsidian", "productivity.notes.obsidian", config_manager, instructions_manager, model_manager)
-        vault_name = self.config_manager.get_setting("notes.obsidian.default_vault_name")
-        self.obsidian_rag = ObsidianRAG(config_manager, vault_name, self.instructions_manager, self.model_manager)
+        self.obsidian_rag = ObsidianMultiVaultRAG(
+            config_manager, self.instructions_manager, self.model_manager
+        )
 
     def initialize_tools(self, agent):
         @agent.tool
-        def ask_notes(
-            ctx: RunContext[str], query: str
+        async def ask_notes(
+            ctx: RunContext[str], query: str, vault_name: str = ""
         ) -> str:
             """
             Ask notes from obsidian.
 
             If the user asks a question to their notes, use this tool to retrieve the notes, summarize and answer the question.
             If the user prefixes the question with "Ask my notes" or "Search my notes", use this tool.
+
+            Args:
+                query: The question to the notes
+                vault_name: Name of the vault to search if the user names one (e.g. work
+                    or personal), "all" if the user asks for all notes, otherwise empty
             """
             try:
-                logger.info(f"[CustomToolCall] Asking notes for query: {query}")
-                console_log(f"[CustomToolCall] Asking notes for query: {query}")
-                response = self.obsidian_rag.ask_notes(query)
+                vault_name = vault_name or self.obsidian_rag.default_vault_name
+                message = (
+                    f"[CustomToolCall] Asking notes in vault {vault_name} for query: "
+                    f"{query}"
+                )
+                logger.info(message)
+                console_log(message)
+                response = await self.obsidian_rag.ask_notes(query, vault_name)
                 logger.info(f"[CustomToolCall] Received response from model: {len(response)} chars")
                 return response
             except Exception as e:
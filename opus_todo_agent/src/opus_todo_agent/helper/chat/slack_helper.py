@@ -16,18 +16,20 @@ class SlackHelper:
 
     def __init__(self):
         self.fastmcp_client_helper = FastMCPClientHelper()
+        # memoized team/project to channels maps and resolved names,
+        # invalidated when chat.slack config changes
+        self._channel_maps = {}
+        self._resolved_channels = {}
+        self._subscribed_config_manager = None
 
     def get_channels_for_team(self, config_manager, team_name):
-        team_to_channels = config_manager.get_setting("chat.slack.team_to_channels")
+        team_to_channels = self._get_channel_map(config_manager, "team_to_channels")
         if team_to_channels:
-            # exact match team name
-            if team_name in team_to_channels:
-                return team_to_channels.get(team_name, [])
-            # fuzzy match team name
-            best_match = process.extractOne(team_name, team_to_channels.keys())
-            if best_match:
-                (key, _, _) = best_match
-                return team_to_channels.get(key, [])
+            channels = self._resolve_channels(
+                "team_to_channels", team_to_channels, team_name
+            )
+            if channels is not None:
+                return channels
             # error message if no match
             logger.error(
                 f"No match found for team name: {team_name}. Please check if team to channels is configured in config file"
@@ -35,24 +37,55 @@ class SlackHelper:
         return []
 
     def get_channels_for_project(self, config_manager, project_name):
-        project_to_channels = config_manager.get_setting(
-            "chat.slack.project_to_channels"
+        project_to_channels = self._get_channel_map(
+            config_manager, "project_to_channels"
         )
         if project_to_channels:
-            # exact match project name
-            if project_name in project_to_channels:
-                return project_to_channels.get(project_name, [])
-            # fuzzy match team name
-            best_match = process.extractOne(project_name, project_to_channels.keys())
-            if best_match:
-                (key, _, _) = best_match
-                return project_to_channels.get(key, [])
+            channels = self._resolve_channels(
+                "project_to_channels", project_to_channels, project_name
+            )
+            if channels is not None:
+                return channels
             # error message if no match
             logger.error(
                 f"No match found for project name: {project_name}. Please check if project to channels is configured in config file"
             )
         return []
 
+    def on_slack_config_changed(self, changes):
+        logger.info("Slack config changed, invalidating channel maps")
+        self._channel_maps = {}
+        self._resolved_channels = {}
+
+    def _get_channel_map(self, config_manager, map_name):
+        if self._subscribed_config_manager is not config_manager:
+            config_manager.subscribe("chat.slack", self.on_slack_config_changed)
+            self._subscribed_config_manager = config_manager
+            self._channel_maps = {}
+            self._resolved_channels = {}
+        if map_name not in self._channel_maps:
+            self._channel_maps[map_name] = config_manager.get_setting(
+                f"chat.slack.{map_name}"
+            )
+        return self._channel_maps[map_name]
+
+    def _resolve_channels(self, map_name, name_to_channels, name):
+        if (map_name, name) in self._resolved_channels:
+            return self._resolved_channels[(map_name, name)]
+        channels = None
+        # exact match name
+        if name in name_to_channels:
+            channels = name_to_channels.get(name, [])
+        else:
+            # fuzzy match name
+            best_match = process.extractOne(name, name_to_channels.keys())
+            if best_match:
+                (key, _, _) = best_match
+                channels = name_to_channels.get(key, [])
+        if channels is not None:
+            self._resolved_channels[(map_name, name)] = channels
+        return channels
+
     def get_channel_id(self, channel_name):
         # exact match channel name
         cached_channels_list = self._get_cached_channels_list()
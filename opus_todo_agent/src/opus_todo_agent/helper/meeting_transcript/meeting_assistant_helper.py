@@ -1,10 +1,26 @@
+import asyncio
+import json
 import logging
+import os
+import threading
 
-import tiktoken
+from opus_agent_base.common.tokenizer import get_tokenizer
+from opus_todo_agent.helper.meeting_transcript.transcript_parser import (
+    TranscriptParser,
+    format_timestamp,
+)
+from opus_todo_agent.helper.meeting_transcript.transcript_segment_index import (
+    TranscriptSegmentIndex,
+)
+from opus_todo_agent.helper.notes.embedding_providers import EmbeddingProvider
 from pydantic_ai import Agent
 
 logger = logging.getLogger(__name__)
 
+# answer of the map step for windows without relevant content
+NOTHING_RELEVANT = "NOTHING_RELEVANT"
+
+
 class MeetingAssistantHelper:
     """
     Helper for meeting assistant.
@@ -12,26 +28,244 @@ class MeetingAssistantHelper:
     """
 
     def __init__(self):
-        pass
+        self.tokenizer = get_tokenizer()
+        # segment index per transcript path
+        self.segment_indexes: dict[str, TranscriptSegmentIndex] = {}
+        self.segment_indexes_lock = threading.Lock()
 
     def read_transcript_from_file(self, transcript_path: str) -> str:
         with open(transcript_path, "r") as f:
             transcript = f.read()
         return transcript
 
+    def read_compact_transcript_from_file(
+        self, transcript_path: str, transcript_parser: TranscriptParser
+    ) -> str:
+        """
+        Read a VTT or SRT transcript without cue numbers, timing lines and markup,
+        with consecutive cues of a speaker merged
+        """
+        transcript = transcript_parser.read_compact_text(transcript_path)
+        if not transcript:
+            # not a VTT or SRT file
+            logger.warning(
+                f"No cues found in transcript {transcript_path}, "
+                "using the raw transcript"
+            )
+            return self.read_transcript_from_file(transcript_path)
+        return transcript
+
+    def count_tokens(self, text: str) -> int:
+        return self.tokenizer.count_tokens(text)
+
     def preprocess_transcript(self, transcript: str, max_size: int) -> str:
-        encoding = tiktoken.get_encoding("cl100k_base")
-        tokens = encoding.encode(transcript)
-        logger.info(f"Retrieved transcript: {len(transcript)} chars, {len(tokens)} tokens")
-        if max_size > 0:
+        logger.info(
+            f"Retrieved transcript: {len(transcript)} chars, "
+            f"~{self.tokenizer.count_tokens_approx(transcript)} tokens"
+        )
+        if max_size > 0 and not self.tokenizer.fits(transcript, max_size):
             # Truncate by tokens
-            if len(tokens) > max_size:
-                truncated_tokens = tokens[:max_size]
-                transcript = encoding.decode(truncated_tokens)
-                logger.info(f"Truncated transcript: {len(transcript)} chars, {len(truncated_tokens)} tokens")
+            transcript = self.tokenizer.truncate(transcript, max_size)
+            logger.info(
+                f"Truncated transcript: {len(transcript)} chars, {max_size} tokens"
+            )
         return transcript
 
-    def ask_transcript(self, agent: Agent, prompt_template: str, transcript: str, query: str) -> str:
+    async def ask_transcript(
+        self, agent: Agent, prompt_template: str, transcript: str, query: str
+    ) -> str:
         prompt = prompt_template.format(context=transcript, question=query)
-        response = agent.run_sync(prompt)
-        return response.output
\ No newline at end of file
+        response = await agent.run(prompt)
+        return response.output
+
+    def split_transcript(self, transcript: str, window_tokens: int) -> list[str]:
+        """
+        Split a transcript into windows of at most window_tokens tokens at line
+        boundaries, lines longer than a window are split by tokens
+        """
+        windows = []
+        lines: list[str] = []
+        size = 0
+        for line in transcript.splitlines():
+            tokens = self.tokenizer.encode(line)
+            if lines and size + len(tokens) + 1 > window_tokens:
+                windows.append("\n".join(lines))
+                lines, size = [], 0
+            if len(tokens) > window_tokens:
+                for start in range(0, len(tokens), window_tokens):
+                    windows.append(
+                        self.tokenizer.decode(tokens[start : start + window_tokens])
+                    )
+                continue
+            lines.append(line)
+            size += len(tokens) + 1
+        if lines:
+            windows.append("\n".join(lines))
+        return windows
+
+    async def ask_transcript_map_reduce(
+        self,
+        agent: Agent,
+        map_prompt_template: str,
+        reduce_prompt_template: str,
+        transcript: str,
+        query: str,
+        window_tokens: int,
+        max_concurrency: int,
+    ) -> str:
+        """
+        Answer a question about a transcript longer than the context of the model.
+        Relevant content is extracted from token-bounded windows of the transcript
+        concurrently, with at most max_concurrency model calls at a time, and the
+        partial results are reduced into one answer. Partial results exceeding a window
+        are reduced in groups first.
+        """
+        semaphore = asyncio.Semaphore(max(max_concurrency, 1))
+
+        async def run(prompt: str) -> str:
+            async with semaphore:
+                response = await agent.run(prompt)
+            return response.output.strip()
+
+        async def reduce(group: list[str]) -> str:
+            context = "\n\n".join(group)
+            prompt = reduce_prompt_template.format(context=context, question=query)
+            return await run(prompt)
+
+        windows = await asyncio.to_thread(
+            self.split_transcript, transcript, window_tokens
+        )
+        logger.info(
+            f"Map-reduce over {len(windows)} transcript windows"
+            f" of {window_tokens} tokens"
+        )
+        outputs = await asyncio.gather(
+            *(
+                run(
+                    map_prompt_template.format(
+                        context=window,
+                        question=query,
+                        part=index + 1,
+                        num_parts=len(windows),
+                    )
+                )
+                for index, window in enumerate(windows)
+            )
+        )
+        partials = [
+            f"Part {index + 1} of {len(windows)}:\n{output}"
+            for index, output in enumerate(outputs)
+            if output and NOTHING_RELEVANT not in output
+        ]
+        logger.info(
+            f"Extracted relevant content from {len(partials)} of {len(windows)} windows"
+        )
+        if not partials:
+            return (
+                "The meeting transcript does not contain information relevant to the"
+                " question."
+            )
+
+        groups = self.group_partials(partials, window_tokens)
+        while len(groups) > 1:
+            logger.info(
+                f"Reducing {len(partials)} partial results in {len(groups)} groups"
+            )
+            partials = await asyncio.gather(*(reduce(group) for group in groups))
+            groups = self.group_partials(partials, window_tokens)
+        return await reduce(groups[0])
+
+    def group_partials(
+        self, partials: list[str], window_tokens: int
+    ) -> list[list[str]]:
+        """Group consecutive partial results into groups of at most window_tokens"""
+        groups: list[list[str]] = [[]]
+        size = 0
+        for partial in partials:
+            tokens = len(self.tokenizer.encode(partial)) + 2
+            # a group has at least two partials so that reducing always makes progress
+            if len(groups[-1]) > 1 and size + tokens > window_tokens:
+                groups.append([])
+                size = 0
+            groups[-1].append(partial)
+            size += tokens
+        return groups
+
+    def retrieve_transcript_context(
+        self,
+        transcript_path: str,
+        query: str,
+        transcript_parser: TranscriptParser,
+        embedding_provider: EmbeddingProvider,
+        max_context_tokens: int,
+        num_candidates: int = 30,
+    ) -> str | None:
+        """
+        Segments of a transcript most relevant to a follow-up question, in meeting order
+        and within max_context_tokens. The segment index is built on first access, and
+        None is returned then so that the first question is answered from the whole
+        transcript.
+        """
+        if not os.path.exists(transcript_path):
+            return None
+        try:
+            segment_index = self.get_segment_index(transcript_path)
+            stat = os.stat(transcript_path)
+            source_key = json.dumps(
+                {
+                    "mtime_ns": stat.st_mtime_ns,
+                    "size": stat.st_size,
+                    "embedding_model": embedding_provider.model_id,
+                    "max_segment_seconds": transcript_parser.max_segment_seconds,
+                    "detect_speaker_prefix": transcript_parser.detect_speaker_prefix,
+                }
+            )
+            if segment_index.get_source_key() != source_key:
+                transcript = transcript_parser.parse_file(transcript_path)
+                texts = [
+                    f"{segment.speaker}: {segment.text}"
+                    for segment in transcript.segments
+                ]
+                embeddings = embedding_provider.embed(texts)
+                segment_index.build(transcript.segments, embeddings, source_key)
+                logger.info(
+                    f"Indexed {len(transcript.segments)} segments of transcript"
+                    f" {transcript_path}"
+                )
+                return None
+            segments = segment_index.search(
+                query, embedding_provider.embed([query])[0], num_candidates
+            )
+        except Exception as e:
+            logger.error(
+                f"Error retrieving segments of transcript {transcript_path}: {e}",
+                exc_info=True,
+            )
+            return None
+
+        selected = []
+        token_count = 0
+        for segment in segments:
+            speaker = f"{segment.speaker}: " if segment.speaker else ""
+            line = (
+                f"[{format_timestamp(segment.start_seconds)}] {speaker}{segment.text}"
+            )
+            line_tokens = len(self.tokenizer.encode(line)) + 1
+            if token_count + line_tokens > max_context_tokens:
+                continue
+            selected.append((segment.start_seconds, line))
+            token_count += line_tokens
+        if not selected:
+            return None
+        logger.info(
+            f"Retrieved {len(selected)} transcript segments, {token_count} tokens"
+        )
+        return "\n".join(line for _, line in sorted(selected))
+
+    def get_segment_index(self, transcript_path: str) -> TranscriptSegmentIndex:
+        with self.segment_indexes_lock:
+            if transcript_path not in self.segment_indexes:
+                self.segment_indexes[transcript_path] = TranscriptSegmentIndex(
+                    TranscriptSegmentIndex.get_default_path(transcript_path)
+                )
+            return self.segment_indexes[transcript_path]
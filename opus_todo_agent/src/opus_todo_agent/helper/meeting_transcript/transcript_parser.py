@@ -0,0 +1,162 @@
+import html
+import logging
+import re
+from collections.abc import Iterable, Iterator
+
+from opus_todo_agent.models.meeting_transcript.transcript_models import (
+    Transcript,
+    TranscriptCue,
+    TranscriptSegment,
+)
+
+logger = logging.getLogger(__name__)
+
+# 00:01:02.345 --> 00:01:04.000 (VTT, hours optional)
+# or 00:01:02,345 --> 00:01:04,000 (SRT)
+TIMING_PATTERN = re.compile(
+    r"^\s*((?:\d+:)?\d{1,2}:\d{2}[.,]\d{1,3})\s*-->\s*((?:\d+:)?\d{1,2}:\d{2}[.,]\d{1,3})"
+)
+# <v Speaker Name>text</v> voice tags of VTT
+VOICE_TAG_PATTERN = re.compile(r"<v(?:\.[^ >]*)?\s+([^>]+)>")
+TAG_PATTERN = re.compile(r"</?[^>]+>")
+# "Speaker Name: text" as written by Zoom
+SPEAKER_PREFIX_PATTERN = re.compile(r"^([^:]{1,60}):\s+(.*)$", re.S)
+# blocks of a VTT file without cues
+VTT_METADATA_BLOCKS = ("WEBVTT", "NOTE", "STYLE", "REGION")
+
+
+class TranscriptParser:
+    """
+    Streaming parser of VTT (Zoom) and SRT (Loom) transcripts.
+
+    Cue numbers, timing lines and markup are dropped, and consecutive cues of the same
+    speaker are merged into one segment of at most max_segment_seconds. Speakers are
+    read from VTT voice tags, and from "Speaker Name: text" prefixes (Zoom) if
+    detect_speaker_prefix is set. The compact text form prints a timestamp rounded down
+    to timestamp_granularity_seconds only when it changed since the last one (0 disables
+    timestamps), e.g.
+
+        [00:00] Alice: Let's start with the roadmap.
+        Bob: Sounds good.
+        [01:00] Alice: ...
+    """
+
+    def __init__(
+        self,
+        timestamp_granularity_seconds: int = 60,
+        max_segment_seconds: int = 120,
+        detect_speaker_prefix: bool = True,
+    ):
+        self.timestamp_granularity_seconds = timestamp_granularity_seconds
+        self.max_segment_seconds = max_segment_seconds
+        self.detect_speaker_prefix = detect_speaker_prefix
+
+    def parse_file(self, transcript_path: str, meeting_id: str = "") -> Transcript:
+        with open(transcript_path, encoding="utf-8-sig") as f:
+            return Transcript(meeting_id, list(self.iter_segments(self.iter_cues(f))))
+
+    def read_compact_text(self, transcript_path: str) -> str:
+        """Compact text of a transcript file, read line by line"""
+        with open(transcript_path, encoding="utf-8-sig") as f:
+            return self.to_text(self.iter_segments(self.iter_cues(f)))
+
+    def iter_cues(self, lines: Iterable[str]) -> Iterator[TranscriptCue]:
+        block: list[str] = []
+        for line in lines:
+            line = line.rstrip("\r\n")
+            if line.strip():
+                block.append(line)
+                continue
+            cue = self.parse_block(block)
+            if cue is not None:
+                yield cue
+            block = []
+        cue = self.parse_block(block)
+        if cue is not None:
+            yield cue
+
+    def parse_block(self, block: list[str]) -> TranscriptCue | None:
+        """Parse a block of lines between blank lines, None for blocks without a cue"""
+        if not block or block[0].startswith(VTT_METADATA_BLOCKS):
+            return None
+        for index, line in enumerate(block):
+            match = TIMING_PATTERN.match(line)
+            if match:
+                # lines before the timing line are the cue number or identifier
+                speaker, text = self.parse_text(" ".join(block[index + 1 :]))
+                if not text:
+                    return None
+                return TranscriptCue(
+                    parse_timestamp(match.group(1)),
+                    parse_timestamp(match.group(2)),
+                    speaker,
+                    text,
+                )
+        return None
+
+    def parse_text(self, text: str) -> tuple[str, str]:
+        speaker = ""
+        voice = VOICE_TAG_PATTERN.search(text)
+        if voice:
+            speaker = voice.group(1).strip()
+        text = html.unescape(TAG_PATTERN.sub("", text))
+        text = " ".join(text.split())
+        if not speaker and self.detect_speaker_prefix:
+            match = SPEAKER_PREFIX_PATTERN.match(text)
+            if match:
+                speaker, text = match.group(1).strip(), match.group(2)
+        return speaker, text
+
+    def iter_segments(
+        self, cues: Iterable[TranscriptCue]
+    ) -> Iterator[TranscriptSegment]:
+        segment = None
+        for cue in cues:
+            if (
+                segment is not None
+                # cues without a speaker continue the current segment
+                and cue.speaker in ("", segment.speaker)
+                and cue.end_seconds - segment.start_seconds <= self.max_segment_seconds
+            ):
+                segment.text = f"{segment.text} {cue.text}"
+                segment.end_seconds = cue.end_seconds
+                continue
+            if segment is not None:
+                yield segment
+            segment = TranscriptSegment(
+                cue.start_seconds, cue.end_seconds, cue.speaker, cue.text
+            )
+        if segment is not None:
+            yield segment
+
+    def to_text(self, segments: Iterable[TranscriptSegment]) -> str:
+        lines = []
+        last_timestamp = None
+        for segment in segments:
+            prefix = ""
+            if self.timestamp_granularity_seconds > 0:
+                timestamp = (
+                    int(segment.start_seconds) // self.timestamp_granularity_seconds
+                ) * self.timestamp_granularity_seconds
+                if timestamp != last_timestamp:
+                    prefix = f"[{format_timestamp(timestamp)}] "
+                    last_timestamp = timestamp
+            speaker = f"{segment.speaker}: " if segment.speaker else ""
+            lines.append(f"{prefix}{speaker}{segment.text}")
+        return "\n".join(lines)
+
+
+def parse_timestamp(timestamp: str) -> float:
+    """Seconds of a VTT or SRT timestamp, e.g. 01:02:03.456 or 02:03,456"""
+    seconds = 0.0
+    for part in timestamp.replace(",", ".").split(":"):
+        seconds = seconds * 60 + float(part)
+    return seconds
+
+
+def format_timestamp(seconds: int) -> str:
+    hours, seconds = divmod(int(seconds), 3600)
+    minutes, seconds = divmod(seconds, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{seconds:02d}"
+    return f"{minutes:02d}:{seconds:02d}"
@@ -0,0 +1,169 @@
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+
+import numpy as np
+from opus_todo_agent.helper.notes.obsidian_lexical_index import ObsidianLexicalIndex
+from opus_todo_agent.models.meeting_transcript.transcript_models import (
+    RetrievedTranscriptSegment,
+    TranscriptSegment,
+)
+
+logger = logging.getLogger(__name__)
+
+class TranscriptSegmentIndex:
+    """
+    Index of the speaker segments of one meeting transcript, persisted in SQLite beside
+    the transcript.
+
+    Segments are searched both by the cosine similarity of their embeddings and by BM25
+    over an FTS5 table, and both rankings are fused with reciprocal rank fusion (RRF).
+    The source key identifies the transcript file and settings the index was built from,
+    an index with a different source key is outdated.
+    """
+
+    def __init__(self, db_path: str):
+        db_path = Path(db_path).expanduser()
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(db_path, check_same_thread=False)
+        self.lock = threading.Lock()
+        self.connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS segments (
+                rowid INTEGER PRIMARY KEY,
+                start_seconds REAL NOT NULL,
+                end_seconds REAL NOT NULL,
+                speaker TEXT NOT NULL,
+                text TEXT NOT NULL,
+                embedding BLOB NOT NULL
+            );
+            CREATE VIRTUAL TABLE IF NOT EXISTS segments_fts USING fts5(
+                speaker,
+                text,
+                content='segments',
+                content_rowid='rowid',
+                tokenize='unicode61'
+            );
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+            """
+        )
+        self.connection.commit()
+        # normalized segment embeddings, loaded on first search
+        self.embeddings: np.ndarray | None = None
+
+    @staticmethod
+    def get_default_path(transcript_path: str) -> str:
+        return f"{transcript_path}.index.db"
+
+    def get_source_key(self) -> str | None:
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT value FROM meta WHERE key = 'source_key'"
+            ).fetchone()
+        return row[0] if row else None
+
+    def build(
+        self,
+        segments: list[TranscriptSegment],
+        embeddings: list[list[float]],
+        source_key: str,
+    ):
+        """Replace the indexed segments"""
+        with self.lock:
+            self.connection.execute("DELETE FROM segments")
+            self.connection.executemany(
+                "INSERT INTO segments"
+                " (rowid, start_seconds, end_seconds, speaker, text, embedding)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        rowid,
+                        segment.start_seconds,
+                        segment.end_seconds,
+                        segment.speaker,
+                        segment.text,
+                        self.normalize(embedding).tobytes(),
+                    )
+                    for rowid, (segment, embedding) in enumerate(
+                        zip(segments, embeddings, strict=True)
+                    )
+                ],
+            )
+            self.connection.execute(
+                "INSERT INTO segments_fts(segments_fts) VALUES ('rebuild')"
+            )
+            self.connection.execute(
+                "INSERT OR REPLACE INTO meta VALUES ('source_key', ?)", (source_key,)
+            )
+            self.connection.commit()
+            self.embeddings = None
+
+    def search(
+        self, query: str, query_embedding: list[float], limit: int, rrf_k: int = 60
+    ) -> list[RetrievedTranscriptSegment]:
+        """Best limit segments of the fused vector and BM25 rankings, best first"""
+        with self.lock:
+            if self.embeddings is None:
+                rows = self.connection.execute(
+                    "SELECT embedding FROM segments ORDER BY rowid"
+                ).fetchall()
+                self.embeddings = np.array(
+                    [
+                        np.frombuffer(embedding, dtype=np.float32)
+                        for (embedding,) in rows
+                    ],
+                    dtype=np.float32,
+                )
+            vector_ranking = []
+            if len(self.embeddings):
+                similarities = self.embeddings @ self.normalize(query_embedding)
+                vector_ranking = np.argsort(-similarities)[:limit].tolist()
+            lexical_ranking = self._search_lexical(query, limit)
+
+            scores: dict[int, float] = {}
+            for ranking in (vector_ranking, lexical_ranking):
+                for rank, rowid in enumerate(ranking, start=1):
+                    scores[rowid] = scores.get(rowid, 0.0) + 1 / (rrf_k + rank)
+            best = sorted(scores, key=scores.get, reverse=True)[:limit]
+            if not best:
+                return []
+            rows = self.connection.execute(
+                "SELECT rowid, start_seconds, end_seconds, speaker, text FROM segments "
+                f"WHERE rowid IN ({','.join('?' * len(best))})",
+                best,
+            ).fetchall()
+        segments = {
+            rowid: RetrievedTranscriptSegment(
+                start_seconds, end_seconds, speaker, text, scores[rowid]
+            )
+            for rowid, start_seconds, end_seconds, speaker, text in rows
+        }
+        return [segments[rowid] for rowid in best if rowid in segments]
+
+    def _search_lexical(self, query: str, limit: int) -> list[int]:
+        match_query = ObsidianLexicalIndex.get_match_query(query)
+        if not match_query:
+            return []
+        try:
+            rows = self.connection.execute(
+                "SELECT rowid FROM segments_fts WHERE segments_fts MATCH ?"
+                " ORDER BY bm25(segments_fts) LIMIT ?",
+                (match_query, limit),
+            ).fetchall()
+        except sqlite3.OperationalError as e:
+            logger.warning(f"Lexical search failed for query {query!r}: {e}")
+            return []
+        return [rowid for (rowid,) in rows]
+
+    @staticmethod
+    def normalize(embedding) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def close(self):
+        self.connection.close()
@@ -0,0 +1,17 @@
+import threading
+
+import chromadb
+
+_clients: dict[str, chromadb.ClientAPI] = {}
+_clients_lock = threading.Lock()
+
+
+def get_chroma_client(vector_db_path: str) -> chromadb.ClientAPI:
+    """
+    Persistent Chroma client of a vector db path.
+    Clients are shared by the indexers and RAGs of all vaults in the process.
+    """
+    with _clients_lock:
+        if vector_db_path not in _clients:
+            _clients[vector_db_path] = chromadb.PersistentClient(path=vector_db_path)
+        return _clients[vector_db_path]
@@ -0,0 +1,171 @@
+import json
+import logging
+import threading
+from abc import ABC, abstractmethod
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODELS = {
+    "default": "all-MiniLM-L6-v2",
+    "fastembed": "BAAI/bge-small-en-v1.5",
+    "ollama": "nomic-embed-text",
+}
+
+
+class EmbeddingProvider(ABC):
+    """
+    Embeds note chunks and queries in batches of batch_size.
+
+    Batches are embedded one at a time, so the indexer and RAG sharing a provider don't
+    oversubscribe the CPU threads of the model, and a query waits for one batch at most.
+    """
+
+    provider_name: str = ""
+
+    def __init__(self, model: str, batch_size: int = 64, threads: int = None):
+        self.model = model
+        self.batch_size = batch_size
+        self.threads = threads
+        self.lock = threading.Lock()
+
+    @property
+    def model_id(self) -> str:
+        """Identifies the embedding space, vectors of other models are not comparable"""
+        return f"{self.provider_name}:{self.model}"
+
+    def __call__(self, texts: list[str]) -> list[list[float]]:
+        return self.embed(texts)
+
+    def embed(self, texts: list[str]) -> list[list[float]]:
+        embeddings = []
+        for start in range(0, len(texts), self.batch_size):
+            with self.lock:
+                embeddings.extend(
+                    self._embed_batch(texts[start : start + self.batch_size])
+                )
+        return embeddings
+
+    @abstractmethod
+    def _embed_batch(self, texts: list[str]) -> list[list[float]]:
+        pass
+
+
+class DefaultEmbeddingProvider(EmbeddingProvider):
+    """
+    Chroma's default embedding function (all-MiniLM-L6-v2 on ONNX runtime).
+    The model can't be changed and the number of threads is chosen by ONNX runtime.
+    """
+
+    provider_name = "default"
+
+    def __init__(self, model: str, batch_size: int = 64, threads: int = None):
+        super().__init__(DEFAULT_MODELS["default"], batch_size, threads)
+        from chromadb.utils.embedding_functions import DefaultEmbeddingFunction
+
+        self.embedding_function = DefaultEmbeddingFunction()
+
+    def _embed_batch(self, texts: list[str]) -> list[list[float]]:
+        return [embedding.tolist() for embedding in self.embedding_function(texts)]
+
+
+class FastEmbedProvider(EmbeddingProvider):
+    """
+    Quantized ONNX models of fastembed, e.g. BAAI/bge-small-en-v1.5, on CPU with a fixed
+    number of threads
+    """
+
+    provider_name = "fastembed"
+
+    def __init__(self, model: str, batch_size: int = 64, threads: int = None):
+        super().__init__(model, batch_size, threads)
+        try:
+            from fastembed import TextEmbedding
+        except ImportError as e:
+            raise ImportError(
+                "fastembed is required for the fastembed embedding provider: "
+                "pip install fastembed"
+            ) from e
+        self.text_embedding = TextEmbedding(model_name=model, threads=threads)
+
+    def _embed_batch(self, texts: list[str]) -> list[list[float]]:
+        return [
+            embedding.tolist()
+            for embedding in self.text_embedding.embed(
+                texts, batch_size=self.batch_size
+            )
+        ]
+
+
+class OllamaEmbeddingProvider(EmbeddingProvider):
+    """
+    Embedding models served by a local Ollama server, e.g. nomic-embed-text
+    """
+
+    provider_name = "ollama"
+
+    def __init__(
+        self,
+        model: str,
+        batch_size: int = 64,
+        threads: int = None,
+        url: str = "http://localhost:11434",
+        timeout_seconds: float = 60,
+    ):
+        super().__init__(model, batch_size, threads)
+        import httpx
+
+        self.client = httpx.Client(base_url=url, timeout=timeout_seconds)
+
+    def _embed_batch(self, texts: list[str]) -> list[list[float]]:
+        request = {"model": self.model, "input": texts}
+        if self.threads:
+            request["options"] = {"num_thread": self.threads}
+        response = self.client.post("/api/embed", json=request)
+        response.raise_for_status()
+        return response.json()["embeddings"]
+
+
+PROVIDERS = {
+    "default": DefaultEmbeddingProvider,
+    "fastembed": FastEmbedProvider,
+    "ollama": OllamaEmbeddingProvider,
+}
+
+_providers: dict[str, EmbeddingProvider] = {}
+_providers_lock = threading.Lock()
+
+
+def get_embedding_provider(embedding_config: dict = None) -> EmbeddingProvider:
+    """
+    Embedding provider of a vault's embedding config.
+    Providers are shared, e.g. by the indexer and the RAG of a vault, so a model is
+    loaded once.
+    """
+    embedding_config = embedding_config or {}
+    key = json.dumps(embedding_config, sort_keys=True)
+    with _providers_lock:
+        if key not in _providers:
+            provider_name = embedding_config.get("provider", "default")
+            assert provider_name in PROVIDERS, (
+                f"Unknown embedding provider: {provider_name}"
+            )
+            kwargs = {
+                "model": embedding_config.get("model", DEFAULT_MODELS[provider_name]),
+                "batch_size": embedding_config.get("batch_size", 64),
+                "threads": embedding_config.get("threads"),
+            }
+            if provider_name == "ollama":
+                kwargs["url"] = embedding_config.get("url", "http://localhost:11434")
+                kwargs["timeout_seconds"] = embedding_config.get("timeout_seconds", 60)
+            logger.info(f"Loading embedding provider {provider_name}: {kwargs}")
+            _providers[key] = PROVIDERS[provider_name](**kwargs)
+        return _providers[key]
+
+
+def get_collection_embedding_model(collection) -> str | None:
+    """Embedding model id of a collection, None for empty collections without one"""
+    model_id = (collection.metadata or {}).get("embedding_model")
+    if model_id is None and collection.count() > 0:
+        # indexed with Chroma's default embedding function
+        return f"default:{DEFAULT_MODELS['default']}"
+    return model_id
@@ -0,0 +1,126 @@
+import logging
+from dataclasses import replace
+
+from opus_todo_agent.helper.notes.obsidian_lexical_index import ObsidianLexicalIndex
+from opus_todo_agent.models.notes.obsidian_models import RetrievedChunk
+
+logger = logging.getLogger(__name__)
+
+
+class HybridRetriever:
+    """
+    Retrieves note chunks with both the vector db collection and the BM25 lexical
+    index, and fuses both rankings with reciprocal rank fusion (RRF). Fused scores are
+    normalized to [0, 1], but only depend on ranks, so chunks of different collections
+    are merged by fusing their rankings again.
+
+    With lexical prefiltering, the vector search on large collections is restricted to
+    the best lexical candidates. Queries without any lexical match fall back to a full
+    vector search.
+    """
+
+    def __init__(
+        self,
+        collection,
+        lexical_index: ObsidianLexicalIndex,
+        candidates: int = 20,
+        rrf_k: int = 60,
+        lexical_prefilter: bool = False,
+        lexical_prefilter_min_chunks: int = 50000,
+        lexical_prefilter_candidates: int = 500,
+    ):
+        self.collection = collection
+        self.lexical_index = lexical_index
+        self.candidates = candidates
+        self.rrf_k = rrf_k
+        self.lexical_prefilter = lexical_prefilter
+        self.lexical_prefilter_min_chunks = lexical_prefilter_min_chunks
+        self.lexical_prefilter_candidates = lexical_prefilter_candidates
+
+    def retrieve(
+        self, query: str, num_results: int, query_embedding=None
+    ) -> list[RetrievedChunk]:
+        """
+        Retrieve the num_results best chunks, with their normalized RRF score.
+        The query is embedded by the collection unless query_embedding is given.
+        """
+        candidates = max(self.candidates, num_results)
+        use_prefilter = (
+            self.lexical_prefilter
+            and self.collection.count() >= self.lexical_prefilter_min_chunks
+        )
+        lexical_chunks = self.lexical_index.search(
+            query, self.lexical_prefilter_candidates if use_prefilter else candidates
+        )
+        prefilter_ids = (
+            [chunk.chunk_id for chunk in lexical_chunks] if use_prefilter else None
+        )
+        vector_chunks = self.vector_search(
+            query, candidates, prefilter_ids, query_embedding
+        )
+        logger.debug(
+            f"Retrieved {len(vector_chunks)} vector and {len(lexical_chunks)} lexical"
+            " candidates"
+        )
+        return self.fuse([vector_chunks, lexical_chunks[:candidates]])[:num_results]
+
+    def vector_search(
+        self, query: str, limit: int, ids: list[str] = None, query_embedding=None
+    ) -> list[RetrievedChunk]:
+        if query_embedding is None:
+            query_args = {"query_texts": [query]}
+        else:
+            query_args = {"query_embeddings": [query_embedding]}
+        results = self.collection.query(
+            **query_args,
+            n_results=limit,
+            # no lexical match, search the whole collection
+            ids=ids or None,
+            include=["documents", "metadatas", "distances"],
+        )
+        if not results or not results["ids"]:
+            return []
+        # Chroma returns a list per query, we only have 1 query
+        return [
+            RetrievedChunk(
+                chunk_id,
+                (metadata or {}).get("file_path", ""),
+                (metadata or {}).get("heading", ""),
+                document,
+                -distance,
+                vector_score=-distance,
+            )
+            for chunk_id, document, metadata, distance in zip(
+                results["ids"][0],
+                results["documents"][0],
+                results["metadatas"][0],
+                results["distances"][0],
+                strict=True,
+            )
+        ]
+
+    def fuse(self, rankings: list[list[RetrievedChunk]]) -> list[RetrievedChunk]:
+        return fuse_rankings(rankings, self.rrf_k)
+
+
+def fuse_rankings(
+    rankings: list[list[RetrievedChunk]], rrf_k: int = 60
+) -> list[RetrievedChunk]:
+    """
+    Reciprocal rank fusion: score = sum over rankings of 1 / (rrf_k + rank),
+    divided by the score of a chunk ranked first in all rankings.
+    Chunks are identified by vault and chunk id, and keep their vector score.
+    """
+    max_score = len(rankings) / (rrf_k + 1)
+    fused: dict[tuple[str, str], RetrievedChunk] = {}
+    for ranking in rankings:
+        for rank, chunk in enumerate(ranking, start=1):
+            score = 1 / (rrf_k + rank) / max_score
+            key = (chunk.vault_name, chunk.chunk_id)
+            if key not in fused:
+                fused[key] = replace(chunk, score=score)
+                continue
+            fused[key].score += score
+            if fused[key].vector_score is None:
+                fused[key].vector_score = chunk.vector_score
+    return sorted(fused.values(), key=lambda chunk: chunk.score, reverse=True)
@@ -0,0 +1,87 @@
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+HEADING_PATTERN = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+CODE_FENCE_PATTERN = re.compile(r"^\s*(```|~~~)")
+
+
+class MarkdownChunker:
+    """
+    Splits markdown notes into heading-aware chunks.
+
+    A note is split into sections at headings (outside code blocks), and every chunk
+    keeps the path of headings it belongs to, e.g. "Roadmap > Q3". Sections longer than
+    chunk_size characters are split at paragraph, line or word boundaries, with
+    chunk_overlap characters of overlap between consecutive chunks.
+    """
+
+    def __init__(self, chunk_size: int = 1000, chunk_overlap: int = 100):
+        assert chunk_overlap < chunk_size, (
+            "chunk_overlap must be smaller than chunk_size"
+        )
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+
+    def split(self, text: str) -> list[tuple[str, str]]:
+        """
+        Split a note into chunks.
+
+        Returns:
+            List of (heading path, chunk text)
+        """
+        chunks = []
+        for heading, section in self.split_sections(text):
+            for chunk in self.split_section(section):
+                if chunk.strip():
+                    chunks.append((heading, chunk.strip()))
+        return chunks
+
+    def split_sections(self, text: str) -> list[tuple[str, str]]:
+        sections = []
+        heading_stack: list[tuple[int, str]] = []
+        section_lines: list[str] = []
+        in_code_block = False
+
+        def flush():
+            if section_lines:
+                heading = " > ".join(title for _, title in heading_stack)
+                sections.append((heading, "".join(section_lines)))
+
+        for line in text.splitlines(keepends=True):
+            if CODE_FENCE_PATTERN.match(line):
+                in_code_block = not in_code_block
+            match = None if in_code_block else HEADING_PATTERN.match(line)
+            if match:
+                flush()
+                level = len(match.group(1))
+                while heading_stack and heading_stack[-1][0] >= level:
+                    heading_stack.pop()
+                heading_stack.append((level, match.group(2)))
+                section_lines = [line]
+            else:
+                section_lines.append(line)
+        flush()
+        return sections
+
+    def split_section(self, text: str) -> list[str]:
+        if len(text) <= self.chunk_size:
+            return [text]
+        chunks = []
+        start = 0
+        while start < len(text):
+            end = min(start + self.chunk_size, len(text))
+            if end < len(text):
+                # prefer breaking at a paragraph, then a line, then a word in the
+                # second half of the chunk
+                for separator in ("\n\n", "\n", " "):
+                    cut = text.rfind(separator, start + self.chunk_size // 2, end)
+                    if cut != -1:
+                        end = cut + len(separator)
+                        break
+            chunks.append(text[start:end])
+            if end >= len(text):
+                break
+            start = max(end - self.chunk_overlap, start + 1)
+        return chunks
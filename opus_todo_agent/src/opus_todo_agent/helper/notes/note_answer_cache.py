@@ -0,0 +1,219 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+from opus_todo_agent.models.notes.obsidian_models import CachedNoteAnswer
+
+logger = logging.getLogger(__name__)
+
+
+class NoteAnswerCache:
+    """
+    Semantic cache of notes answers, persisted in SQLite next to the vector db.
+
+    An answer is returned for queries whose embedding has a cosine similarity of at
+    least similarity_threshold with a cached query, if the caller confirms that the
+    chunks the answer is based on are unchanged. The least recently used answers are
+    evicted beyond max_entries. Answers are bound to the embedding model of their query
+    embeddings, answers of other models are dropped when the cache is loaded.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        embedding_model: str,
+        similarity_threshold: float = 0.95,
+        max_entries: int = 500,
+    ):
+        self.embedding_model = embedding_model
+        self.similarity_threshold = similarity_threshold
+        self.max_entries = max_entries
+        db_path = Path(db_path).expanduser()
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(db_path, check_same_thread=False)
+        self.connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS answers (
+                query TEXT PRIMARY KEY,
+                query_embedding BLOB NOT NULL,
+                chunk_ids TEXT NOT NULL,
+                chunk_hashes TEXT NOT NULL,
+                index_version INTEGER NOT NULL,
+                answer TEXT NOT NULL,
+                last_used_at REAL NOT NULL,
+                embedding_model TEXT NOT NULL DEFAULT ''
+            )
+            """
+        )
+        columns = [
+            row[1] for row in self.connection.execute("PRAGMA table_info(answers)")
+        ]
+        if "embedding_model" not in columns:
+            # caches created before answers were bound to a model
+            self.connection.execute(
+                "ALTER TABLE answers"
+                " ADD COLUMN embedding_model TEXT NOT NULL DEFAULT ''"
+            )
+        deleted = self.connection.execute(
+            "DELETE FROM answers WHERE embedding_model != ?", (embedding_model,)
+        ).rowcount
+        if deleted:
+            logger.info(f"Dropped {deleted} cached answers of other embedding models")
+        self.connection.commit()
+        self.lock = threading.Lock()
+        self.entries: OrderedDict[str, CachedNoteAnswer] = self._load()
+        # matrix of the cached query embeddings, rebuilt after changes
+        self.embeddings: np.ndarray | None = None
+        self._evict()
+
+    @staticmethod
+    def get_default_path(vector_db_path: str, collection_name: str) -> str:
+        """Answer cache path next to the vector db directory, vaults share vector dbs"""
+        vector_db_path = Path(vector_db_path).expanduser()
+        return str(
+            vector_db_path.parent
+            / f"{vector_db_path.name}.{collection_name}.answer_cache.db"
+        )
+
+    def _load(self) -> OrderedDict[str, CachedNoteAnswer]:
+        rows = self.connection.execute(
+            "SELECT query, query_embedding, chunk_ids, chunk_hashes, index_version,"
+            " answer, last_used_at FROM answers ORDER BY last_used_at"
+        ).fetchall()
+        return OrderedDict(
+            (
+                query,
+                CachedNoteAnswer(
+                    query,
+                    np.frombuffer(query_embedding, dtype=np.float32).tolist(),
+                    json.loads(chunk_ids),
+                    json.loads(chunk_hashes),
+                    index_version,
+                    answer,
+                    last_used_at,
+                ),
+            )
+            for (
+                query,
+                query_embedding,
+                chunk_ids,
+                chunk_hashes,
+                index_version,
+                answer,
+                last_used_at,
+            ) in rows
+        )
+
+    def get(
+        self, query_embedding: list[float], is_valid: Callable[[CachedNoteAnswer], bool]
+    ) -> CachedNoteAnswer | None:
+        """
+        Most similar cached answer above the similarity threshold.
+        Answers rejected by is_valid, e.g. because their chunks changed, are removed.
+        """
+        with self.lock:
+            if not self.entries:
+                return None
+            if self.embeddings is None:
+                self.embeddings = np.array(
+                    [entry.query_embedding for entry in self.entries.values()],
+                    dtype=np.float32,
+                )
+            if self.embeddings.shape[1] != len(query_embedding):
+                logger.warning(
+                    f"Query embedding has {len(query_embedding)} dimensions, cached "
+                    f"answers have {self.embeddings.shape[1]}, skipping the cache"
+                )
+                return None
+            similarities = self.embeddings @ self.normalize(query_embedding)
+            best = int(np.argmax(similarities))
+            if similarities[best] < self.similarity_threshold:
+                return None
+            entry = list(self.entries.values())[best]
+        if not is_valid(entry):
+            logger.info(f"Dropping outdated cached answer for query: {entry.query}")
+            self.delete(entry.query)
+            return None
+        logger.info(
+            f"Cache hit for similar query: {entry.query}"
+            f" (similarity {similarities[best]:.3f})"
+        )
+        with self.lock:
+            entry.last_used_at = time.time()
+            if entry.query in self.entries:
+                self.entries.move_to_end(entry.query)
+                self.embeddings = None
+            self._save(entry)
+        return entry
+
+    def put(
+        self,
+        query: str,
+        query_embedding: list[float],
+        chunk_hashes: dict[str, str],
+        index_version: int,
+        answer: str,
+    ):
+        entry = CachedNoteAnswer(
+            query,
+            self.normalize(query_embedding).tolist(),
+            list(chunk_hashes),
+            chunk_hashes,
+            index_version,
+            answer,
+            time.time(),
+        )
+        with self.lock:
+            self.entries.pop(query, None)
+            self.entries[query] = entry
+            self.embeddings = None
+            self._save(entry)
+            self._evict()
+
+    def delete(self, query: str):
+        with self.lock:
+            if self.entries.pop(query, None) is not None:
+                self.embeddings = None
+            self.connection.execute("DELETE FROM answers WHERE query = ?", (query,))
+            self.connection.commit()
+
+    def _save(self, entry: CachedNoteAnswer):
+        self.connection.execute(
+            "INSERT OR REPLACE INTO answers VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                entry.query,
+                np.asarray(entry.query_embedding, dtype=np.float32).tobytes(),
+                json.dumps(entry.chunk_ids),
+                json.dumps(entry.chunk_hashes),
+                entry.index_version,
+                entry.answer,
+                entry.last_used_at,
+                self.embedding_model,
+            ),
+        )
+        self.connection.commit()
+
+    def _evict(self):
+        evicted = []
+        while len(self.entries) > self.max_entries:
+            query, _ = self.entries.popitem(last=False)
+            evicted.append((query,))
+        if evicted:
+            self.embeddings = None
+            self.connection.executemany("DELETE FROM answers WHERE query = ?", evicted)
+            self.connection.commit()
+
+    @staticmethod
+    def normalize(embedding) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def close(self):
+        self.connection.close()
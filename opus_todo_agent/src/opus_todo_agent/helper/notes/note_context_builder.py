@@ -0,0 +1,113 @@
+import logging
+import os
+
+from opus_agent_base.common.tokenizer import get_tokenizer
+from opus_todo_agent.models.notes.obsidian_models import (
+    NoteCitation,
+    NoteContext,
+    RetrievedChunk,
+)
+
+logger = logging.getLogger(__name__)
+
+# shortest overlap between consecutive chunks of a note that is trimmed
+MIN_OVERLAP_CHARS = 32
+
+
+class NoteContextBuilder:
+    """
+    Assembles the context of a notes question from retrieved chunks.
+
+    Duplicate chunks are dropped and the overlap between consecutive chunks of a note is
+    trimmed. Chunks are packed best score first until max_context_tokens is reached, and
+    every chunk is numbered so the answer can cite its source (file path and heading).
+    """
+
+    def __init__(
+        self,
+        max_context_tokens: int = 3000,
+        encoding_name: str = "cl100k_base",
+        min_chunk_tokens: int = 100,
+    ):
+        self.max_context_tokens = max_context_tokens
+        self.encoding_name = encoding_name
+        self.min_chunk_tokens = min_chunk_tokens
+
+    def build(self, chunks: list[RetrievedChunk]) -> NoteContext:
+        tokenizer = get_tokenizer()
+        blocks = []
+        citations = []
+        token_count = 0
+        selected_texts: dict[str, list[str]] = {}
+        for chunk in sorted(chunks, key=lambda chunk: chunk.score, reverse=True):
+            text = self.deduplicate(chunk, selected_texts.get(chunk.file_path, []))
+            if not text:
+                continue
+            number = len(citations) + 1
+            block = f"[{number}] {self.get_source(chunk)}\n{text}"
+            tokens = tokenizer.encode(block, self.encoding_name)
+            remaining_tokens = self.max_context_tokens - token_count
+            if len(tokens) > remaining_tokens:
+                if remaining_tokens < self.min_chunk_tokens:
+                    break
+                # truncate the chunk to fill the rest of the budget
+                tokens = tokens[:remaining_tokens]
+                block = tokenizer.decode(tokens, self.encoding_name)
+            blocks.append(block)
+            citations.append(
+                NoteCitation(
+                    number,
+                    chunk.chunk_id,
+                    chunk.file_path,
+                    chunk.heading,
+                    chunk.score,
+                    chunk.vault_name,
+                )
+            )
+            selected_texts.setdefault(chunk.file_path, []).append(chunk.text)
+            token_count += len(tokens)
+        logger.info(
+            f"Assembled context of {token_count} tokens from {len(citations)} of"
+            f" {len(chunks)} chunks"
+        )
+        return NoteContext("\n\n".join(blocks), citations, token_count)
+
+    def deduplicate(self, chunk: RetrievedChunk, selected_texts: list[str]) -> str:
+        """
+        Text of the chunk without the parts already in selected chunks of the same note.
+        Returns an empty string for duplicates.
+        """
+        text = chunk.text
+        for selected_text in selected_texts:
+            if text in selected_text:
+                return ""
+            if selected_text in text:
+                # keep the new part of a chunk containing a selected chunk
+                text = text.replace(selected_text, "").strip()
+                continue
+            text = self.trim_overlap(selected_text, text)
+        return text
+
+    def trim_overlap(self, previous_text: str, text: str) -> str:
+        """Remove the start of text that repeats the end of previous_text"""
+        if len(text) < MIN_OVERLAP_CHARS:
+            return text
+        anchor = text[:MIN_OVERLAP_CHARS]
+        start = previous_text.find(anchor)
+        while start != -1:
+            overlap = previous_text[start:]
+            if text.startswith(overlap):
+                return text[len(overlap) :].strip()
+            start = previous_text.find(anchor, start + 1)
+        return text
+
+    def get_source(self, chunk: RetrievedChunk) -> str:
+        file_name = os.path.basename(chunk.file_path)
+        return f"{file_name} > {chunk.heading}" if chunk.heading else file_name
+
+    def format_citations(self, context: NoteContext) -> str:
+        return "\n".join(
+            f"[{citation.number}] {citation.file_path}"
+            + (f" > {citation.heading}" if citation.heading else "")
+            for citation in context.citations
+        )
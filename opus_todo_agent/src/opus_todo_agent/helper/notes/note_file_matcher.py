@@ -0,0 +1,45 @@
+import fnmatch
+import os
+import re
+
+
+class NoteFileMatcher:
+    """
+    Matches markdown notes of a vault against exclude_dirs and exclude_files.
+
+    exclude_dirs are regex patterns searched in the file path, exclude_files are
+    file name patterns (e.g. "ignore.md" or "*.excalidraw.md"). All patterns are
+    compiled once into a single regex each.
+    """
+
+    def __init__(self, exclude_dirs: list[str] = None, exclude_files: list[str] = None):
+        self.exclude_dirs_pattern = self._combine(
+            [f"(?:{pattern})" for pattern in exclude_dirs or []]
+        )
+        self.exclude_files_pattern = self._combine(
+            [fnmatch.translate(pattern) for pattern in exclude_files or []]
+        )
+
+    def is_note_file(self, file_path: str) -> bool:
+        if not file_path.endswith(".md"):
+            return False
+        if self.exclude_dirs_pattern is not None and self.exclude_dirs_pattern.search(
+            file_path
+        ):
+            return False
+        if self.exclude_files_pattern is not None and self.exclude_files_pattern.match(
+            os.path.basename(file_path)
+        ):
+            return False
+        return True
+
+    def is_excluded_dir(self, dir_path: str) -> bool:
+        """Check if a whole directory can be skipped while walking the vault"""
+        return self.exclude_dirs_pattern is not None and bool(
+            self.exclude_dirs_pattern.search(dir_path + os.sep)
+        )
+
+    def _combine(self, patterns: list[str]):
+        if not patterns:
+            return None
+        return re.compile("|".join(patterns))
@@ -0,0 +1,159 @@
+import hashlib
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+
+from opus_todo_agent.helper.notes.markdown_chunker import MarkdownChunker
+from opus_todo_agent.models.notes.obsidian_models import NoteChunk, PreparedNote
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+
+
+def prepare_note(
+    file_path: str, known_hash: str | None, chunk_size: int, chunk_overlap: int
+) -> PreparedNote:
+    """
+    Read, hash and chunk a note. Runs in a worker process or thread.
+    The note is not chunked if its hash matches known_hash.
+    """
+    stat = os.stat(file_path)
+    with open(file_path, encoding="utf-8") as f:
+        content = f.read()
+    note_hash = hashlib.md5(content.encode()).hexdigest()
+    chunks = None
+    if note_hash != known_hash:
+        chunker = MarkdownChunker(chunk_size, chunk_overlap)
+        chunks = [
+            NoteChunk(file_path, chunk_index, heading, text, note_hash)
+            for chunk_index, (heading, text) in enumerate(chunker.split(content))
+        ]
+    return PreparedNote(file_path, stat.st_mtime_ns, stat.st_size, note_hash, chunks)
+
+
+class NoteIngestPipeline:
+    """
+    Parallel ingest stage of the Obsidian indexer.
+
+    Notes are read, hashed and chunked in a pool of worker processes (or threads) and
+    handed over to the upsert stage in order through a bounded queue, so reading runs
+    ahead of upserting by at most queue_size notes.
+    """
+
+    def __init__(
+        self,
+        chunk_size: int,
+        chunk_overlap: int,
+        workers: int = None,
+        executor_type: str = "process",
+        queue_size: int = 256,
+    ):
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.workers = workers or os.cpu_count() or 1
+        self.executor_type = executor_type
+        self.queue_size = queue_size
+
+    def run(
+        self, notes: Iterable[tuple[str, str | None]], parallel: bool = True
+    ) -> Iterator[PreparedNote]:
+        """
+        Prepare notes given as (file path, known content hash).
+        Notes that can't be read are logged and skipped.
+        """
+        if not parallel or self.workers <= 1:
+            for file_path, known_hash in notes:
+                prepared_note = self._prepare(
+                    partial(
+                        prepare_note,
+                        file_path,
+                        known_hash,
+                        self.chunk_size,
+                        self.chunk_overlap,
+                    ),
+                    file_path,
+                )
+                if prepared_note is not None:
+                    yield prepared_note
+            return
+
+        prepared_notes: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        stopped = threading.Event()
+        producer = threading.Thread(
+            target=self._produce, args=(notes, prepared_notes, stopped), daemon=True
+        )
+        producer.start()
+        try:
+            while True:
+                item = prepared_notes.get()
+                if item is _DONE:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                file_path, future = item
+                prepared_note = self._prepare(future.result, file_path)
+                if prepared_note is not None:
+                    yield prepared_note
+        finally:
+            # stop the producer if the upsert stage stopped early
+            stopped.set()
+            producer.join()
+
+    def _produce(self, notes, prepared_notes: queue.Queue, stopped: threading.Event):
+        def put(item) -> bool:
+            while not stopped.is_set():
+                try:
+                    prepared_notes.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        try:
+            with self._create_executor() as executor:
+                in_flight: deque[tuple[str, Future]] = deque()
+                for file_path, known_hash in notes:
+                    future = executor.submit(
+                        prepare_note,
+                        file_path,
+                        known_hash,
+                        self.chunk_size,
+                        self.chunk_overlap,
+                    )
+                    in_flight.append((file_path, future))
+                    # keep the workers busy, the bounded queue applies backpressure
+                    if len(in_flight) < self.workers * 2:
+                        continue
+                    if not put(in_flight.popleft()):
+                        break
+                while in_flight and put(in_flight.popleft()):
+                    pass
+                if stopped.is_set():
+                    for _, future in in_flight:
+                        future.cancel()
+        except BaseException as e:
+            put(e)
+        finally:
+            put(_DONE)
+
+    def _create_executor(self):
+        if self.executor_type == "thread":
+            return ThreadPoolExecutor(max_workers=self.workers)
+        # spawn, forking a process with running threads (chromadb, asyncio) is not safe
+        return ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+        )
+
+    def _prepare(self, prepare, file_path: str) -> PreparedNote | None:
+        try:
+            return prepare()
+        except (OSError, UnicodeDecodeError) as e:
+            logger.warning(f"Skipping note {file_path}: {e}")
+            return None
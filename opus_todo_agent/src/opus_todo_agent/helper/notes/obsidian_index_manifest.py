@@ -0,0 +1,100 @@
+import json
+import logging
+import sqlite3
+from pathlib import Path
+
+from opus_todo_agent.models.notes.obsidian_models import NoteManifestEntry
+
+logger = logging.getLogger(__name__)
+
+
+class ObsidianIndexManifest:
+    """
+    Local manifest of indexed Obsidian notes:
+    file path -> (mtime, size, content hash, chunk ids).
+
+    Lets the indexer skip unchanged notes with a stat call, without reading them or
+    querying the vector database, and find the chunks of changed and removed notes.
+    """
+
+    def __init__(self, db_path: str):
+        db_path = Path(db_path).expanduser()
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(db_path, check_same_thread=False)
+        self.connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS notes (
+                file_path TEXT PRIMARY KEY,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                content_hash TEXT NOT NULL,
+                chunk_ids TEXT NOT NULL
+            )
+            """
+        )
+        self.connection.commit()
+
+    @staticmethod
+    def get_default_path(vector_db_path: str, collection_name: str) -> str:
+        """Manifest path next to the vector db directory, vaults share vector dbs"""
+        vector_db_path = Path(vector_db_path).expanduser()
+        return str(
+            vector_db_path.parent
+            / f"{vector_db_path.name}.{collection_name}.manifest.db"
+        )
+
+    def count(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM notes").fetchone()[0]
+
+    def load_all(self) -> dict[str, NoteManifestEntry]:
+        rows = self.connection.execute(
+            "SELECT file_path, mtime_ns, size, content_hash, chunk_ids FROM notes"
+        ).fetchall()
+        return {
+            file_path: NoteManifestEntry(
+                file_path, mtime_ns, size, content_hash, json.loads(chunk_ids)
+            )
+            for file_path, mtime_ns, size, content_hash, chunk_ids in rows
+        }
+
+    def get_many(self, file_paths: list[str]) -> dict[str, NoteManifestEntry]:
+        entries = {}
+        # stay below SQLite's limit of query parameters
+        for start in range(0, len(file_paths), 500):
+            batch = file_paths[start : start + 500]
+            rows = self.connection.execute(
+                "SELECT file_path, mtime_ns, size, content_hash, chunk_ids FROM notes "
+                f"WHERE file_path IN ({','.join('?' * len(batch))})",
+                batch,
+            ).fetchall()
+            for file_path, mtime_ns, size, content_hash, chunk_ids in rows:
+                entries[file_path] = NoteManifestEntry(
+                    file_path, mtime_ns, size, content_hash, json.loads(chunk_ids)
+                )
+        return entries
+
+    def put_many(self, entries: list[NoteManifestEntry]):
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO notes VALUES (?, ?, ?, ?, ?)",
+            [
+                (
+                    entry.file_path,
+                    entry.mtime_ns,
+                    entry.size,
+                    entry.content_hash,
+                    json.dumps(entry.chunk_ids),
+                )
+                for entry in entries
+            ],
+        )
+        self.connection.commit()
+
+    def delete_many(self, file_paths: list[str]):
+        self.connection.executemany(
+            "DELETE FROM notes WHERE file_path = ?",
+            [(file_path,) for file_path in file_paths],
+        )
+        self.connection.commit()
+
+    def close(self):
+        self.connection.close()
@@ -0,0 +1,173 @@
+import hashlib
+import logging
+import re
+import sqlite3
+import threading
+from pathlib import Path
+
+from opus_todo_agent.models.notes.obsidian_models import NoteChunk, RetrievedChunk
+
+logger = logging.getLogger(__name__)
+
+# words, keeping ticket ids like ABC-123 or file names like v1.2 together
+QUERY_TERM_PATTERN = re.compile(r"\w+(?:[-_./]\w+)*")
+
+
+class ObsidianLexicalIndex:
+    """
+    Local BM25 index of Obsidian note chunks, kept next to the vector db.
+
+    Backed by an SQLite FTS5 table, so exact terms like ticket ids and people's names
+    can be found even when the embeddings don't rank them close to the query. The
+    indexer updates it together with the vector db collection, and every update
+    increments the index version.
+    """
+
+    def __init__(self, db_path: str):
+        db_path = Path(db_path).expanduser()
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(db_path, check_same_thread=False)
+        # the connection is shared by worker threads
+        self.lock = threading.Lock()
+        # readers (RAG) don't block the writer (indexer)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS chunks (
+                rowid INTEGER PRIMARY KEY,
+                chunk_id TEXT NOT NULL UNIQUE,
+                file_path TEXT NOT NULL,
+                heading TEXT NOT NULL,
+                text TEXT NOT NULL
+            );
+            CREATE VIRTUAL TABLE IF NOT EXISTS chunks_fts USING fts5(
+                heading,
+                text,
+                content='chunks',
+                content_rowid='rowid',
+                tokenize='unicode61'
+            );
+            CREATE TRIGGER IF NOT EXISTS chunks_after_insert
+            AFTER INSERT ON chunks BEGIN
+                INSERT INTO chunks_fts(rowid, heading, text)
+                VALUES (new.rowid, new.heading, new.text);
+            END;
+            CREATE TRIGGER IF NOT EXISTS chunks_after_delete
+            AFTER DELETE ON chunks BEGIN
+                INSERT INTO chunks_fts(chunks_fts, rowid, heading, text)
+                VALUES ('delete', old.rowid, old.heading, old.text);
+            END;
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            );
+            INSERT OR IGNORE INTO meta VALUES ('version', 0);
+            """
+        )
+        self.connection.commit()
+
+    @staticmethod
+    def get_default_path(vector_db_path: str, collection_name: str) -> str:
+        """Index path next to the vector db directory, vaults share vector dbs"""
+        vector_db_path = Path(vector_db_path).expanduser()
+        return str(
+            vector_db_path.parent
+            / f"{vector_db_path.name}.{collection_name}.lexical.db"
+        )
+
+    def count(self) -> int:
+        with self.lock:
+            return self.connection.execute("SELECT COUNT(*) FROM chunks").fetchone()[0]
+
+    def upsert_chunks(self, chunks: list[NoteChunk]):
+        self.upsert(
+            [(chunk.id, chunk.file_path, chunk.heading, chunk.text) for chunk in chunks]
+        )
+
+    def upsert(self, rows: list[tuple[str, str, str, str]]):
+        """Upsert rows of (chunk id, file path, heading, text)"""
+        with self.lock:
+            self._delete(chunk_id for chunk_id, _, _, _ in rows)
+            self.connection.executemany(
+                "INSERT INTO chunks (chunk_id, file_path, heading, text)"
+                " VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            self._increment_version()
+            self.connection.commit()
+
+    def delete_chunks(self, chunk_ids: list[str]):
+        with self.lock:
+            self._delete(chunk_ids)
+            self._increment_version()
+            self.connection.commit()
+
+    def _delete(self, chunk_ids):
+        self.connection.executemany(
+            "DELETE FROM chunks WHERE chunk_id = ?",
+            [(chunk_id,) for chunk_id in chunk_ids],
+        )
+
+    def _increment_version(self):
+        self.connection.execute(
+            "UPDATE meta SET value = value + 1 WHERE key = 'version'"
+        )
+
+    def get_version(self) -> int:
+        """Index version, changes whenever chunks are upserted or deleted"""
+        with self.lock:
+            return self.connection.execute(
+                "SELECT value FROM meta WHERE key = 'version'"
+            ).fetchone()[0]
+
+    def get_chunk_hashes(self, chunk_ids: list[str]) -> dict[str, str]:
+        """Content hash of the given chunks, missing chunks are left out"""
+        with self.lock:
+            placeholders = ",".join("?" * len(chunk_ids))
+            rows = self.connection.execute(
+                f"SELECT chunk_id, text FROM chunks WHERE chunk_id IN ({placeholders})",
+                chunk_ids,
+            ).fetchall()
+        return {
+            chunk_id: hashlib.md5(text.encode()).hexdigest() for chunk_id, text in rows
+        }
+
+    def search(self, query: str, limit: int) -> list[RetrievedChunk]:
+        """
+        Search chunks matching any term of the query, best BM25 score first
+        """
+        match_query = self.get_match_query(query)
+        if not match_query:
+            return []
+        try:
+            with self.lock:
+                rows = self.connection.execute(
+                    """
+                    SELECT chunks.chunk_id, chunks.file_path, chunks.heading,
+                        chunks.text, bm25(chunks_fts)
+                    FROM chunks_fts JOIN chunks ON chunks.rowid = chunks_fts.rowid
+                    WHERE chunks_fts MATCH ?
+                    ORDER BY bm25(chunks_fts)
+                    LIMIT ?
+                    """,
+                    (match_query, limit),
+                ).fetchall()
+        except sqlite3.OperationalError as e:
+            logger.warning(f"Lexical search failed for query {query!r}: {e}")
+            return []
+        # bm25() is negative, lower is better
+        return [
+            RetrievedChunk(chunk_id, file_path, heading, text, -bm25_score)
+            for chunk_id, file_path, heading, text, bm25_score in rows
+        ]
+
+    @staticmethod
+    def get_match_query(query: str) -> str:
+        """FTS5 query matching any of the query terms, each term quoted as a phrase"""
+        terms = dict.fromkeys(
+            term.lower() for term in QUERY_TERM_PATTERN.findall(query)
+        )
+        return " OR ".join(f'"{term}"' for term in terms)
+
+    def close(self):
+        self.connection.close()
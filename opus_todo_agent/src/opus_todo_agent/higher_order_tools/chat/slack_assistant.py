@@ -1,8 +1,8 @@
 import logging
 
-from pydantic_ai import Agent
-
+from opus_agent_base.common.tokenizer import get_tokenizer
 from opus_todo_agent.helper.chat.slack_helper import SlackHelper
+from pydantic_ai import Agent
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +17,7 @@ class SlackAssistant:
         self.instructions_manager = instructions_manager
         self.model_manager = model_manager
         self.slack_helper = SlackHelper()
+        self.tokenizer = get_tokenizer()
         self._init_agent()
 
     def _init_agent(self):
@@ -85,11 +86,25 @@ class SlackAssistant:
             logger.error(f"No conversation history found for channels: {channels}")
             return ""
 
+        conversation_history = str(conversation_history)
         logger.info(
-            f"Retrieved conversation history: {len(str(conversation_history))} chars"
+            f"Retrieved conversation history: {len(conversation_history)} chars, "
+            f"~{self.tokenizer.count_tokens_approx(conversation_history)} tokens"
         )
 
-        # FIXME: if conversation history is too large, summarize per channel and truncate it if required
+        # FIXME: if conversation history is too large, summarize per channel
+        max_history_tokens = self.config_manager.get_setting(
+            "chat.slack.max_conversation_history_tokens", 0
+        )
+        if max_history_tokens > 0 and not self.tokenizer.fits(
+            conversation_history, max_history_tokens
+        ):
+            conversation_history = self.tokenizer.truncate(
+                conversation_history, max_history_tokens
+            )
+            logger.info(
+                f"Truncated conversation history: {len(conversation_history)} chars"
+            )
 
         # Build channel ID to name mapping for the specific channels
         channel_mapping = "\n".join(
@@ -105,7 +120,7 @@ class SlackAssistant:
             channel_scope_type=channel_scope_type,
             channel_scope_name=channel_scope_name,
             time_limit=time_limit,
-            conversation_history=str(conversation_history),
+            conversation_history=conversation_history,
             channel_id_to_name_mapping=channel_mapping,
         )
 
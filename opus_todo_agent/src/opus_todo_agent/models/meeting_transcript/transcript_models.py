@@ -0,0 +1,52 @@
+from dataclasses import dataclass, field
+
+
+@dataclass
+class TranscriptCue:
+    """Represents a cue of a VTT or SRT transcript"""
+
+    start_seconds: float
+    end_seconds: float
+    speaker: str
+    text: str
+
+
+@dataclass
+class TranscriptSegment:
+    """Represents consecutive cues of the same speaker merged into one segment"""
+
+    start_seconds: float
+    end_seconds: float
+    speaker: str
+    text: str
+
+
+@dataclass
+class Transcript:
+    """Represents a parsed meeting transcript"""
+
+    meeting_id: str
+    segments: list[TranscriptSegment] = field(default_factory=list)
+
+    @property
+    def speakers(self) -> list[str]:
+        return list(
+            dict.fromkeys(
+                segment.speaker for segment in self.segments if segment.speaker
+            )
+        )
+
+    @property
+    def duration_seconds(self) -> float:
+        return self.segments[-1].end_seconds if self.segments else 0.0
+
+
+@dataclass
+class RetrievedTranscriptSegment:
+    """Represents a transcript segment retrieved for a question, with its fused score"""
+
+    start_seconds: float
+    end_seconds: float
+    speaker: str
+    text: str
+    score: float
@@ -0,0 +1,121 @@
+import hashlib
+from dataclasses import dataclass
+
+
+@dataclass
+class NoteChunk:
+    """Represents a chunk of an Obsidian note indexed in the vector database"""
+
+    file_path: str
+    chunk_index: int
+    heading: str
+    text: str
+    note_hash: str
+
+    @property
+    def id(self) -> str:
+        """Deterministic id, so reindexing a note overwrites its chunks"""
+        return get_chunk_id(self.file_path, self.chunk_index)
+
+    @property
+    def metadata(self) -> dict:
+        return {
+            "file_path": self.file_path,
+            "chunk_index": self.chunk_index,
+            "heading": self.heading,
+            "md5_hash": self.note_hash,
+        }
+
+
+def get_chunk_id(file_path: str, chunk_index: int) -> str:
+    file_path_hash = hashlib.sha1(file_path.encode()).hexdigest()[:16]
+    return f"{file_path_hash}:{chunk_index}"
+
+
+@dataclass
+class NoteManifestEntry:
+    """Represents the indexed state of an Obsidian note in the index manifest"""
+
+    file_path: str
+    mtime_ns: int
+    size: int
+    content_hash: str
+    chunk_ids: list[str]
+
+
+@dataclass
+class VaultWatcherMetrics:
+    """Represents the indexing metrics of a watched Obsidian vault"""
+
+    vault_name: str
+    queue_depth: int = 0
+    last_lag_seconds: float = 0.0
+    max_lag_seconds: float = 0.0
+    batches_indexed: int = 0
+    files_indexed: int = 0
+    last_indexed_at: float = 0.0
+
+
+@dataclass
+class PreparedNote:
+    """Represents a note read, hashed and chunked by the ingest pipeline"""
+
+    file_path: str
+    mtime_ns: int
+    size: int
+    content_hash: str
+    # None if the content hash matches the already indexed note
+    chunks: list[NoteChunk] | None
+
+
+@dataclass
+class RetrievedChunk:
+    """Represents a note chunk retrieved for a query"""
+
+    chunk_id: str
+    file_path: str
+    heading: str
+    text: str
+    # higher is better, the scale depends on the retriever
+    score: float
+    # set when chunks of several vaults are merged
+    vault_name: str = ""
+    # negative distance of the vector search, None for chunks only found by the lexical
+    # search
+    vector_score: float | None = None
+
+
+@dataclass
+class NoteCitation:
+    """Represents the source of a chunk in the context of a notes answer"""
+
+    number: int
+    chunk_id: str
+    file_path: str
+    heading: str
+    score: float
+    vault_name: str = ""
+
+
+@dataclass
+class NoteContext:
+    """Represents the context assembled from retrieved chunks for a notes question"""
+
+    text: str
+    citations: list[NoteCitation]
+    token_count: int
+
+
+@dataclass
+class CachedNoteAnswer:
+    """Represents a notes answer in the answer cache"""
+
+    query: str
+    # normalized query embedding
+    query_embedding: list[float]
+    chunk_ids: list[str]
+    # content hash of the chunks the answer is based on
+    chunk_hashes: dict[str, str]
+    index_version: int
+    answer: str
+    last_used_at: float
@@ -1,9 +1,13 @@
 from opus_agent_base.agent.agent_builder import AgentBuilder
+from opus_agent_base.background_jobs.background_job import BackgroundJob
 from opus_agent_base.config.config_manager import ConfigManager
 from opus_agent_base.tools.custom_tool import CustomTool
 from opus_agent_base.tools.higher_order_tool import HigherOrderTool
 from opus_agent_base.tools.mcp_server_registry import MCPServerRegistry
 
+from opus_todo_agent.background_jobs.notes.obsidian_vault_watcher import (
+    ObsidianVaultWatcher,
+)
 from opus_todo_agent.custom_tools.meeting_transcript.loom_tools import LoomTools
 from opus_todo_agent.custom_tools.meeting_transcript.zoom_tools import ZoomTools
 from opus_todo_agent.custom_tools.notes.obsidian_tools import ObsidianTools
@@ -32,6 +36,7 @@ class TodoAgentBuilder(AgentBuilder):
         self._add_fastmcp_servers_config()
         self._add_custom_tools()
         self._add_higher_order_tools()
+        self._add_background_jobs()
         return self
 
     def _add_instructions(self):
@@ -73,6 +78,14 @@ class TodoAgentBuilder(AgentBuilder):
             "zoom_meeting_assistant_prompt_template",
             "prompt_templates/tools/productivity/ZOOM_MEETING_ASSISTANT_PROMPT_TEMPLATE.md",
         )
+        self.instructions_manager.put_from_file(
+            "meeting_transcript_map_prompt_template",
+            "prompt_templates/tools/productivity/MEETING_TRANSCRIPT_MAP_PROMPT_TEMPLATE.md",
+        )
+        self.instructions_manager.put_from_file(
+            "meeting_transcript_reduce_prompt_template",
+            "prompt_templates/tools/productivity/MEETING_TRANSCRIPT_REDUCE_PROMPT_TEMPLATE.md",
+        )
         self.instructions_manager.put_from_file(
             "obsidian_notes_prompt_template",
             "prompt_templates/tools/productivity/OBSIDIAN_NOTES_PROMPT_TEMPLATE.md",
@@ -128,3 +141,8 @@ class TodoAgentBuilder(AgentBuilder):
                 model_manager=self.model_manager,
             ),
         ]
+
+    def _add_background_jobs(self):
+        self.background_jobs: list[BackgroundJob] = [
+            ObsidianVaultWatcher(config_manager=self.config_manager),
+        ]
@@ -0,0 +1,344 @@
+import asyncio
+import os
+
+import pytest
+from opus_agent_base.common.tokenizer import get_tokenizer
+from opus_todo_agent.background_jobs.notes.obsidian_indexer import ObsidianIndexer
+from opus_todo_agent.custom_tools.notes.obsidian_rag import ObsidianRAG
+from opus_todo_agent.helper.notes import embedding_providers
+from opus_todo_agent.helper.notes.embedding_providers import EmbeddingProvider
+from opus_todo_agent.models.notes.obsidian_models import get_chunk_id
+from pydantic_ai.messages import ModelResponse, TextPart
+from pydantic_ai.models.function import FunctionModel
+from pydantic_ai.models.test import TestModel
+
+
+class CountingEmbeddingProvider(EmbeddingProvider):
+    """Embeds texts by their length and records them, so tests don't load a model"""
+
+    provider_name = "counting"
+    embedded_texts: list[str] = []
+
+    def _embed_batch(self, texts: list[str]) -> list[list[float]]:
+        self.embedded_texts.extend(texts)
+        return [[float(len(text)), 1.0] for text in texts]
+
+
+class CountingCollection:
+    """Chroma collection that records the arguments of get calls"""
+
+    def __init__(self, collection):
+        self.collection = collection
+        self.get_calls = []
+
+    def get(self, **kwargs):
+        self.get_calls.append(kwargs)
+        return self.collection.get(**kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.collection, name)
+
+
+class FakeInstructionsManager:
+    def get(self, key):
+        return key
+
+
+class FakeModelManager:
+    def get_model(self):
+        return TestModel()
+
+
+class FakeConfigManager:
+    def __init__(self, settings: dict):
+        self.settings = settings
+
+    def get_setting(self, key, default=None):
+        return self.settings.get(key, default)
+
+
+@pytest.fixture
+def vault_path(tmp_path):
+    vault_path = tmp_path / "vault"
+    vault_path.mkdir()
+    (vault_path / "roadmap.md").write_text("# Roadmap\nQ3 hiring\n\n# Risks\nBudget\n")
+    (vault_path / "standup.md").write_text("# Standup\nShip the release\n")
+    (vault_path / "image.png").write_bytes(b"not a note")
+    return vault_path
+
+
+@pytest.fixture
+def indexer(tmp_path, vault_path, monkeypatch):
+    monkeypatch.setitem(
+        embedding_providers.PROVIDERS, "counting", CountingEmbeddingProvider
+    )
+    monkeypatch.setitem(embedding_providers.DEFAULT_MODELS, "counting", "length")
+    CountingEmbeddingProvider.embedded_texts = []
+    vault_config = {
+        "vault_name": "work",
+        "vault_path": str(vault_path),
+        "vector_db_path": str(tmp_path / "vector_db"),
+        "vector_db_collection": "work",
+        "embedding": {"provider": "counting", "model": str(tmp_path)},
+        "ingest_executor": "thread",
+        "ingest_workers": 2,
+    }
+    indexer = ObsidianIndexer(
+        FakeConfigManager({"notes.obsidian.vault_configurations": [vault_config]}),
+        "work",
+    )
+    indexer.collection = CountingCollection(indexer.collection)
+    yield indexer
+    indexer.manifest.close()
+    indexer.lexical_index.close()
+
+
+def get_indexed_chunk_ids(indexer: ObsidianIndexer) -> set[str]:
+    return set(indexer.collection.get(include=[])["ids"])
+
+
+def touch(file_path, content: str = None):
+    if content is not None:
+        file_path.write_text(content)
+    stat = os.stat(file_path)
+    # mtime resolution of some file systems is too coarse to notice a quick rewrite
+    os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+class TestObsidianIndexerManifest:
+    def test_indexes_all_notes_into_manifest(self, indexer, vault_path):
+        indexer.update_index()
+
+        roadmap_path = str(vault_path / "roadmap.md")
+        entries = indexer.manifest.load_all()
+        assert sorted(entries) == [roadmap_path, str(vault_path / "standup.md")]
+        assert entries[roadmap_path].chunk_ids == [
+            get_chunk_id(roadmap_path, 0),
+            get_chunk_id(roadmap_path, 1),
+        ]
+        assert get_indexed_chunk_ids(indexer) == {
+            chunk_id for entry in entries.values() for chunk_id in entry.chunk_ids
+        }
+
+    def test_unchanged_notes_are_skipped(self, indexer):
+        indexer.update_index()
+        CountingEmbeddingProvider.embedded_texts = []
+
+        indexer.update_index()
+
+        assert CountingEmbeddingProvider.embedded_texts == []
+
+    def test_touched_note_is_not_reindexed(self, indexer, vault_path):
+        indexer.update_index()
+        CountingEmbeddingProvider.embedded_texts = []
+        standup_path = vault_path / "standup.md"
+        touch(standup_path)
+
+        indexer.update_index()
+
+        assert CountingEmbeddingProvider.embedded_texts == []
+        entry = indexer.manifest.get_many([str(standup_path)])[str(standup_path)]
+        assert entry.mtime_ns == os.stat(standup_path).st_mtime_ns
+
+    def test_changed_note_removes_stale_chunks(self, indexer, vault_path):
+        indexer.update_index()
+        CountingEmbeddingProvider.embedded_texts = []
+        roadmap_path = vault_path / "roadmap.md"
+        touch(roadmap_path, "# Roadmap\nQ4 hiring\n")
+
+        indexer.update_index()
+
+        assert CountingEmbeddingProvider.embedded_texts == ["# Roadmap\nQ4 hiring"]
+        chunk_ids = get_indexed_chunk_ids(indexer)
+        assert get_chunk_id(str(roadmap_path), 0) in chunk_ids
+        assert get_chunk_id(str(roadmap_path), 1) not in chunk_ids
+        entry = indexer.manifest.get_many([str(roadmap_path)])[str(roadmap_path)]
+        assert entry.chunk_ids == [get_chunk_id(str(roadmap_path), 0)]
+
+    def test_deleted_note_is_removed(self, indexer, vault_path):
+        indexer.update_index()
+        standup_path = vault_path / "standup.md"
+        standup_path.unlink()
+
+        indexer.update_index()
+
+        assert str(standup_path) not in indexer.manifest.load_all()
+        assert get_chunk_id(str(standup_path), 0) not in get_indexed_chunk_ids(indexer)
+
+    def test_index_files_of_watcher(self, indexer, vault_path):
+        indexer.update_index()
+        CountingEmbeddingProvider.embedded_texts = []
+        standup_path = vault_path / "standup.md"
+        touch(standup_path, "# Standup\nFix the build\n")
+        (vault_path / "roadmap.md").unlink()
+
+        indexer.index_files(
+            [
+                str(standup_path),
+                str(vault_path / "roadmap.md"),
+                str(vault_path / "image.png"),
+            ]
+        )
+
+        assert CountingEmbeddingProvider.embedded_texts == ["# Standup\nFix the build"]
+        assert sorted(indexer.manifest.load_all()) == [str(standup_path)]
+        assert get_indexed_chunk_ids(indexer) == {get_chunk_id(str(standup_path), 0)}
+
+    def test_new_notes_of_watcher_do_not_query_vector_db(self, indexer, vault_path):
+        indexer.update_index()
+        new_note_paths = [vault_path / "new1.md", vault_path / "new2.md"]
+        for note_path in new_note_paths:
+            note_path.write_text("# New\nnote\n")
+        indexer.collection.get_calls.clear()
+
+        indexer.index_files([str(note_path) for note_path in new_note_paths])
+
+        assert indexer.collection.get_calls == []
+        assert len(indexer.manifest.load_all()) == 4
+
+
+class TestObsidianIndexerWithoutManifest:
+    """Vaults indexed before the manifest existed"""
+
+    @pytest.fixture
+    def unmanifested_indexer(self, indexer):
+        indexer.update_index()
+        indexer.manifest.delete_many(list(indexer.manifest.load_all()))
+        indexer.collection.get_calls.clear()
+        return indexer
+
+    def test_full_scan_reads_chunk_ids_of_all_notes_in_batches(
+        self, unmanifested_indexer, vault_path
+    ):
+        roadmap_path = vault_path / "roadmap.md"
+        touch(roadmap_path, "# Roadmap\nQ4 hiring\n")
+
+        unmanifested_indexer.update_index()
+
+        assert all(
+            "where" not in kwargs
+            for kwargs in unmanifested_indexer.collection.get_calls
+        )
+        assert get_chunk_id(str(roadmap_path), 1) not in get_indexed_chunk_ids(
+            unmanifested_indexer
+        )
+        assert len(unmanifested_indexer.manifest.load_all()) == 2
+
+    def test_watched_notes_read_chunk_ids_in_one_query(
+        self, unmanifested_indexer, vault_path
+    ):
+        roadmap_path = vault_path / "roadmap.md"
+        standup_path = vault_path / "standup.md"
+        touch(roadmap_path, "# Roadmap\nQ4 hiring\n")
+        touch(standup_path, "# Standup\nFix the build\n")
+
+        unmanifested_indexer.index_files([str(roadmap_path), str(standup_path)])
+
+        where_calls = [
+            kwargs
+            for kwargs in unmanifested_indexer.collection.get_calls
+            if "where" in kwargs
+        ]
+        assert where_calls == [
+            {
+                "where": {"file_path": {"$in": [str(roadmap_path), str(standup_path)]}},
+                "include": ["metadatas"],
+            }
+        ]
+        assert get_chunk_id(str(roadmap_path), 1) not in get_indexed_chunk_ids(
+            unmanifested_indexer
+        )
+
+
+class TestRecreatedCollection:
+    def test_rag_searches_recreated_collection(self, indexer):
+        indexer.update_index()
+        rag = ObsidianRAG(
+            indexer.config_manager,
+            "work",
+            FakeInstructionsManager(),
+            FakeModelManager(),
+        )
+        assert rag.retrieve_chunks("hiring", 1)[0].heading == "Roadmap"
+
+        # like create_index after the embedding model changed
+        name = indexer.collection.name
+        indexer.client.delete_collection(name)
+        indexer.collection = indexer.client.create_collection(name)
+        indexer.index_notes(force=True)
+
+        assert rag.retrieve_chunks("hiring", 1)[0].heading == "Roadmap"
+        assert rag.collection.id == indexer.collection.id
+
+
+class CountingModelManager:
+    """Model manager of a model that records the prompts it answers"""
+
+    def __init__(self):
+        self.prompts = []
+
+    def get_model(self):
+        def answer(messages, info):
+            self.prompts.append(messages)
+            return ModelResponse(parts=[TextPart(f"Answer {len(self.prompts)}")])
+
+        return FunctionModel(answer)
+
+
+class CharEncoding:
+    """Encoding with one token per character, so tests don't download encodings"""
+
+    def encode(self, text, **kwargs):
+        return list(text)
+
+    def decode(self, tokens):
+        return "".join(tokens)
+
+
+class TestAnswerCache:
+    @pytest.fixture
+    def model_manager(self, monkeypatch):
+        monkeypatch.setitem(get_tokenizer().encodings, "cl100k_base", CharEncoding())
+        return CountingModelManager()
+
+    @pytest.fixture
+    def rag(self, indexer, model_manager):
+        indexer.update_index()
+        rag = ObsidianRAG(
+            indexer.config_manager, "work", FakeInstructionsManager(), model_manager
+        )
+        yield rag
+        rag.answer_cache.close()
+        rag.lexical_index.close()
+
+    def ask(self, rag: ObsidianRAG) -> str:
+        return asyncio.run(rag.ask_notes("hiring"))
+
+    def test_same_question_is_answered_from_cache(self, rag, model_manager):
+        answer = self.ask(rag)
+
+        assert self.ask(rag) == answer
+        assert answer.startswith("Answer 1\n\nSources:\n[1] ")
+        assert len(model_manager.prompts) == 1
+
+    def test_index_change_of_other_notes_keeps_cached_answer(
+        self, rag, indexer, vault_path, model_manager
+    ):
+        self.ask(rag)
+        index_version = rag.lexical_index.get_version()
+        (vault_path / "ideas.md").write_text("# Ideas\nOffsite\n")
+        indexer.update_index()
+        assert rag.lexical_index.get_version() != index_version
+
+        assert self.ask(rag).startswith("Answer 1")
+        assert len(model_manager.prompts) == 1
+
+    def test_changed_chunk_invalidates_cached_answer(
+        self, rag, indexer, vault_path, model_manager
+    ):
+        self.ask(rag)
+        touch(vault_path / "roadmap.md", "# Roadmap\nQ4 hiring\n\n# Risks\nBudget\n")
+        indexer.update_index()
+
+        assert self.ask(rag).startswith("Answer 2")
+        assert len(model_manager.prompts) == 2
@@ -0,0 +1,60 @@
+import asyncio
+
+from opus_todo_agent.background_jobs.notes import obsidian_vault_watcher
+from opus_todo_agent.background_jobs.notes.obsidian_vault_watcher import (
+    ObsidianVaultWatcher,
+)
+
+
+class FakeConfigManager:
+    def __init__(self, settings: dict):
+        self.settings = settings
+
+    def get_setting(self, key, default=None):
+        return self.settings.get(key, default)
+
+
+class FakeIndexer:
+    """Indexer that fails to initialize for vaults named 'broken'"""
+
+    def __init__(self, config_manager, vault_name):
+        if vault_name == "broken":
+            raise AssertionError(f"Vault config not found for {vault_name}")
+        self.vault_name = vault_name
+        self.vault_config = {"vault_path": config_manager.get_setting("vault_path")}
+        config_manager.indexer_updates = []
+        self.updates = config_manager.indexer_updates
+
+    def update_index(self):
+        self.updates.append(self.vault_name)
+
+
+class TestObsidianVaultWatcher:
+    def test_broken_vault_does_not_stop_other_vaults(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(obsidian_vault_watcher, "ObsidianIndexer", FakeIndexer)
+        config_manager = FakeConfigManager(
+            {
+                "vault_path": str(tmp_path),
+                "notes.obsidian.vault_configurations": [
+                    {"vault_name": "broken"},
+                    {"vault_name": "work"},
+                ],
+                "background_jobs.notes.obsidian_vault_watcher.debounce_seconds": 0.01,
+            }
+        )
+        watcher = ObsidianVaultWatcher(config_manager)
+
+        async def main():
+            task = asyncio.create_task(watcher.run())
+            for _ in range(100):
+                await asyncio.sleep(0.01)
+                if getattr(config_manager, "indexer_updates", None):
+                    break
+            assert not task.done()
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+        asyncio.run(main())
+
+        # the initial catch-up scan of the working vault
+        assert config_manager.indexer_updates == ["work"]
@@ -0,0 +1,145 @@
+import asyncio
+
+import pytest
+from opus_todo_agent.custom_tools.notes.obsidian_multi_vault_rag import (
+    ObsidianMultiVaultRAG,
+)
+from opus_todo_agent.models.notes.obsidian_models import RetrievedChunk
+from pydantic_ai.models.test import TestModel
+
+
+class FakeConfigManager:
+    def __init__(self, settings: dict):
+        self.settings = settings
+
+    def get_setting(self, key, default=None):
+        return self.settings.get(key, default)
+
+
+class FakeInstructionsManager:
+    def get(self, key):
+        return key
+
+
+class FakeModelManager:
+    def get_model(self):
+        return TestModel()
+
+
+class FakeEmbeddingFunction:
+    def __init__(self, model_id: str):
+        self.model_id = model_id
+
+
+class FakeRAG:
+    """RAG of a vault with a fixed hybrid ranking"""
+
+    def __init__(self, model_id: str, chunks: list[tuple[str, float, float | None]]):
+        self.embedding_function = FakeEmbeddingFunction(model_id)
+        # (chunk id, fused score, vector score)
+        self.chunks = chunks
+
+    def embed_query(self, query: str) -> list[float]:
+        return [1.0, 0.0]
+
+    def retrieve_chunks(
+        self, query, num_results, query_embedding
+    ) -> list[RetrievedChunk]:
+        return [
+            RetrievedChunk(
+                chunk_id,
+                f"/{chunk_id}.md",
+                "",
+                chunk_id,
+                score,
+                vector_score=vector_score,
+            )
+            for chunk_id, score, vector_score in self.chunks[:num_results]
+        ]
+
+
+def create_multi_vault_rag(
+    rags: dict[str, FakeRAG], num_results: int = 3
+) -> ObsidianMultiVaultRAG:
+    config_manager = FakeConfigManager(
+        {"notes.obsidian.context_num_results": num_results}
+    )
+    multi_vault_rag = ObsidianMultiVaultRAG(
+        config_manager, FakeInstructionsManager(), FakeModelManager()
+    )
+    multi_vault_rag.rags = rags
+    return multi_vault_rag
+
+
+def retrieve(multi_vault_rag: ObsidianMultiVaultRAG) -> list[tuple[str, str]]:
+    chunks = asyncio.run(multi_vault_rag.retrieve_chunks("PROJ-123 status"))
+    return [(chunk.vault_name, chunk.chunk_id) for chunk in chunks]
+
+
+@pytest.fixture
+def work_chunks():
+    # exact term hit found by the lexical search only, then a weak vector hit
+    return [("ticket", 0.7, None), ("w2", 0.6, -0.9)]
+
+
+@pytest.fixture
+def personal_chunks():
+    return [("p1", 1.0, -0.2), ("p2", 0.45, -0.3)]
+
+
+class TestObsidianMultiVaultRAGRetrieveChunks:
+    def test_best_chunk_of_each_vault_is_kept(self, work_chunks, personal_chunks):
+        multi_vault_rag = create_multi_vault_rag(
+            {
+                "work": FakeRAG("default:m", work_chunks),
+                "personal": FakeRAG("default:m", personal_chunks),
+            }
+        )
+        assert retrieve(multi_vault_rag)[:2] == [("personal", "p1"), ("work", "ticket")]
+
+    def test_same_rank_by_similarity_with_shared_embedding_model(
+        self, work_chunks, personal_chunks
+    ):
+        multi_vault_rag = create_multi_vault_rag(
+            {
+                "work": FakeRAG("default:m", work_chunks),
+                "personal": FakeRAG("default:m", personal_chunks),
+            },
+            num_results=4,
+        )
+        assert retrieve(multi_vault_rag) == [
+            ("personal", "p1"),
+            ("work", "ticket"),
+            ("personal", "p2"),
+            ("work", "w2"),
+        ]
+
+    def test_same_rank_by_vault_score_with_different_embedding_models(
+        self, work_chunks, personal_chunks
+    ):
+        multi_vault_rag = create_multi_vault_rag(
+            {
+                "work": FakeRAG("default:m", work_chunks),
+                "personal": FakeRAG("ollama:other", personal_chunks),
+            },
+            num_results=4,
+        )
+        assert retrieve(multi_vault_rag) == [
+            ("personal", "p1"),
+            ("work", "ticket"),
+            ("work", "w2"),
+            ("personal", "p2"),
+        ]
+
+    def test_failing_vault_is_skipped(self, personal_chunks):
+        class FailingRAG(FakeRAG):
+            def retrieve_chunks(self, query, num_results, query_embedding):
+                raise RuntimeError("collection deleted")
+
+        multi_vault_rag = create_multi_vault_rag(
+            {
+                "work": FailingRAG("default:m", []),
+                "personal": FakeRAG("default:m", personal_chunks),
+            }
+        )
+        assert retrieve(multi_vault_rag) == [("personal", "p1"), ("personal", "p2")]
@@ -0,0 +1,167 @@
+import asyncio
+
+import pytest
+from opus_agent_base.common.tokenizer import DEFAULT_ENCODING, get_tokenizer
+from opus_todo_agent.helper.meeting_transcript.meeting_assistant_helper import (
+    NOTHING_RELEVANT,
+    MeetingAssistantHelper,
+)
+from pydantic_ai import Agent
+from pydantic_ai.messages import ModelResponse, TextPart
+from pydantic_ai.models.function import FunctionModel
+
+MAP_PROMPT_TEMPLATE = "MAP {part}/{num_parts} {question}\n{context}"
+REDUCE_PROMPT_TEMPLATE = "REDUCE {question}\n{context}"
+
+
+class WordEncoding:
+    """Encoding with one token per word, so tests don't need to download encodings"""
+
+    def encode(self, text, **kwargs):
+        return text.split()
+
+    def decode(self, tokens):
+        return " ".join(tokens)
+
+
+class FakeLLM:
+    """
+    Answers map prompts with the words of the window mentioning 'budget', and reduce
+    prompts with their part headers, and records the prompts and concurrent calls
+    """
+
+    def __init__(self):
+        self.prompts = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def answer(self, messages, info) -> ModelResponse:
+        prompt = messages[-1].parts[-1].content
+        self.prompts.append(prompt)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        header, context = prompt.split("\n", 1)
+        if header.startswith("MAP"):
+            words = [word for word in context.split() if "budget" in word]
+            output = " ".join(words) or NOTHING_RELEVANT
+        else:
+            output = "summary of " + ",".join(
+                line
+                for line in context.splitlines()
+                if line.startswith(("Part", "summary"))
+            )
+        return ModelResponse(parts=[TextPart(output)])
+
+
+@pytest.fixture(autouse=True)
+def encoding(monkeypatch):
+    monkeypatch.setitem(get_tokenizer().encodings, DEFAULT_ENCODING, WordEncoding())
+
+
+@pytest.fixture
+def helper():
+    return MeetingAssistantHelper()
+
+
+@pytest.fixture
+def llm():
+    return FakeLLM()
+
+
+def ask(helper, llm, transcript, window_tokens=8, max_concurrency=2) -> str:
+    return asyncio.run(
+        helper.ask_transcript_map_reduce(
+            Agent(FunctionModel(llm.answer)),
+            MAP_PROMPT_TEMPLATE,
+            REDUCE_PROMPT_TEMPLATE,
+            transcript,
+            "budget?",
+            window_tokens,
+            max_concurrency,
+        )
+    )
+
+
+class TestSplitTranscript:
+    def test_lines_are_packed_into_windows(self, helper):
+        transcript = "a b c\nd e\nf g h i\nj"
+
+        windows = helper.split_transcript(transcript, 7)
+
+        # every line costs its tokens plus one for the line break
+        assert windows == ["a b c\nd e", "f g h i\nj"]
+
+    def test_lines_longer_than_a_window_are_split_by_tokens(self, helper):
+        transcript = "a b\nc d e f g h i\nj"
+
+        windows = helper.split_transcript(transcript, 3)
+
+        assert windows == ["a b", "c d e", "f g h", "i", "j"]
+
+    def test_no_words_are_lost(self, helper):
+        transcript = "\n".join(f"speaker{i}: " + "word " * (i % 7) for i in range(50))
+
+        windows = helper.split_transcript(transcript, 10)
+
+        assert " ".join(windows).split() == transcript.split()
+        assert all(len(window.split()) <= 10 for window in windows)
+
+
+class TestGroupPartials:
+    def test_groups_are_bounded_by_window_tokens(self, helper):
+        partials = ["a b", "c d", "e f", "g h", "i j"]
+
+        # every partial costs its tokens plus two for the separator
+        assert helper.group_partials(partials, 8) == [
+            ["a b", "c d"],
+            ["e f", "g h"],
+            ["i j"],
+        ]
+
+    def test_groups_have_at_least_two_partials(self, helper):
+        partials = ["a b c d e", "f g h i j", "k"]
+
+        assert helper.group_partials(partials, 4) == [["a b c d e", "f g h i j"], ["k"]]
+
+
+class TestAskTranscriptMapReduce:
+    def test_every_window_is_mapped_and_relevant_parts_are_reduced(self, helper, llm):
+        transcript = "intro talk\nthe budget1 is tight\nlunch plans\nraise budget2 now"
+
+        answer = ask(helper, llm, transcript, window_tokens=5)
+
+        map_prompts = [prompt for prompt in llm.prompts if prompt.startswith("MAP")]
+        assert [prompt.split("\n")[0] for prompt in map_prompts] == [
+            f"MAP {part}/4 budget?" for part in range(1, 5)
+        ]
+        assert (
+            llm.prompts[-1]
+            == "REDUCE budget?\nPart 2 of 4:\nbudget1\n\nPart 4 of 4:\nbudget2"
+        )
+        assert answer == "summary of Part 2 of 4:,Part 4 of 4:"
+
+    def test_nothing_relevant_skips_reduce(self, helper, llm):
+        answer = ask(helper, llm, "intro talk\nlunch plans")
+
+        assert "does not contain information relevant" in answer
+        assert all(prompt.startswith("MAP") for prompt in llm.prompts)
+
+    def test_partials_exceeding_a_window_are_reduced_in_rounds(self, helper, llm):
+        transcript = "\n".join(f"budget{i} here" for i in range(6))
+
+        ask(helper, llm, transcript, window_tokens=3)
+
+        reduce_prompts = [
+            prompt for prompt in llm.prompts if prompt.startswith("REDUCE")
+        ]
+        assert len(reduce_prompts) > 1
+        assert reduce_prompts[-1].count("summary of") == len(reduce_prompts) - 1
+
+    def test_model_calls_are_bounded_by_max_concurrency(self, helper, llm):
+        transcript = "\n".join(f"budget{i} here" for i in range(10))
+
+        ask(helper, llm, transcript, window_tokens=3, max_concurrency=3)
+
+        assert llm.max_in_flight == 3
@@ -0,0 +1,117 @@
+from opus_todo_agent.helper.meeting_transcript.transcript_parser import (
+    TranscriptParser,
+    format_timestamp,
+    parse_timestamp,
+)
+from opus_todo_agent.models.meeting_transcript.transcript_models import (
+    TranscriptSegment,
+)
+
+VTT_TRANSCRIPT = """WEBVTT
+
+NOTE recorded by Zoom
+
+1
+00:00:01.000 --> 00:00:04.000
+Alice: Let's start with the roadmap.
+
+2
+00:00:04.500 --> 00:00:06.000
+Alice: Q3 is about hiring.
+
+3
+00:00:06.000 --> 00:00:08.000
+<v Bob Smith>Sounds <b>good</b> &amp; agreed.</v>
+
+4
+00:01:05.000 --> 00:01:07.000
+Alice: Next topic.
+"""
+
+SRT_TRANSCRIPT = """1
+00:00:00,000 --> 00:00:02,500
+Welcome to the demo.
+
+2
+00:00:02,500 --> 00:00:05,000
+This is the new dashboard,
+with two lines.
+"""
+
+
+def parse(parser: TranscriptParser, transcript: str) -> list[TranscriptSegment]:
+    return list(
+        parser.iter_segments(parser.iter_cues(transcript.splitlines(keepends=True)))
+    )
+
+
+class TestTranscriptParser:
+    def test_vtt_cues_of_same_speaker_are_merged(self):
+        segments = parse(TranscriptParser(), VTT_TRANSCRIPT)
+
+        assert segments == [
+            TranscriptSegment(
+                1.0, 6.0, "Alice", "Let's start with the roadmap. Q3 is about hiring."
+            ),
+            TranscriptSegment(6.0, 8.0, "Bob Smith", "Sounds good & agreed."),
+            TranscriptSegment(65.0, 67.0, "Alice", "Next topic."),
+        ]
+
+    def test_srt_cues_without_speaker_are_merged(self):
+        segments = parse(TranscriptParser(), SRT_TRANSCRIPT)
+
+        assert segments == [
+            TranscriptSegment(
+                0.0,
+                5.0,
+                "",
+                "Welcome to the demo. This is the new dashboard, with two lines.",
+            )
+        ]
+
+    def test_segments_are_split_after_max_segment_seconds(self):
+        segments = parse(TranscriptParser(max_segment_seconds=4), VTT_TRANSCRIPT)
+        assert [(segment.speaker, segment.start_seconds) for segment in segments] == [
+            ("Alice", 1.0),
+            ("Alice", 4.5),
+            ("Bob Smith", 6.0),
+            ("Alice", 65.0),
+        ]
+
+    def test_speaker_prefix_detection_can_be_disabled(self):
+        segments = parse(TranscriptParser(detect_speaker_prefix=False), VTT_TRANSCRIPT)
+        assert segments[0].speaker == ""
+        assert segments[0].text.startswith("Alice: Let's start")
+
+    def test_compact_text_prints_changed_timestamps(self):
+        parser = TranscriptParser(timestamp_granularity_seconds=60)
+        assert parser.to_text(parse(parser, VTT_TRANSCRIPT)) == (
+            "[00:00] Alice: Let's start with the roadmap. Q3 is about hiring.\n"
+            "Bob Smith: Sounds good & agreed.\n"
+            "[01:00] Alice: Next topic."
+        )
+
+    def test_compact_text_without_timestamps(self):
+        parser = TranscriptParser(timestamp_granularity_seconds=0)
+        assert parser.to_text(parse(parser, SRT_TRANSCRIPT)) == (
+            "Welcome to the demo. This is the new dashboard, with two lines."
+        )
+
+    def test_parse_file_with_byte_order_mark(self, tmp_path):
+        transcript_path = tmp_path / "meeting.vtt"
+        transcript_path.write_text("\ufeff" + VTT_TRANSCRIPT, encoding="utf-8")
+
+        transcript = TranscriptParser().parse_file(str(transcript_path), "meeting")
+
+        assert transcript.speakers == ["Alice", "Bob Smith"]
+        assert transcript.duration_seconds == 67.0
+
+
+class TestTimestamps:
+    def test_parse_timestamp(self):
+        assert parse_timestamp("01:02:03.456") == 3723.456
+        assert parse_timestamp("02:03,5") == 123.5
+
+    def test_format_timestamp(self):
+        assert format_timestamp(65) == "01:05"
+        assert format_timestamp(3723) == "1:02:03"
@@ -0,0 +1,187 @@
+import os
+
+import pytest
+from opus_agent_base.common.tokenizer import DEFAULT_ENCODING, get_tokenizer
+from opus_todo_agent.helper.meeting_transcript.meeting_assistant_helper import (
+    MeetingAssistantHelper,
+)
+from opus_todo_agent.helper.meeting_transcript.transcript_parser import TranscriptParser
+from opus_todo_agent.helper.meeting_transcript.transcript_segment_index import (
+    TranscriptSegmentIndex,
+)
+from opus_todo_agent.models.meeting_transcript.transcript_models import (
+    TranscriptSegment,
+)
+
+# words embedded into the same dimension, so synonyms are found by the vector search
+TOPICS = {"budget": 0, "costs": 0, "hiring": 1, "recruiting": 1, "launch": 2}
+
+VTT_TRANSCRIPT = """WEBVTT
+
+00:00:01.000 --> 00:00:04.000
+Alice: Welcome everyone.
+
+00:03:00.000 --> 00:03:04.000
+Bob: The budget is tight this quarter.
+
+00:06:00.000 --> 00:06:04.000
+Alice: Hiring starts in Q3.
+
+00:09:00.000 --> 00:09:04.000
+Bob: The launch moves to October.
+"""
+
+
+def embed(text: str) -> list[float]:
+    embedding = [0.1, 0.1, 0.1, 0.1]
+    for word in text.lower().replace(".", " ").split():
+        if word in TOPICS:
+            embedding[TOPICS[word]] += 1.0
+    return embedding
+
+
+class FakeEmbeddingProvider:
+    model_id = "fake:topics"
+
+    def __init__(self):
+        self.embedded_texts = []
+
+    def embed(self, texts: list[str]) -> list[list[float]]:
+        self.embedded_texts.extend(texts)
+        return [embed(text) for text in texts]
+
+
+class WordEncoding:
+    """Encoding with one token per word, so tests don't need to download encodings"""
+
+    def encode(self, text, **kwargs):
+        return text.split()
+
+    def decode(self, tokens):
+        return " ".join(tokens)
+
+
+SEGMENTS = [
+    TranscriptSegment(0, 4, "Alice", "Welcome everyone."),
+    TranscriptSegment(180, 184, "Bob", "The budget is tight this quarter."),
+    TranscriptSegment(360, 364, "Alice", "Hiring starts in Q3."),
+    TranscriptSegment(540, 544, "Bob", "The launch moves to October."),
+]
+
+
+@pytest.fixture
+def segment_index(tmp_path):
+    segment_index = TranscriptSegmentIndex(str(tmp_path / "meeting.vtt.index.db"))
+    segment_index.build(
+        SEGMENTS, [embed(segment.text) for segment in SEGMENTS], "source-1"
+    )
+    yield segment_index
+    segment_index.close()
+
+
+def search(segment_index, query: str, limit: int = 1) -> list[str]:
+    segments = segment_index.search(query, embed(query), limit)
+    return [segment.text for segment in segments]
+
+
+class TestTranscriptSegmentIndex:
+    def test_lexical_match_without_similar_embedding(self, segment_index):
+        assert "The launch moves to October." in search(segment_index, "October", 2)
+
+    def test_vector_match_without_shared_terms(self, segment_index):
+        assert search(segment_index, "recruiting") == ["Hiring starts in Q3."]
+
+    def test_segments_found_by_both_searches_rank_first(self, segment_index):
+        segments = segment_index.search("costs budget", embed("costs budget"), 4)
+
+        assert segments[0].text == "The budget is tight this quarter."
+        assert segments[0].speaker == "Bob"
+        assert segments[0].start_seconds == 180
+        assert segments[0].score > segments[1].score
+
+    def test_index_is_persisted_with_its_source_key(self, tmp_path, segment_index):
+        segment_index.close()
+
+        reopened_index = TranscriptSegmentIndex(str(tmp_path / "meeting.vtt.index.db"))
+
+        assert reopened_index.get_source_key() == "source-1"
+        assert search(reopened_index, "recruiting") == ["Hiring starts in Q3."]
+        reopened_index.close()
+
+    def test_build_replaces_segments(self, segment_index):
+        segment_index.build(SEGMENTS[:1], [embed(SEGMENTS[0].text)], "source-2")
+
+        assert segment_index.get_source_key() == "source-2"
+        assert search(segment_index, "October", 4) == ["Welcome everyone."]
+
+
+class TestRetrieveTranscriptContext:
+    @pytest.fixture
+    def transcript_path(self, tmp_path):
+        transcript_path = tmp_path / "meeting.vtt"
+        transcript_path.write_text(VTT_TRANSCRIPT)
+        return str(transcript_path)
+
+    @pytest.fixture
+    def helper(self, monkeypatch):
+        monkeypatch.setitem(get_tokenizer().encodings, DEFAULT_ENCODING, WordEncoding())
+        helper = MeetingAssistantHelper()
+        yield helper
+        for segment_index in helper.segment_indexes.values():
+            segment_index.close()
+
+    def retrieve(self, helper, transcript_path, embedding_provider, max_tokens=100):
+        return helper.retrieve_transcript_context(
+            transcript_path,
+            "recruiting and launch",
+            TranscriptParser(),
+            embedding_provider,
+            max_tokens,
+            num_candidates=2,
+        )
+
+    def test_first_question_builds_the_index(self, helper, transcript_path):
+        embedding_provider = FakeEmbeddingProvider()
+
+        assert self.retrieve(helper, transcript_path, embedding_provider) is None
+        assert len(embedding_provider.embedded_texts) == 4
+        assert os.path.exists(TranscriptSegmentIndex.get_default_path(transcript_path))
+
+    def test_follow_up_question_retrieves_segments_in_meeting_order(
+        self, helper, transcript_path
+    ):
+        embedding_provider = FakeEmbeddingProvider()
+        self.retrieve(helper, transcript_path, embedding_provider)
+
+        context = self.retrieve(helper, transcript_path, embedding_provider)
+
+        assert context == (
+            "[06:00] Alice: Hiring starts in Q3.\n"
+            "[09:00] Bob: The launch moves to October."
+        )
+        # only the question is embedded again
+        assert embedding_provider.embedded_texts[4:] == ["recruiting and launch"]
+
+    def test_segments_beyond_the_token_budget_are_left_out(
+        self, helper, transcript_path
+    ):
+        embedding_provider = FakeEmbeddingProvider()
+        self.retrieve(helper, transcript_path, embedding_provider)
+
+        context = self.retrieve(helper, transcript_path, embedding_provider, 7)
+
+        assert context.count("\n") == 0
+
+    def test_changed_transcript_is_indexed_again(self, helper, transcript_path):
+        embedding_provider = FakeEmbeddingProvider()
+        self.retrieve(helper, transcript_path, embedding_provider)
+        with open(transcript_path, "a") as f:
+            f.write("\n00:12:00.000 --> 00:12:04.000\nAlice: Thanks all.\n")
+
+        assert self.retrieve(helper, transcript_path, embedding_provider) is None
+        assert len(embedding_provider.embedded_texts) == 9
+
+    def test_missing_transcript(self, helper, tmp_path):
+        missing_path = str(tmp_path / "missing.vtt")
+
+        assert self.retrieve(helper, missing_path, FakeEmbeddingProvider()) is None
@@ -0,0 +1,59 @@
+import pytest
+from opus_todo_agent.helper.notes.hybrid_retriever import HybridRetriever, fuse_rankings
+from opus_todo_agent.models.notes.obsidian_models import RetrievedChunk
+
+
+def create_chunks(*chunk_ids: str) -> list[RetrievedChunk]:
+    return [
+        RetrievedChunk(chunk_id, f"/vault/{chunk_id}.md", "", chunk_id, 0.0)
+        for chunk_id in chunk_ids
+    ]
+
+
+class TestHybridRetrieverFuse:
+    def test_chunk_in_both_rankings_ranks_first(self):
+        retriever = HybridRetriever(None, None, rrf_k=60)
+        fused = retriever.fuse([create_chunks("a", "b", "c"), create_chunks("c", "d")])
+
+        assert [chunk.chunk_id for chunk in fused] == ["c", "a", "b", "d"]
+        assert fused[0].score == pytest.approx((1 / 63 + 1 / 61) / (2 / 61))
+
+    def test_chunk_first_in_all_rankings_scores_one(self):
+        retriever = HybridRetriever(None, None)
+        fused = retriever.fuse([create_chunks("a", "b"), create_chunks("a", "b")])
+
+        assert [chunk.chunk_id for chunk in fused] == ["a", "b"]
+        assert fused[0].score == pytest.approx(1.0)
+        assert 0 < fused[1].score < 1
+
+    def test_fuse_does_not_modify_input_chunks(self):
+        vector_chunks = create_chunks("a")
+        HybridRetriever(None, None).fuse([vector_chunks, create_chunks("a")])
+        assert vector_chunks[0].score == 0.0
+
+    def test_fused_chunk_keeps_vector_score_of_vector_ranking(self):
+        vector_chunks = [
+            RetrievedChunk("a", "/vault/a.md", "", "a", -0.4, vector_score=-0.4)
+        ]
+        fused = HybridRetriever(None, None).fuse(
+            [vector_chunks, create_chunks("b", "a")]
+        )
+
+        assert {chunk.chunk_id: chunk.vector_score for chunk in fused} == {
+            "a": -0.4,
+            "b": None,
+        }
+
+    def test_chunks_of_different_vaults_are_not_merged(self):
+        work_chunk = RetrievedChunk("a", "/vault/a.md", "", "a", 0.0, vault_name="work")
+        personal_chunk = RetrievedChunk(
+            "a", "/vault/a.md", "", "a", 0.0, vault_name="personal"
+        )
+
+        fused = fuse_rankings([[work_chunk], [personal_chunk]])
+
+        assert [chunk.vault_name for chunk in fused] == ["work", "personal"]
+        assert fused[0].score == fused[1].score
+
+    def test_empty_rankings(self):
+        assert HybridRetriever(None, None).fuse([[], []]) == []
@@ -0,0 +1,84 @@
+from itertools import pairwise
+
+import pytest
+from opus_todo_agent.helper.notes.markdown_chunker import MarkdownChunker
+from opus_todo_agent.models.notes.obsidian_models import NoteChunk, get_chunk_id
+
+
+class TestMarkdownChunker:
+    def test_splits_at_headings_with_heading_path(self):
+        text = (
+            "Intro line\n"
+            "# Roadmap\n"
+            "Roadmap text\n"
+            "## Q3\n"
+            "Q3 text\n"
+            "### Hiring\n"
+            "Hiring text\n"
+            "## Q4 ##\n"
+            "Q4 text\n"
+            "# Notes\n"
+            "Notes text\n"
+        )
+        chunks = MarkdownChunker().split(text)
+
+        assert [heading for heading, _ in chunks] == [
+            "",
+            "Roadmap",
+            "Roadmap > Q3",
+            "Roadmap > Q3 > Hiring",
+            "Roadmap > Q4",
+            "Notes",
+        ]
+        assert chunks[2] == ("Roadmap > Q3", "## Q3\nQ3 text")
+
+    def test_ignores_headings_in_code_blocks(self):
+        text = "# Setup\n```bash\n# install\npip install x\n```\nDone\n"
+        assert MarkdownChunker().split(text) == [
+            ("Setup", "# Setup\n```bash\n# install\npip install x\n```\nDone")
+        ]
+
+    def test_skips_empty_sections(self):
+        assert MarkdownChunker().split("# Empty\n\n# Full\ntext\n") == [
+            ("Empty", "# Empty"),
+            ("Full", "# Full\ntext"),
+        ]
+
+    def test_long_section_is_split_at_paragraphs_with_overlap(self):
+        paragraphs = [f"Paragraph {index} " + "word " * 15 for index in range(6)]
+        text = "\n\n".join(paragraphs)
+        chunker = MarkdownChunker(chunk_size=200, chunk_overlap=20)
+
+        chunks = chunker.split_section(text)
+
+        assert len(chunks) > 1
+        assert all(len(chunk) <= 200 for chunk in chunks)
+        for chunk, next_chunk in pairwise(chunks):
+            # each chunk ends at a paragraph, the next one repeats its last characters
+            assert chunk.endswith("\n\n")
+            assert next_chunk.startswith(chunk[-20:])
+        assert chunks[-1].endswith(paragraphs[-1])
+
+    def test_long_line_is_split_at_words(self):
+        text = " ".join(f"word{index}" for index in range(100))
+        chunks = MarkdownChunker(chunk_size=100, chunk_overlap=10).split_section(text)
+
+        assert all(len(chunk) <= 100 for chunk in chunks)
+        assert all(chunk.endswith(" ") for chunk in chunks[:-1])
+        assert chunks[-1].endswith("word99")
+
+    def test_overlap_must_be_smaller_than_chunk_size(self):
+        with pytest.raises(AssertionError):
+            MarkdownChunker(chunk_size=100, chunk_overlap=100)
+
+
+class TestChunkId:
+    def test_chunk_id_is_deterministic(self):
+        chunk = NoteChunk("/vault/Roadmap.md", 2, "Roadmap", "text", "hash")
+        assert chunk.id == get_chunk_id("/vault/Roadmap.md", 2)
+        assert chunk.id.endswith(":2")
+
+    def test_chunk_id_depends_on_path_and_index(self):
+        chunk_id = get_chunk_id("/vault/Roadmap.md", 0)
+        assert chunk_id != get_chunk_id("/vault/Roadmap.md", 1)
+        assert chunk_id != get_chunk_id("/other_vault/Roadmap.md", 0)
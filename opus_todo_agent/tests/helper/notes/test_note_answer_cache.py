@@ -0,0 +1,66 @@
+import pytest
+from opus_todo_agent.helper.notes.note_answer_cache import NoteAnswerCache
+
+
+def create_cache(tmp_path, embedding_model="default:m", max_entries=10):
+    return NoteAnswerCache(
+        str(tmp_path / "answer_cache.db"),
+        embedding_model,
+        similarity_threshold=0.95,
+        max_entries=max_entries,
+    )
+
+
+def always_valid(cached_answer):
+    return True
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = create_cache(tmp_path)
+    cache.put("when is hiring", [1.0, 0.0], {"c1": "h1"}, 3, "Q3")
+    yield cache
+    cache.close()
+
+
+class TestNoteAnswerCache:
+    def test_similar_query_hits(self, cache):
+        cached_answer = cache.get([0.99, 0.05], always_valid)
+
+        assert cached_answer.answer == "Q3"
+        assert cached_answer.chunk_hashes == {"c1": "h1"}
+        assert cached_answer.index_version == 3
+
+    def test_dissimilar_query_misses(self, cache):
+        assert cache.get([0.5, 0.5], always_valid) is None
+
+    def test_invalid_answer_misses_and_is_removed(self, cache):
+        assert cache.get([1.0, 0.0], lambda cached_answer: False) is None
+
+        assert cache.get([1.0, 0.0], always_valid) is None
+
+    def test_other_dimensions_miss(self, cache):
+        assert cache.get([1.0, 0.0, 0.0], always_valid) is None
+
+    def test_answers_are_persisted_per_embedding_model(self, tmp_path, cache):
+        cache.close()
+
+        reloaded_cache = create_cache(tmp_path)
+        assert reloaded_cache.get([1.0, 0.0], always_valid).answer == "Q3"
+        reloaded_cache.close()
+
+        other_model_cache = create_cache(tmp_path, "ollama:other")
+        assert other_model_cache.get([1.0, 0.0], always_valid) is None
+        other_model_cache.close()
+
+    def test_least_recently_used_answers_are_evicted(self, tmp_path):
+        cache = create_cache(tmp_path, max_entries=2)
+        cache.put("a", [1.0, 0.0], {}, 1, "A")
+        cache.put("b", [0.0, 1.0], {}, 1, "B")
+        assert cache.get([1.0, 0.0], always_valid).answer == "A"
+
+        cache.put("c", [-1.0, 0.0], {}, 1, "C")
+
+        assert list(cache.entries) == ["a", "c"]
+        assert cache.get([0.0, 1.0], always_valid) is None
+        cache.close()
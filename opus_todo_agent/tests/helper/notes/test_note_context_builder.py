@@ -0,0 +1,103 @@
+import pytest
+from opus_agent_base.common.tokenizer import get_tokenizer
+from opus_todo_agent.helper.notes.note_context_builder import NoteContextBuilder
+from opus_todo_agent.models.notes.obsidian_models import RetrievedChunk
+
+
+class CharEncoding:
+    """Encoding with one token per character, so budgets are easy to compute"""
+
+    def encode(self, text, **kwargs):
+        return list(text)
+
+    def decode(self, tokens):
+        return "".join(tokens)
+
+
+@pytest.fixture(autouse=True)
+def encoding(monkeypatch):
+    monkeypatch.setitem(get_tokenizer().encodings, "test", CharEncoding())
+
+
+def create_builder(max_context_tokens: int, min_chunk_tokens: int = 10):
+    return NoteContextBuilder(max_context_tokens, "test", min_chunk_tokens)
+
+
+def chunk(chunk_id: str, text: str, score: float, file_path: str = None, heading=""):
+    return RetrievedChunk(
+        chunk_id, file_path or f"/vault/{chunk_id}.md", heading, text, score
+    )
+
+
+# shared part of overlapping chunks, longer than the minimum trimmed overlap
+OVERLAP = "the overlap between the two chunks of the note"
+
+
+class TestNoteContextBuilder:
+    def test_chunks_are_packed_best_score_first_with_citations(self):
+        chunks = [
+            chunk("low", "low text", 0.1),
+            chunk("high", "high text", 0.9, heading="Plans"),
+        ]
+
+        context = create_builder(1000).build(chunks)
+
+        assert context.text == "[1] high.md > Plans\nhigh text\n\n[2] low.md\nlow text"
+        assert [citation.chunk_id for citation in context.citations] == ["high", "low"]
+        assert [citation.number for citation in context.citations] == [1, 2]
+        assert context.citations[0].heading == "Plans"
+        assert context.token_count == len("[1] high.md > Plans\nhigh text") + len(
+            "[2] low.md\nlow text"
+        )
+
+    def test_last_chunk_is_truncated_to_the_budget(self):
+        first_block = "[1] a.md\n" + "a" * 20
+        chunks = [chunk("a", "a" * 20, 0.9), chunk("b", "b" * 50, 0.5)]
+
+        context = create_builder(len(first_block) + 15).build(chunks)
+
+        assert context.token_count == len(first_block) + 15
+        assert context.text == first_block + "\n\n" + ("[2] b.md\n" + "b" * 50)[:15]
+        assert len(context.citations) == 2
+
+    def test_chunk_is_dropped_when_remaining_budget_is_too_small(self):
+        first_block = "[1] a.md\n" + "a" * 20
+        chunks = [chunk("a", "a" * 20, 0.9), chunk("b", "b" * 50, 0.5)]
+
+        context = create_builder(len(first_block) + 5).build(chunks)
+
+        assert context.text == first_block
+        assert [citation.chunk_id for citation in context.citations] == ["a"]
+
+    def test_duplicate_chunks_of_a_note_are_dropped(self):
+        chunks = [
+            chunk("a", "Call Bob about the launch", 0.9, "/vault/note.md"),
+            chunk("b", "about the launch", 0.8, "/vault/note.md"),
+            chunk("c", "about the launch", 0.7, "/vault/other.md"),
+        ]
+
+        context = create_builder(1000).build(chunks)
+
+        assert [citation.chunk_id for citation in context.citations] == ["a", "c"]
+
+    def test_overlap_between_chunks_of_a_note_is_trimmed(self):
+        chunks = [
+            chunk("a", f"First part. {OVERLAP}", 0.9, "/vault/note.md"),
+            chunk("b", f"{OVERLAP} Second part.", 0.8, "/vault/note.md"),
+        ]
+
+        context = create_builder(1000).build(chunks)
+
+        assert context.text.endswith("[2] note.md\nSecond part.")
+        assert context.text.count(OVERLAP) == 1
+
+    def test_format_citations(self):
+        chunks = [
+            chunk("a", "a", 0.9, heading="Plans"),
+            chunk("b", "b", 0.5),
+        ]
+        builder = create_builder(1000)
+
+        citations = builder.format_citations(builder.build(chunks))
+
+        assert citations == "[1] /vault/a.md > Plans\n[2] /vault/b.md"
@@ -0,0 +1,75 @@
+import hashlib
+
+import pytest
+from opus_todo_agent.helper.notes.note_ingest_pipeline import NoteIngestPipeline
+
+
+@pytest.fixture
+def note_paths(tmp_path):
+    note_paths = []
+    for index in range(6):
+        note_path = tmp_path / f"note{index}.md"
+        note_path.write_text(f"# Note {index}\nText of note {index}\n")
+        note_paths.append(str(note_path))
+    return note_paths
+
+
+def get_hash(file_path: str) -> str:
+    with open(file_path, encoding="utf-8") as f:
+        return hashlib.md5(f.read().encode()).hexdigest()
+
+
+class TestNoteIngestPipeline:
+    @pytest.mark.parametrize("parallel", [False, True])
+    def test_notes_are_prepared_in_order(self, note_paths, parallel):
+        pipeline = NoteIngestPipeline(
+            1000, 100, workers=2, executor_type="thread", queue_size=2
+        )
+
+        prepared_notes = list(
+            pipeline.run([(note_path, None) for note_path in note_paths], parallel)
+        )
+
+        assert [note.file_path for note in prepared_notes] == note_paths
+        assert [len(note.chunks) for note in prepared_notes] == [1] * 6
+        assert prepared_notes[2].chunks[0].text == "# Note 2\nText of note 2"
+
+    @pytest.mark.parametrize("parallel", [False, True])
+    def test_notes_with_known_hash_are_not_chunked(self, note_paths, parallel):
+        pipeline = NoteIngestPipeline(1000, 100, workers=2, executor_type="thread")
+
+        prepared_notes = list(
+            pipeline.run(
+                [(note_paths[0], get_hash(note_paths[0])), (note_paths[1], "outdated")],
+                parallel,
+            )
+        )
+
+        assert prepared_notes[0].chunks is None
+        assert prepared_notes[1].chunks is not None
+
+    @pytest.mark.parametrize("parallel", [False, True])
+    def test_unreadable_notes_are_skipped(self, note_paths, tmp_path, parallel):
+        pipeline = NoteIngestPipeline(1000, 100, workers=2, executor_type="thread")
+        notes = [
+            (note_paths[0], None),
+            (str(tmp_path / "deleted.md"), None),
+            (note_paths[1], None),
+        ]
+
+        prepared_notes = list(pipeline.run(notes, parallel))
+
+        assert [note.file_path for note in prepared_notes] == note_paths[:2]
+
+    def test_stopping_early_stops_the_producer(self, note_paths):
+        pipeline = NoteIngestPipeline(
+            1000, 100, workers=2, executor_type="thread", queue_size=1
+        )
+
+        prepared_notes = pipeline.run(
+            [(note_path, None) for note_path in note_paths * 10]
+        )
+
+        assert next(prepared_notes).file_path == note_paths[0]
+        # closing the generator joins the producer thread
+        prepared_notes.close()
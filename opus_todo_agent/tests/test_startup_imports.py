@@ -0,0 +1,44 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+from opus_agent_base.cli.startup_benchmark import HEAVY_MODULES
+
+IMPORTED_MODULES_SCRIPT = """
+import json, sys
+sys.argv = ["opus-todo-agent"] + {argv!r}
+{statement}
+print(json.dumps([name for name in {heavy_modules!r} if name in sys.modules]))
+"""
+
+
+def get_imported_heavy_modules(statement: str, argv: list[str] = None) -> list[str]:
+    """Run the statement in a fresh interpreter, return the heavy modules it imported"""
+    script = IMPORTED_MODULES_SCRIPT.format(
+        argv=argv or [], statement=statement, heavy_modules=HEAVY_MODULES
+    )
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=env,
+    )
+    # the CLI prints its help first, the result is the last line
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+class TestStartupImports:
+    def test_importing_package_does_not_import_agent_stack(self):
+        assert get_imported_heavy_modules("import opus_todo_agent") == []
+
+    @pytest.mark.parametrize("argv", [["--help"], ["--version"]])
+    def test_cli_does_not_import_agent_stack(self, argv):
+        statement = (
+            "import opus_todo_agent\n"
+            "try:\n    opus_todo_agent.main()\nexcept SystemExit:\n    pass"
+        )
+        assert get_imported_heavy_modules(statement, argv) == []